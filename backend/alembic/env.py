@@ -33,8 +33,29 @@ if config.config_file_name is not None:
 # add your model's MetaData object here
 # for 'autogenerate' support
 from app.models import Base
+from app.database.partitioning import include_in_migrations, is_partitioned
+from app.models.search import FTS_TABLE, SEARCH_COLUMNS, SEARCH_INDEXES
 target_metadata = Base.metadata
 
+
+def build_include_object(partitioned: bool):
+    """Autogenerate filter for tables and indexes that live outside the models."""
+    include_partitions = include_in_migrations(partitioned)
+
+    def include_object(obj, name, type_, reflected, compare_to):
+        # The FTS5 virtual table and its shadow tables (food_items_fts_data, ...) are created by raw SQL
+        if type_ == "table" and reflected and name.startswith(FTS_TABLE):
+            return False
+        # So are the Postgres search_vector column and the full-text/trigram indexes
+        if reflected and compare_to is None and (
+            (type_ == "column" and name in SEARCH_COLUMNS) or (type_ == "index" and name in SEARCH_INDEXES)
+        ):
+            return False
+        return include_partitions(obj, name, type_, reflected, compare_to)
+
+    return include_object
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode."""
     url = config.get_main_option("sqlalchemy.url")
@@ -58,9 +79,13 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
+        partitioned = is_partitioned(connection)
+        # End the transaction the check began, so Alembic runs and commits its own
+        connection.commit()
         context.configure(
             connection=connection,
-            target_metadata=target_metadata
+            target_metadata=target_metadata,
+            include_object=build_include_object(partitioned)
         )
 
         with context.begin_transaction():
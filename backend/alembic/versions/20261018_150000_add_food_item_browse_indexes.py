@@ -0,0 +1,28 @@
+"""Add food item browse indexes
+
+Revision ID: 3b9c1f2a7d41
+Revises: e74628817b2b
+Create Date: 2026-10-18 15:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9c1f2a7d41'
+down_revision: Union[str, None] = 'e74628817b2b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_food_items_expiry_date_id', 'food_items', ['expiry_date', 'id'], unique=False)
+    op.create_index('ix_food_items_restaurant_id_created_at', 'food_items', ['restaurant_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_food_items_restaurant_id_created_at', table_name='food_items')
+    op.drop_index('ix_food_items_expiry_date_id', table_name='food_items')
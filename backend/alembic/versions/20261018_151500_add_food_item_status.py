@@ -0,0 +1,44 @@
+"""Add food item availability status
+
+Revision ID: 8e2d4c6f0a13
+Revises: 3b9c1f2a7d41
+Create Date: 2026-10-18 15:15:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e2d4c6f0a13'
+down_revision: Union[str, None] = '3b9c1f2a7d41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('food_items', sa.Column('status', sa.String(), server_default='available', nullable=True))
+
+    # Backfill from existing pickups and expiry dates
+    op.execute(
+        "UPDATE food_items SET status = 'claimed' "
+        "WHERE id IN (SELECT food_item_id FROM pickups WHERE food_item_id IS NOT NULL)"
+    )
+    op.execute(
+        "UPDATE food_items SET status = 'expired' "
+        "WHERE status = 'available' AND expiry_date <= CURRENT_TIMESTAMP"
+    )
+
+    op.create_index(
+        'ix_food_items_available_expiry_date_id', 'food_items', ['expiry_date', 'id'], unique=False,
+        postgresql_where=sa.text("status = 'available'"),
+        sqlite_where=sa.text("status = 'available'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_food_items_available_expiry_date_id', table_name='food_items')
+    with op.batch_alter_table('food_items') as batch_op:
+        batch_op.drop_column('status')
@@ -0,0 +1,35 @@
+"""Add restaurant and charity coordinates with geohash index
+
+Revision ID: 5a7f3e9b2c84
+Revises: 8e2d4c6f0a13
+Create Date: 2026-10-18 15:30:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a7f3e9b2c84'
+down_revision: Union[str, None] = '8e2d4c6f0a13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    for table in ('restaurants', 'charities'):
+        op.add_column(table, sa.Column('latitude', sa.Float(), nullable=True))
+        op.add_column(table, sa.Column('longitude', sa.Float(), nullable=True))
+        op.add_column(table, sa.Column('geohash', sa.String(length=12), nullable=True))
+        op.create_index(op.f(f'ix_{table}_geohash'), table, ['geohash'], unique=False)
+
+
+def downgrade() -> None:
+    for table in ('charities', 'restaurants'):
+        op.drop_index(op.f(f'ix_{table}_geohash'), table_name=table)
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('geohash')
+            batch_op.drop_column('longitude')
+            batch_op.drop_column('latitude')
@@ -0,0 +1,71 @@
+"""Add food item full-text search index
+
+Revision ID: c41e8a2d6b97
+Revises: 5a7f3e9b2c84
+Create Date: 2026-10-18 15:45:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41e8a2d6b97'
+down_revision: Union[str, None] = '5a7f3e9b2c84'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE food_items_fts USING fts5("
+            "name, description, content='food_items', content_rowid='id', "
+            "tokenize='porter unicode61')"
+        )
+        op.execute(
+            "CREATE TRIGGER food_items_fts_ai AFTER INSERT ON food_items BEGIN "
+            "INSERT INTO food_items_fts(rowid, name, description) "
+            "VALUES (new.id, new.name, new.description); END"
+        )
+        op.execute(
+            "CREATE TRIGGER food_items_fts_ad AFTER DELETE ON food_items BEGIN "
+            "INSERT INTO food_items_fts(food_items_fts, rowid, name, description) "
+            "VALUES ('delete', old.id, old.name, old.description); END"
+        )
+        op.execute(
+            "CREATE TRIGGER food_items_fts_au AFTER UPDATE OF name, description ON food_items BEGIN "
+            "INSERT INTO food_items_fts(food_items_fts, rowid, name, description) "
+            "VALUES ('delete', old.id, old.name, old.description); "
+            "INSERT INTO food_items_fts(rowid, name, description) "
+            "VALUES (new.id, new.name, new.description); END"
+        )
+        # Index existing rows
+        op.execute("INSERT INTO food_items_fts(food_items_fts) VALUES ('rebuild')")
+    elif dialect == 'postgresql':
+        op.execute(
+            "ALTER TABLE food_items ADD COLUMN search_vector tsvector "
+            "GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+            ") STORED"
+        )
+        op.create_index(
+            'ix_food_items_search_vector', 'food_items', ['search_vector'],
+            unique=False, postgresql_using='gin'
+        )
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS food_items_fts_au")
+        op.execute("DROP TRIGGER IF EXISTS food_items_fts_ad")
+        op.execute("DROP TRIGGER IF EXISTS food_items_fts_ai")
+        op.execute("DROP TABLE IF EXISTS food_items_fts")
+    elif dialect == 'postgresql':
+        op.drop_index('ix_food_items_search_vector', table_name='food_items')
+        op.drop_column('food_items', 'search_vector')
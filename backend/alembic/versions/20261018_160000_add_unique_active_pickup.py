@@ -0,0 +1,37 @@
+"""Add unique active pickup per food item
+
+Revision ID: 9d3b7e1c5f20
+Revises: c41e8a2d6b97
+Create Date: 2026-10-18 16:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d3b7e1c5f20'
+down_revision: Union[str, None] = 'c41e8a2d6b97'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Resolve existing double bookings: the earliest pickup keeps the item
+    op.execute(
+        "UPDATE pickups SET status = 'cancelled' "
+        "WHERE status != 'cancelled' AND food_item_id IS NOT NULL AND id NOT IN ("
+        "SELECT MIN(id) FROM pickups WHERE status != 'cancelled' "
+        "AND food_item_id IS NOT NULL GROUP BY food_item_id)"
+    )
+    op.create_index(
+        'uq_pickups_active_food_item_id', 'pickups', ['food_item_id'], unique=True,
+        postgresql_where=sa.text("status != 'cancelled'"),
+        sqlite_where=sa.text("status != 'cancelled'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_pickups_active_food_item_id', table_name='pickups')
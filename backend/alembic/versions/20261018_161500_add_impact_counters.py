@@ -0,0 +1,65 @@
+"""Add restaurant impact counters and backfill statistics
+
+Revision ID: 2f6a9c4e8d15
+Revises: 9d3b7e1c5f20
+Create Date: 2026-10-18 16:15:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2f6a9c4e8d15'
+down_revision: Union[str, None] = '9d3b7e1c5f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('restaurants', sa.Column('total_listings', sa.Integer(), server_default='0', nullable=True))
+    op.add_column('restaurants', sa.Column('total_pickups', sa.Integer(), server_default='0', nullable=True))
+    op.add_column('restaurants', sa.Column('people_helped', sa.Integer(), server_default='0', nullable=True))
+    op.add_column('restaurants', sa.Column('food_saved_kg', sa.Float(), server_default='0', nullable=True))
+
+    # Rows inserted outside the ORM must not start the charity counters at NULL
+    with op.batch_alter_table('charities') as batch_op:
+        batch_op.alter_column('total_pickups', existing_type=sa.Integer(), server_default='0')
+        batch_op.alter_column('people_helped', existing_type=sa.Integer(), server_default='0')
+        batch_op.alter_column('food_saved_kg', existing_type=sa.Float(), server_default='0.0')
+
+    # Backfill counters from the raw tables (2.5kg and 4 people per pickup)
+    op.execute(
+        "UPDATE restaurants SET "
+        "total_listings = (SELECT COUNT(*) FROM food_items WHERE food_items.restaurant_id = restaurants.id), "
+        "total_pickups = (SELECT COUNT(*) FROM pickups WHERE pickups.restaurant_id = restaurants.id "
+        "AND pickups.status != 'cancelled'), "
+        "food_saved_kg = 2.5 * (SELECT COUNT(*) FROM pickups WHERE pickups.restaurant_id = restaurants.id "
+        "AND pickups.status != 'cancelled'), "
+        "people_helped = 4 * (SELECT COUNT(*) FROM pickups WHERE pickups.restaurant_id = restaurants.id "
+        "AND pickups.status != 'cancelled')"
+    )
+    op.execute(
+        "UPDATE charities SET "
+        "total_pickups = (SELECT COUNT(*) FROM pickups WHERE pickups.charity_id = charities.id "
+        "AND pickups.status != 'cancelled'), "
+        "food_saved_kg = 2.5 * (SELECT COUNT(*) FROM pickups WHERE pickups.charity_id = charities.id "
+        "AND pickups.status != 'cancelled'), "
+        "people_helped = 4 * (SELECT COUNT(*) FROM pickups WHERE pickups.charity_id = charities.id "
+        "AND pickups.status != 'cancelled')"
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('charities') as batch_op:
+        batch_op.alter_column('food_saved_kg', existing_type=sa.Float(), server_default=None)
+        batch_op.alter_column('people_helped', existing_type=sa.Integer(), server_default=None)
+        batch_op.alter_column('total_pickups', existing_type=sa.Integer(), server_default=None)
+
+    with op.batch_alter_table('restaurants') as batch_op:
+        batch_op.drop_column('food_saved_kg')
+        batch_op.drop_column('people_helped')
+        batch_op.drop_column('total_pickups')
+        batch_op.drop_column('total_listings')
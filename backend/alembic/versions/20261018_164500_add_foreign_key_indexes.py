@@ -0,0 +1,36 @@
+"""Index profile and pickup foreign keys
+
+Revision ID: 4e8b2d6a1c39
+Revises: 7c1e5a9d3f62
+Create Date: 2026-10-18 16:45:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4e8b2d6a1c39'
+down_revision: Union[str, None] = '7c1e5a9d3f62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # food_items.restaurant_id is already the leading column of
+    # ix_food_items_restaurant_id_created_at
+    op.create_index(op.f('ix_restaurants_user_id'), 'restaurants', ['user_id'], unique=False)
+    op.create_index(op.f('ix_charities_user_id'), 'charities', ['user_id'], unique=False)
+    op.create_index(op.f('ix_pickups_food_item_id'), 'pickups', ['food_item_id'], unique=False)
+    op.create_index(op.f('ix_pickups_restaurant_id'), 'pickups', ['restaurant_id'], unique=False)
+    op.create_index(op.f('ix_pickups_charity_id'), 'pickups', ['charity_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_pickups_charity_id'), table_name='pickups')
+    op.drop_index(op.f('ix_pickups_restaurant_id'), table_name='pickups')
+    op.drop_index(op.f('ix_pickups_food_item_id'), table_name='pickups')
+    op.drop_index(op.f('ix_charities_user_id'), table_name='charities')
+    op.drop_index(op.f('ix_restaurants_user_id'), table_name='restaurants')
@@ -0,0 +1,67 @@
+"""Add food item and pickup history tables
+
+Revision ID: 9b3f7d2e6a48
+Revises: 4e8b2d6a1c39
+Create Date: 2026-10-18 17:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b3f7d2e6a48'
+down_revision: Union[str, None] = '4e8b2d6a1c39'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'food_items_history',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('name', sa.String(), nullable=True),
+        sa.Column('quantity', sa.Float(), nullable=True),
+        sa.Column('unit', sa.String(), nullable=True),
+        sa.Column('expiry_date', sa.DateTime(), nullable=True),
+        sa.Column('description', sa.String(), nullable=True),
+        sa.Column('status', sa.String(), nullable=True),
+        sa.Column('restaurant_id', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('archived_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_food_items_history_restaurant_id', 'food_items_history', ['restaurant_id'], unique=False)
+    op.create_index('ix_food_items_history_expiry_date', 'food_items_history', ['expiry_date'], unique=False)
+
+    op.create_table(
+        'pickups_history',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('status', sa.String(), nullable=True),
+        sa.Column('pickup_time', sa.DateTime(), nullable=True),
+        sa.Column('food_item_id', sa.Integer(), nullable=True),
+        sa.Column('restaurant_id', sa.Integer(), nullable=True),
+        sa.Column('charity_id', sa.Integer(), nullable=True),
+        sa.Column('rating', sa.Float(), nullable=True),
+        sa.Column('impact', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('archived_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_pickups_history_restaurant_id', 'pickups_history', ['restaurant_id'], unique=False)
+    op.create_index('ix_pickups_history_charity_id', 'pickups_history', ['charity_id'], unique=False)
+    op.create_index('ix_pickups_history_created_at', 'pickups_history', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_pickups_history_created_at', table_name='pickups_history')
+    op.drop_index('ix_pickups_history_charity_id', table_name='pickups_history')
+    op.drop_index('ix_pickups_history_restaurant_id', table_name='pickups_history')
+    op.drop_table('pickups_history')
+    op.drop_index('ix_food_items_history_expiry_date', table_name='food_items_history')
+    op.drop_index('ix_food_items_history_restaurant_id', table_name='food_items_history')
+    op.drop_table('food_items_history')
@@ -0,0 +1,26 @@
+"""Index refresh token revocation time
+
+Revision ID: 6f1c9a3e5b27
+Revises: 2d7a4c8e1f05
+Create Date: 2026-10-18 18:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6f1c9a3e5b27'
+down_revision: Union[str, None] = '2d7a4c8e1f05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_refresh_tokens_revoked_at'), 'refresh_tokens', ['revoked_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_refresh_tokens_revoked_at'), table_name='refresh_tokens')
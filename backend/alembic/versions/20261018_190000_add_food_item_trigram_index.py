@@ -0,0 +1,33 @@
+"""Add food item trigram index for fuzzy search
+
+Revision ID: 8c2e5b7f4a16
+Revises: 6f1c9a3e5b27
+Create Date: 2026-10-18 19:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c2e5b7f4a16'
+down_revision: Union[str, None] = '6f1c9a3e5b27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Postgres only; SQLite search has no fuzzy fallback
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute(
+            "CREATE INDEX ix_food_items_search_trgm ON food_items USING GIN "
+            "((coalesce(name, '') || ' ' || coalesce(description, '')) gin_trgm_ops)"
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_food_items_search_trgm")
@@ -0,0 +1,217 @@
+"""Server-side response cache with ETag / conditional GET support."""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from starlette.requests import cookie_parser
+
+from app.core.config import settings
+from app.core.security import get_token_subject
+from app.database.replicas import STICKY_COOKIE
+from app.database.session import client_key, get_replica_router
+
+
+class ResponseCache:
+    """
+    Size-bounded LRU of rendered responses with a TTL and tag invalidation.
+
+    Entries are tagged (e.g. "listings", "restaurant:<email>") so write
+    routes can drop everything derived from the data they changed. Each
+    tag carries a generation counter: a response rendered before an
+    invalidation is not stored after it. The cache is per process, so
+    other workers converge within the TTL.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        # key -> (expires_at, tag, etag, body, headers)
+        self._entries: "OrderedDict[str, Tuple[float, str, str, bytes, List[Tuple[bytes, bytes]]]]" = OrderedDict()
+        self._tags: Dict[str, set] = {}
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def generation(self, tag: str) -> int:
+        """Current invalidation generation of a tag."""
+        return self._generations.get(tag, 0)
+
+    def get(self, key: str) -> Optional[Tuple[str, bytes, List[Tuple[bytes, bytes]]]]:
+        """Return (etag, body, headers) for a live entry, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, _, etag, body, headers = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return etag, body, headers
+
+    def set(self, key: str, tag: str, generation: int, body: bytes,
+            headers: List[Tuple[bytes, bytes]]) -> str:
+        """Store a response body rendered at `generation` and return its ETag."""
+        etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+        with self._lock:
+            if generation != self.generation(tag):
+                return etag
+            self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, tag, etag, body, headers)
+            self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+        return etag
+
+    def invalidate(self, tag: str) -> None:
+        """Drop every entry stored under a tag."""
+        with self._lock:
+            self._generations[tag] = self.generation(tag) + 1
+            for key in list(self._tags.get(tag, ())):
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            for tag in self._tags:
+                self._generations[tag] = self.generation(tag) + 1
+            self._entries.clear()
+            self._tags.clear()
+
+    def _remove(self, key: str) -> None:
+        """Remove an entry; the caller holds the lock."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        keys = self._tags.get(entry[1])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._tags[entry[1]]
+
+
+# Global cache instance
+response_cache = ResponseCache(
+    ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS,
+    max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+)
+
+# Responses larger than this are served but never cached
+MAX_CACHED_BODY_BYTES = 512 * 1024
+
+# Cacheable GET paths: path -> (tag builder, per-user)
+# Per-user tags receive the token subject; public tags receive None.
+CACHED_ROUTES: Dict[str, Tuple[Callable[[Optional[str]], str], bool]] = {
+    "/api/listings/": (lambda subject: "listings", False),
+    "/api/listings/nearby": (lambda subject: "listings", False),
+    "/api/listings/search": (lambda subject: "listings", False),
+    "/api/restaurants/profile": (lambda subject: f"restaurant:{subject}", True),
+    "/api/charities/profile": (lambda subject: f"charity:{subject}", True),
+}
+
+# Headers replayed from the original response on a cache hit
+_STORED_HEADERS = {b"content-type"}
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag."""
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class ResponseCacheMiddleware:
+    """
+    ASGI middleware serving cached GET responses.
+
+    Runs before routing, so a hit (or a 304 for a matching If-None-Match)
+    never opens a database session or resolves the current user. Other
+    requests pass straight through untouched, including streams.
+    """
+
+    def __init__(self, app, cache: ResponseCache = response_cache):
+        self.app = app
+        self.cache = cache
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET" or scope["path"] not in CACHED_ROUTES:
+            await self.app(scope, receive, send)
+            return
+
+        tag_for, per_user = CACHED_ROUTES[scope["path"]]
+        headers = dict(scope["headers"])
+        replica_router = get_replica_router()
+        if replica_router.engines:
+            # Recent writers read their own writes from the primary, uncached
+            authorization = headers.get(b"authorization", b"").decode("latin-1") or None
+            host = scope["client"][0] if scope.get("client") else None
+            primary_until = cookie_parser(headers.get(b"cookie", b"").decode("latin-1")).get(STICKY_COOKIE)
+            if replica_router.is_sticky(client_key(authorization, host), primary_until):
+                await self.app(scope, receive, send)
+                return
+        subject = None
+        if per_user:
+            authorization = headers.get(b"authorization", b"").decode("latin-1")
+            scheme, _, token = authorization.partition(" ")
+            subject = get_token_subject(token) if scheme.lower() == "bearer" else None
+            if subject is None:
+                # Let the route produce its 401
+                await self.app(scope, receive, send)
+                return
+
+        key = f"{scope['path']}?{scope['query_string'].decode('latin-1')}|{subject or ''}"
+        tag = tag_for(subject)
+        generation = self.cache.generation(tag)
+        cache_control = b"private, no-cache" if per_user else b"no-cache"
+        if_none_match = headers.get(b"if-none-match", b"").decode("latin-1")
+        cached = self.cache.get(key)
+        if cached is not None:
+            etag, body, stored_headers = cached
+            if if_none_match and _etag_matches(if_none_match, etag):
+                await self._send(send, 304, b"", [(b"etag", etag.encode()), (b"cache-control", cache_control)])
+            else:
+                await self._send(send, 200, body, stored_headers + [
+                    (b"etag", etag.encode()),
+                    (b"cache-control", cache_control),
+                    (b"content-length", str(len(body)).encode()),
+                ])
+            return
+
+        # Miss: buffer the response so it can be stored with its ETag
+        start_message = {}
+        chunks = []
+
+        async def capture(message):
+            if message["type"] == "http.response.start":
+                start_message.update(message)
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    await finish()
+
+        async def finish():
+            body = b"".join(chunks)
+            response_headers = [
+                (name, value) for name, value in start_message.get("headers", [])
+                if name.lower() not in (b"content-length", b"etag", b"cache-control")
+            ]
+            status_code = start_message["status"]
+            if status_code == 200 and len(body) <= MAX_CACHED_BODY_BYTES:
+                stored = [(name, value) for name, value in response_headers if name.lower() in _STORED_HEADERS]
+                etag = self.cache.set(key, tag, generation, body, stored)
+                response_headers += [(b"etag", etag.encode()), (b"cache-control", cache_control)]
+                if if_none_match and _etag_matches(if_none_match, etag):
+                    await self._send(send, 304, b"", response_headers)
+                    return
+            response_headers.append((b"content-length", str(len(body)).encode()))
+            await self._send(send, status_code, body, response_headers)
+
+        await self.app(scope, receive, capture)
+
+    @staticmethod
+    async def _send(send, status_code: int, body: bytes, headers: List[Tuple[bytes, bytes]]):
+        await send({"type": "http.response.start", "status": status_code, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
@@ -9,13 +9,72 @@ class Settings(BaseSettings):
     # Database configuration
     DATABASE_URL: str
     
+    # Connection pool (per engine, per worker process)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0  # seconds to wait for a connection
+    DB_POOL_RECYCLE: int = 1800  # seconds; -1 disables
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int = 0  # PostgreSQL only; 0 disables
+    AUTO_CREATE_TABLES: bool = False  # create missing tables at startup; Alembic owns the schema otherwise
+    
+    # Archival of finished rows into history tables (app/services/archive.py)
+    ARCHIVE_LISTINGS_AFTER_DAYS: int = 90  # days since expiry
+    ARCHIVE_PICKUPS_AFTER_DAYS: int = 180  # days since creation, completed/cancelled only
+    ARCHIVE_BATCH_SIZE: int = 1000
+    ARCHIVE_PAUSE_SECONDS: float = 0.0  # between batches
+    PICKUP_PARTITION_MONTHS_AHEAD: int = 3  # PostgreSQL, once pickups is partitioned
+    
+    # Background job scheduler (one leader worker runs the jobs; cron fields are UTC, empty disables)
+    SCHEDULER_ENABLED: bool = True
+    SCHEDULER_LEASE_SECONDS: float = 60.0  # lease-row fallback (SQLite) only
+    SCHEDULER_RENEW_SECONDS: float = 15.0  # leader re-checks its lock/lease this often
+    SCHEDULER_RETRY_SECONDS: float = 30.0  # followers retry the election this often
+    EXPIRE_LISTINGS_EVERY_SECONDS: float = 60.0  # 0 disables
+    PURGE_REFRESH_TOKENS_CRON: str = "15 * * * *"
+    RECONCILE_STATS_CRON: str = "30 3 * * *"
+    ARCHIVE_CRON: str = "0 4 * * *"
+    PICKUP_PARTITIONS_CRON: str = "0 5 * * *"
+    
+    # Read replicas (comma-separated URLs; empty = primary only)
+    DATABASE_REPLICA_URLS: str = ""
+    REPLICA_STICKY_SECONDS: float = 5.0  # reads stay on the primary this long after a write
+    REPLICA_HEALTH_CHECK_SECONDS: float = 10.0
+    
     # Security settings
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 14
+    REVOCATION_SYNC_SECONDS: float = 30.0
+    
+    # Prometheus metrics at /metrics (per worker process)
+    METRICS_ENABLED: bool = True
     
     # Frontend URL for CORS
     FRONTEND_URL: str
+    
+    # Password hashing (bcrypt cost and worker pool)
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 0  # 0 = one per CPU
+    PASSWORD_HASH_QUEUE_SIZE: int = 32
+    
+    # Rate limiting for login/signup (token buckets)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = "app.core.rate_limit.InMemoryRateLimitBackend"
+    RATE_LIMIT_IP_PER_MINUTE: int = 20
+    RATE_LIMIT_ACCOUNT_PER_MINUTE: int = 5
+    RATE_LIMIT_MAX_KEYS: int = 100000
+    RATE_LIMIT_TRUST_FORWARDED: bool = False  # honour X-Forwarded-For behind a proxy
+    RATE_LIMIT_TRUSTED_HOPS: int = 1  # proxies of ours appending to X-Forwarded-For
+    
+    # Principal cache for get_current_user
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 60.0
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+    
+    # Response cache for hot GET routes
+    RESPONSE_CACHE_TTL_SECONDS: float = 30.0
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1024
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,125 @@
+"""Geohash utilities for radius searches over restaurant and charity locations."""
+
+import math
+from typing import List, Tuple
+
+# Geohash alphabet and the precision stored on location rows (~5m cells)
+GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+GEOHASH_PRECISION = 9
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 111.32
+
+
+def encode_geohash(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    """Encode a coordinate as a geohash string."""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    geohash = []
+    bits = 0
+    bit_count = 0
+    even = True
+
+    while len(geohash) < precision:
+        # Bits alternate between longitude and latitude, longitude first
+        interval, value = (lon_range, longitude) if even else (lat_range, latitude)
+        mid = (interval[0] + interval[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            interval[0] = mid
+        else:
+            bits = bits << 1
+            interval[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            geohash.append(GEOHASH_ALPHABET[bits])
+            bits = 0
+            bit_count = 0
+
+    return "".join(geohash)
+
+
+def _cell_size_degrees(precision: int) -> Tuple[float, float]:
+    """Return the (latitude, longitude) size in degrees of a geohash cell."""
+    lat_bits = (5 * precision) // 2
+    lon_bits = 5 * precision - lat_bits
+    return 180.0 / (2 ** lat_bits), 360.0 / (2 ** lon_bits)
+
+
+def _longitude_spans(lon_min: float, lon_max: float) -> List[Tuple[float, float]]:
+    """
+    Split a longitude interval that may run past the antimeridian into valid spans.
+
+    (170, 190) becomes [(170, 180), (-180, -170)]; an interval of 360
+    degrees or more is the whole range.
+    """
+    if lon_max - lon_min >= 360.0:
+        return [(-180.0, 180.0)]
+    if lon_min < -180.0:
+        return [(lon_min + 360.0, 180.0), (-180.0, lon_max)]
+    if lon_max > 180.0:
+        return [(lon_min, 180.0), (-180.0, lon_max - 360.0)]
+    return [(lon_min, lon_max)]
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two coordinates in kilometres."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = math.radians(lat2 - lat1)
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def geohash_ranges(latitude: float, longitude: float, radius_km: float) -> List[Tuple[str, str]]:
+    """
+    Cover a search circle with geohash cells.
+
+    Picks the finest precision whose cells are at least as large as the
+    radius, so the circle's bounding box touches at most 3x3 cells, and
+    returns each cell as an inclusive (low, high) range over stored
+    geohashes. Every range is served by a B-tree index scan.
+
+    Args:
+        latitude: Centre latitude
+        longitude: Centre longitude
+        radius_km: Search radius in kilometres
+
+    Returns:
+        List of (low, high) geohash bounds; empty if the whole globe matches
+    """
+    lon_scale = max(math.cos(math.radians(latitude)), 0.01)
+
+    precision = 0
+    for candidate in range(GEOHASH_PRECISION, 0, -1):
+        cell_lat, cell_lon = _cell_size_degrees(candidate)
+        if cell_lat * KM_PER_DEGREE >= radius_km and cell_lon * KM_PER_DEGREE * lon_scale >= radius_km:
+            precision = candidate
+            break
+    if precision == 0:
+        return []
+
+    # Bounding box of the circle; latitude is clamped at the poles, longitude wraps
+    d_lat = radius_km / KM_PER_DEGREE
+    d_lon = radius_km / (KM_PER_DEGREE * lon_scale)
+    lat_min, lat_max = max(latitude - d_lat, -90.0), min(latitude + d_lat, 90.0)
+    if lat_min == -90.0 or lat_max == 90.0:
+        # A circle over a pole spans every longitude
+        d_lon = 180.0
+    lon_spans = _longitude_spans(longitude - d_lon, longitude + d_lon)
+
+    # Sample the box one cell apart so every intersecting cell is hit
+    cell_lat, cell_lon = _cell_size_degrees(precision)
+    lat_steps = int(math.ceil((lat_max - lat_min) / cell_lat))
+    cells = set()
+    for lon_min, lon_max in lon_spans:
+        lon_steps = int(math.ceil((lon_max - lon_min) / cell_lon))
+        for i in range(lat_steps + 1):
+            lat = min(lat_min + i * cell_lat, lat_max)
+            for j in range(lon_steps + 1):
+                lon = min(lon_min + j * cell_lon, lon_max)
+                cells.add(encode_geohash(lat, lon, precision))
+
+    padding = GEOHASH_ALPHABET[-1] * (GEOHASH_PRECISION - precision)
+    return [(cell, cell + padding) for cell in sorted(cells)]
@@ -0,0 +1,128 @@
+"""Bounded process pool for bcrypt password hashing and verification."""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from passlib.context import CryptContext
+
+from app.core.config import settings
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing queue is full; callers should answer 503."""
+
+
+@lru_cache(maxsize=None)
+def _context(rounds: int) -> CryptContext:
+    # min == max == default, so a hash at any other cost needs an update
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds,
+    )
+
+
+def _hash(password: str, rounds: int) -> str:
+    return _context(rounds).hash(password)
+
+
+def _hash_batch(passwords: List[str], rounds: int) -> List[str]:
+    context = _context(rounds)
+    return [context.hash(password) for password in passwords]
+
+
+def _verify(password: str, hashed_password: str, rounds: int) -> Tuple[bool, Optional[str]]:
+    """Return (valid, replacement hash if the stored cost is out of date)."""
+    return _context(rounds).verify_and_update(password, hashed_password)
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt in worker processes with a cap on outstanding jobs.
+
+    Hashing is CPU bound, so doing it on the request path lets a login
+    burst starve every other route. Jobs beyond `workers + queue_size`
+    are rejected immediately instead of piling up behind each other.
+    """
+
+    def __init__(self, rounds: int, workers: int, queue_size: int):
+        self.rounds = rounds
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = self.workers + queue_size
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    # Forking a threaded server can copy held locks into the child
+                    mp_context=multiprocessing.get_context("forkserver"),
+                )
+            return self._executor
+
+    async def _submit(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHasherBusy()
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        # Free the slot when the worker finishes, not when the caller stops
+        # waiting: a cancelled request leaves the job running
+        future.add_done_callback(lambda _: self._slots.release())
+        return await asyncio.wrap_future(future)
+
+    async def hash(self, password: str) -> str:
+        """Hash a password at the configured cost."""
+        return await self._submit(_hash, password, self.rounds)
+
+    async def verify(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """
+        Check a password against its stored hash.
+
+        Returns:
+            (valid, new_hash) where new_hash is set when the stored hash
+            used a different bcrypt cost and should be replaced.
+        """
+        return await self._submit(_verify, password, hashed_password, self.rounds)
+
+    async def hash_many(self, passwords: List[str]) -> List[str]:
+        """
+        Hash a batch of passwords in parallel, preserving order.
+
+        The batch is split into one chunk per half of the workers, so bulk
+        jobs leave capacity for interactive logins. Each chunk takes a
+        queue slot like a single hash would.
+        """
+        if not passwords:
+            return []
+        parallelism = min(len(passwords), max(1, self.workers // 2))
+        size = -(-len(passwords) // parallelism)
+        chunks = [passwords[start:start + size] for start in range(0, len(passwords), size)]
+        results = await asyncio.gather(*(self._submit(_hash_batch, chunk, self.rounds) for chunk in chunks))
+        return [hashed for chunk in results for hashed in chunk]
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+# Global hasher instance
+password_hasher = PasswordHasher(
+    rounds=settings.BCRYPT_ROUNDS,
+    workers=settings.PASSWORD_HASH_WORKERS,
+    queue_size=settings.PASSWORD_HASH_QUEUE_SIZE,
+)
@@ -0,0 +1,272 @@
+"""Per-route request metrics and per-request SQL counts in Prometheus format.
+
+``MetricsMiddleware`` records, for each (method, route template), request
+counts by status, a latency histogram, and histograms of how many SQL
+statements each request ran and how long they took. Statements are
+counted by ``before_cursor_execute`` / ``after_cursor_execute`` (or
+``handle_error`` for failed statements) listeners on every engine,
+attributed to the request through a context variable.
+Scheduled background jobs report runs by outcome and their durations.
+Everything is per process; ``render`` produces the text served at
+``/metrics``.
+"""
+
+import bisect
+import contextvars
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import Engine, event
+
+# Upper bounds of the histograms; the last bucket is +Inf
+LATENCY_BUCKETS_SECONDS: List[float] = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10]
+QUERY_COUNT_BUCKETS: List[float] = [0, 1, 2, 3, 5, 10, 20, 50, 100]
+DB_TIME_BUCKETS_SECONDS: List[float] = [0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5]
+JOB_DURATION_BUCKETS_SECONDS: List[float] = [0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300, 900]
+
+
+class _Histogram:
+    __slots__ = ("bounds", "counts", "total")
+
+    def __init__(self, bounds: List[float]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.total += value
+
+
+class _QueryTally:
+    __slots__ = ("count", "seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+
+# SQL statements run on behalf of the current request, if any
+_request_queries: contextvars.ContextVar[Optional[_QueryTally]] = contextvars.ContextVar(
+    "request_queries", default=None
+)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany) -> None:
+    if context is not None:
+        context._query_start = time.perf_counter()
+
+
+def _record_statement(context) -> None:
+    started = getattr(context, "_query_start", None)
+    if started is None:
+        return
+    context._query_start = None
+    elapsed = time.perf_counter() - started
+    metrics.record_query(elapsed)
+    tally = _request_queries.get()
+    if tally is not None:
+        tally.count += 1
+        tally.seconds += elapsed
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _stop_query_timer(conn, cursor, statement, parameters, context, executemany) -> None:
+    _record_statement(context)
+
+
+@event.listens_for(Engine, "handle_error")
+def _stop_failed_query_timer(exception_context) -> None:
+    # after_cursor_execute never fires for a statement that raised
+    _record_statement(exception_context.execution_context)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: str) -> str:
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+
+
+def _render_histogram(name: str, labels: str, histogram: _Histogram) -> List[str]:
+    lines = []
+    cumulative = 0
+    for bound, count in zip(histogram.bounds, histogram.counts):
+        cumulative += count
+        lines.append(f'{name}_bucket{{{labels},le="{bound:g}"}} {cumulative}')
+    cumulative += histogram.counts[-1]
+    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {cumulative}')
+    lines.append(f"{name}_sum{{{labels}}} {histogram.total:.6f}")
+    lines.append(f"{name}_count{{{labels}}} {cumulative}")
+    return lines
+
+
+class MetricsRegistry:
+    """Counters and histograms for every (method, route) seen by this process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests: Dict[Tuple[str, str, int], int] = {}
+            self.latency: Dict[Tuple[str, str], _Histogram] = {}
+            self.request_queries: Dict[Tuple[str, str], _Histogram] = {}
+            self.request_db_time: Dict[Tuple[str, str], _Histogram] = {}
+            self.queries = 0
+            self.query_seconds = 0.0
+            self.job_runs: Dict[Tuple[str, str], int] = {}
+            self.job_duration: Dict[str, _Histogram] = {}
+            self.job_last_success: Dict[str, float] = {}
+            self.scheduler_leader = False
+
+    def record_request(self, method: str, route: str, status: int, seconds: float,
+                       queries: int, db_seconds: float) -> None:
+        key = (method, route)
+        with self._lock:
+            self.requests[(method, route, status)] = self.requests.get((method, route, status), 0) + 1
+            if key not in self.latency:
+                self.latency[key] = _Histogram(LATENCY_BUCKETS_SECONDS)
+                self.request_queries[key] = _Histogram(QUERY_COUNT_BUCKETS)
+                self.request_db_time[key] = _Histogram(DB_TIME_BUCKETS_SECONDS)
+            self.latency[key].observe(seconds)
+            self.request_queries[key].observe(queries)
+            self.request_db_time[key].observe(db_seconds)
+
+    def record_query(self, seconds: float) -> None:
+        with self._lock:
+            self.queries += 1
+            self.query_seconds += seconds
+
+    def record_job(self, name: str, outcome: str, seconds: float) -> None:
+        """Count a scheduled job run; outcome is success, failure or timeout."""
+        with self._lock:
+            self.job_runs[(name, outcome)] = self.job_runs.get((name, outcome), 0) + 1
+            if name not in self.job_duration:
+                self.job_duration[name] = _Histogram(JOB_DURATION_BUCKETS_SECONDS)
+            self.job_duration[name].observe(seconds)
+            if outcome == "success":
+                self.job_last_success[name] = time.time()
+
+    def set_scheduler_leader(self, is_leader: bool) -> None:
+        with self._lock:
+            self.scheduler_leader = is_leader
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format (0.0.4)."""
+        lines = []
+        with self._lock:
+            lines += [
+                "# HELP http_requests_total Requests handled, by route and status.",
+                "# TYPE http_requests_total counter",
+            ]
+            for (method, route, status), count in sorted(self.requests.items()):
+                lines.append(f"http_requests_total{{{_labels(method=method, route=route, status=str(status))}}} {count}")
+
+            for name, help_text, histograms in (
+                ("http_request_duration_seconds", "Request latency.", self.latency),
+                ("http_request_db_queries", "SQL statements executed per request.", self.request_queries),
+                ("http_request_db_duration_seconds", "Time spent in SQL per request.", self.request_db_time),
+            ):
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+                for (method, route), histogram in sorted(histograms.items()):
+                    lines += _render_histogram(name, _labels(method=method, route=route), histogram)
+
+            lines += [
+                "# HELP db_queries_total SQL statements executed, including background work.",
+                "# TYPE db_queries_total counter",
+                f"db_queries_total {self.queries}",
+                "# HELP db_query_duration_seconds_total Time spent executing SQL statements.",
+                "# TYPE db_query_duration_seconds_total counter",
+                f"db_query_duration_seconds_total {self.query_seconds:.6f}",
+                "# HELP scheduler_leader Whether this process currently runs scheduled jobs.",
+                "# TYPE scheduler_leader gauge",
+                f"scheduler_leader {int(self.scheduler_leader)}",
+                "# HELP scheduler_job_runs_total Scheduled job runs, by outcome.",
+                "# TYPE scheduler_job_runs_total counter",
+            ]
+            for (job, outcome), count in sorted(self.job_runs.items()):
+                lines.append(f"scheduler_job_runs_total{{{_labels(job=job, outcome=outcome)}}} {count}")
+            name = "scheduler_job_duration_seconds"
+            lines += [f"# HELP {name} Scheduled job run time.", f"# TYPE {name} histogram"]
+            for job, histogram in sorted(self.job_duration.items()):
+                lines += _render_histogram(name, _labels(job=job), histogram)
+            lines += [
+                "# HELP scheduler_job_last_success_timestamp_seconds Unix time of the last successful run.",
+                "# TYPE scheduler_job_last_success_timestamp_seconds gauge",
+            ]
+            for job, timestamp in sorted(self.job_last_success.items()):
+                lines.append(f"scheduler_job_last_success_timestamp_seconds{{{_labels(job=job)}}} {timestamp:.3f}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+
+def _route_label(scope, status: int) -> str:
+    """
+    The matched route's path template, e.g. /api/listings/{food_item_id}.
+
+    Taken from the route's ``path_format``. Some FastAPI versions leave the
+    router prefix off included routes' templates, so the prefix is put back
+    as the part of the request path in front of what the route matched.
+    Requests answered before routing (cached responses, 429s) keep their
+    literal path, which is always one of a fixed set; anything else that
+    matched no route is lumped together to keep label cardinality bounded.
+    """
+    route = scope.get("route")
+    if route is None:
+        if status in (404, 405) or scope["method"] == "OPTIONS":
+            return "unmatched"
+        return scope["path"]
+    template = getattr(route, "path_format", None)
+    path_regex = getattr(route, "path_regex", None)
+    if template is None or path_regex is None:
+        return "unmatched"
+    path = scope["path"]
+    for index, char in enumerate(path):
+        if char == "/" and path_regex.match(path[index:]):
+            return path[:index] + template
+    return template
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware timing every HTTP request and counting its SQL statements.
+
+    Costs two clock reads and one short lock per request, and two clock
+    reads per statement, so it can stay enabled in production.
+    """
+
+    def __init__(self, app, registry: MetricsRegistry = metrics):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        tally = _QueryTally()
+        token = _request_queries.set(tally)
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            _request_queries.reset(token)
+            self.registry.record_request(
+                scope["method"], _route_label(scope, status), status, elapsed, tally.count, tally.seconds
+            )
@@ -0,0 +1,61 @@
+"""Query budgets: fail when a block of code runs more SQL than allowed.
+
+Wrap a request (or any code) in ``assert_max_queries`` to catch N+1
+regressions::
+
+    with assert_max_queries(2):
+        client.get("/api/listings/")
+
+Statements are counted on every engine and thread while the block runs,
+so it works with TestClient, which serves the app on another thread.
+Keep other traffic away from the process while measuring.
+"""
+
+from contextlib import contextmanager
+from typing import Iterator, List
+
+from sqlalchemy import Engine, event
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when a block runs more SQL statements than its budget."""
+
+    def __init__(self, label: str, limit: int, statements: List[str]):
+        self.label = label
+        self.limit = limit
+        self.statements = statements
+        listing = "\n".join(f"  {index}. {' '.join(sql.split())}" for index, sql in enumerate(statements, start=1))
+        super().__init__(f"{label} ran {len(statements)} SQL statements (budget {limit}):\n{listing}")
+
+
+@contextmanager
+def count_queries() -> Iterator[List[str]]:
+    """Collect the SQL of every statement executed inside the block."""
+    statements: List[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+
+
+@contextmanager
+def assert_max_queries(limit: int, label: str = "block") -> Iterator[List[str]]:
+    """
+    Fail if the block executes more than `limit` SQL statements.
+
+    Args:
+        limit: Maximum number of statements allowed
+        label: Name used in the failure message, e.g. "GET /api/listings/"
+
+    Raises:
+        QueryBudgetExceeded: If the budget was exceeded
+    """
+    with count_queries() as statements:
+        yield statements
+    if len(statements) > limit:
+        raise QueryBudgetExceeded(label, limit, statements)
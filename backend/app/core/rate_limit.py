@@ -0,0 +1,245 @@
+"""Token-bucket rate limiting for expensive endpoints (login, signup)."""
+
+import importlib
+import json
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+
+class RateLimitBackend(ABC):
+    """
+    Storage for token buckets.
+
+    Implementations must make `hit` atomic per key. Methods are coroutines
+    so a shared-store backend can await its client without blocking the
+    event loop. The in-process backend below is exact for a single worker;
+    with several workers, point RATE_LIMIT_BACKEND at a shared-store
+    implementation (e.g. one running the same arithmetic in a Redis script)
+    so limits are global. Both methods are abstract, so a backend missing
+    one fails when it is instantiated at startup rather than on the first
+    rate-limited request.
+    """
+
+    @abstractmethod
+    async def hit(self, key: str, capacity: float, refill_per_second: float, cost: float = 1.0) -> Tuple[bool, float]:
+        """
+        Take `cost` tokens from a bucket.
+
+        Returns:
+            (allowed, retry_after_seconds); retry_after is 0 when allowed
+        """
+
+    @abstractmethod
+    async def reset(self) -> None:
+        """Drop every bucket."""
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """
+    Per-process token buckets in an LRU capped at `max_keys`.
+
+    Each bucket is (tokens, last_update); refilling is computed lazily on
+    access, so a hit is O(1). A bucket idle long enough to refill
+    completely is indistinguishable from a new one, so evicting idle keys
+    (oldest first) bounds memory without loosening any limit in practice.
+    Buckets are only touched from the event loop and `hit` never awaits,
+    so each hit is atomic without a lock.
+    """
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def hit(self, key: str, capacity: float, refill_per_second: float,
+                  cost: float = 1.0) -> Tuple[bool, float]:
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.pop(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated_at) * refill_per_second)
+        allowed = tokens >= cost
+        if allowed:
+            tokens -= cost
+        self._buckets[key] = (tokens, now)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        if allowed:
+            return True, 0.0
+        return False, (cost - tokens) / refill_per_second
+
+    async def reset(self) -> None:
+        self._buckets.clear()
+
+
+def load_backend(path: str) -> RateLimitBackend:
+    """Instantiate a backend from a dotted 'module.Class' path."""
+    module_name, _, class_name = path.rpartition(".")
+    backend_class = getattr(importlib.import_module(module_name), class_name)
+    if backend_class is InMemoryRateLimitBackend:
+        return backend_class(max_keys=settings.RATE_LIMIT_MAX_KEYS)
+    return backend_class()
+
+
+# Rate-limited routes: (method, path) -> bucket scopes checked in order.
+# "ip" keys on the client address, "account" on the email in the JSON body.
+RATE_LIMITED_ROUTES: Dict[Tuple[str, str], List[str]] = {
+    ("POST", "/api/auth/login"): ["ip", "account"],
+    ("POST", "/api/auth/signup"): ["ip"],
+}
+
+# Account-scoped routes reject bodies larger than this with 413, since
+# their account key could not be read without buffering them whole
+_MAX_INSPECTED_BODY_BYTES = 16 * 1024
+
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware rejecting over-limit requests with 429 before routing.
+
+    Rejected requests never reach the bcrypt pool or the database. Each
+    scope is a token bucket of RATE_LIMIT_*_PER_MINUTE tokens refilled
+    continuously, so bursts up to the limit are allowed. Account-scoped
+    routes answer 413 for bodies too large to read the account from.
+    """
+
+    def __init__(self, app, backend: Optional[RateLimitBackend] = None):
+        self.app = app
+        self.backend = backend or load_backend(settings.RATE_LIMIT_BACKEND)
+        self.limits = {
+            "ip": settings.RATE_LIMIT_IP_PER_MINUTE,
+            "account": settings.RATE_LIMIT_ACCOUNT_PER_MINUTE,
+        }
+
+    async def __call__(self, scope, receive, send):
+        if not settings.RATE_LIMIT_ENABLED or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        scopes = RATE_LIMITED_ROUTES.get((scope["method"], scope["path"]))
+        if not scopes:
+            await self.app(scope, receive, send)
+            return
+
+        body = None
+        if "account" in scopes:
+            if self._too_large(scope):
+                await self._reject_too_large(send)
+                return
+            body, complete = await self._read_body(receive)
+            if not complete or len(body) > _MAX_INSPECTED_BODY_BYTES:
+                # Letting it through would skip the per-account bucket
+                await self._reject_too_large(send)
+                return
+            receive = self._replay(body, complete, receive)
+        for bucket_scope in scopes:
+            if bucket_scope == "ip":
+                identity = self._client_ip(scope)
+            else:
+                # Bodies without a readable email share one bucket rather than none
+                identity = self._account(body) or "-"
+            if identity is None:
+                continue
+            per_minute = self.limits[bucket_scope]
+            allowed, retry_after = await self.backend.hit(
+                f"{bucket_scope}:{scope['path']}:{identity}", per_minute, per_minute / 60.0
+            )
+            if not allowed:
+                await self._reject(send, retry_after)
+                return
+
+        await self.app(scope, receive, send)
+
+    @staticmethod
+    def _client_ip(scope) -> Optional[str]:
+        if settings.RATE_LIMIT_TRUST_FORWARDED:
+            # Proxies append, so only the last RATE_LIMIT_TRUSTED_HOPS entries
+            # were written by our own proxies; anything left of them is the
+            # client's to forge
+            addresses = [
+                address.strip()
+                for name, value in scope["headers"] if name == b"x-forwarded-for"
+                for address in value.decode("latin-1").split(",") if address.strip()
+            ]
+            if addresses:
+                return addresses[max(0, len(addresses) - max(1, settings.RATE_LIMIT_TRUSTED_HOPS))]
+        client = scope.get("client")
+        return client[0] if client else None
+
+    @staticmethod
+    def _too_large(scope) -> bool:
+        """Whether a declared Content-Length rules out inspecting the body."""
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                try:
+                    return int(value) > _MAX_INSPECTED_BODY_BYTES
+                except ValueError:
+                    return False
+        return False
+
+    @staticmethod
+    def _account(body: Optional[bytes]) -> Optional[str]:
+        if body is None:
+            return None
+        try:
+            email = json.loads(body).get("email")
+        except (ValueError, AttributeError):
+            return None
+        return email.strip().lower() if isinstance(email, str) else None
+
+    @staticmethod
+    async def _read_body(receive) -> Tuple[bytes, bool]:
+        """
+        Buffer the body, stopping once it passes _MAX_INSPECTED_BODY_BYTES.
+
+        Returns:
+            (bytes read, whether that is the whole body)
+        """
+        chunks = []
+        size = 0
+        while True:
+            message = await receive()
+            if message["type"] != "http.request":
+                return b"".join(chunks), True
+            chunk = message.get("body", b"")
+            chunks.append(chunk)
+            size += len(chunk)
+            if not message.get("more_body", False):
+                return b"".join(chunks), True
+            if size > _MAX_INSPECTED_BODY_BYTES:
+                return b"".join(chunks), False
+
+    @staticmethod
+    def _replay(body: bytes, complete: bool, receive):
+        """Hand the buffered bytes to the app, then defer to the real channel for the rest."""
+        sent = False
+
+        async def replay():
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": body, "more_body": not complete}
+            return await receive()
+
+        return replay
+
+    @staticmethod
+    async def _send_error(send, status: int, detail: str, headers: List[Tuple[bytes, bytes]]):
+        body = json.dumps({"detail": detail}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ] + headers,
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    async def _reject(self, send, retry_after: float):
+        await self._send_error(send, 429, "Too many requests, please retry later",
+                               [(b"retry-after", str(max(1, math.ceil(retry_after))).encode())])
+
+    async def _reject_too_large(self, send):
+        await self._send_error(send, 413, "Request body too large", [])
@@ -0,0 +1,89 @@
+"""In-memory revocation list of ended login sessions."""
+
+import asyncio
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.user import RefreshToken
+
+logger = logging.getLogger(__name__)
+
+
+class RevocationList:
+    """
+    Ids of ended sessions (token families), for rejecting their access tokens.
+
+    A session ends on logout or when a rotated refresh token is presented
+    again; both revoke the family's newest token without a successor. Only
+    those families are kept, and each only for ACCESS_TOKEN_EXPIRE_MINUTES
+    after it ended, since no access token of the session can outlive that.
+    Normal rotations never enter the list: a redeemed refresh token is
+    already rejected by rotate_refresh_token's conditional UPDATE. Lookups
+    are dict membership and never touch the database. Revocations made by
+    this process apply at once; ``sync`` picks up the other workers' ones
+    incrementally.
+    """
+
+    # Re-read this far behind the last revocation seen, so rows whose
+    # transactions committed late are not skipped
+    SYNC_OVERLAP = timedelta(seconds=60)
+
+    def __init__(self):
+        # family_id -> time after which its access tokens have all expired
+        self._sessions: Dict[str, datetime] = {}
+        self._synced_until: Optional[datetime] = None
+        self._lock = threading.Lock()
+
+    def is_session_revoked(self, session_id: str) -> bool:
+        return session_id in self._sessions
+
+    def revoke_session(self, session_id: str, revoked_at: Optional[datetime] = None) -> None:
+        forget_at = (revoked_at or datetime.utcnow()) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        with self._lock:
+            self._sessions[session_id] = max(forget_at, self._sessions.get(session_id, forget_at))
+
+    def prune(self, now: Optional[datetime] = None) -> None:
+        """Forget sessions whose access tokens have all expired."""
+        now = now or datetime.utcnow()
+        with self._lock:
+            self._sessions = {
+                session_id: forget_at for session_id, forget_at in self._sessions.items() if forget_at > now
+            }
+
+    def sync(self, db: Session) -> None:
+        """Add sessions ended since the last sync (or within the access-token lifetime, on the first one)."""
+        now = datetime.utcnow()
+        since = now - timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        if self._synced_until is not None:
+            since = max(since, self._synced_until - self.SYNC_OVERLAP)
+        rows = db.execute(
+            select(RefreshToken.family_id, RefreshToken.revoked_at)
+            .where(RefreshToken.revoked_at > since, RefreshToken.replaced_by.is_(None))
+        ).all()
+        for row in rows:
+            self.revoke_session(row.family_id, row.revoked_at)
+        self._synced_until = now
+        self.prune(now)
+
+
+async def sync_revocations(interval_seconds: float) -> None:
+    """Keep the global revocation list in step with the database forever; run as a background task."""
+    from app.database.session import AsyncSessionLocal
+
+    while True:
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.run_sync(revocation_list.sync)
+        except Exception:
+            logger.exception("Failed to sync the token revocation list")
+        await asyncio.sleep(interval_seconds)
+
+
+# Global revocation list
+revocation_list = RevocationList()
@@ -0,0 +1,353 @@
+"""In-process scheduler for periodic background jobs, run by one worker at a time.
+
+Every worker starts a ``Scheduler`` from the app lifespan, but only the
+elected leader runs jobs; the others retry the election periodically
+and take over if the leader goes away. On PostgreSQL the leader holds a
+session-level advisory lock on a dedicated connection, which the server
+releases as soon as that connection drops. Elsewhere (SQLite) leadership
+is a lease row in ``scheduler_leases`` that the leader keeps renewing.
+
+Jobs are coroutine functions scheduled either every N seconds or by a
+five-field cron expression (UTC), with optional random jitter and a
+per-run timeout. Runs are recorded in ``app.core.metrics``.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import socket
+import time
+import uuid
+import zlib
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+from sqlalchemy import or_, text, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, async_sessionmaker
+
+from app.core.metrics import MetricsRegistry, metrics
+from app.models.scheduler import SchedulerLease
+
+logger = logging.getLogger(__name__)
+
+LEADER_LOCK_NAME = "leftover-love-scheduler"
+
+
+def _parse_cron_field(field: str, low: int, high: int) -> Set[int]:
+    values = set()
+    for part in field.split(","):
+        step = 1
+        if "/" in part:
+            part, step_text = part.split("/", 1)
+            step = int(step_text)
+            if step < 1:
+                raise ValueError(f"Invalid cron step in {field!r}")
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start_text, end_text = part.split("-", 1)
+            start, end = int(start_text), int(end_text)
+        else:
+            start = int(part)
+            end = high if step > 1 else start
+        if start < low or end > high or start > end:
+            raise ValueError(f"Cron field {field!r} is outside {low}-{high}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronSchedule:
+    """
+    Standard five-field cron expression (minute hour day-of-month month day-of-week), in UTC.
+
+    Fields accept ``*``, numbers, ranges ``a-b``, lists ``a,b`` and steps
+    ``*/n``; day-of-week runs 0-6 from Sunday (7 is Sunday too). As in
+    cron, when both day fields are restricted a day matching either runs.
+    """
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression {expression!r} must have five fields")
+        self.expression = expression
+        self.minutes = _parse_cron_field(fields[0], 0, 59)
+        self.hours = _parse_cron_field(fields[1], 0, 23)
+        self.days = _parse_cron_field(fields[2], 1, 31)
+        self.months = _parse_cron_field(fields[3], 1, 12)
+        self.weekdays = {day % 7 for day in _parse_cron_field(fields[4], 0, 7)}
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day = moment.day in self.days
+        weekday = (moment.weekday() + 1) % 7 in self.weekdays
+        if self._any_day or self._any_weekday:
+            return day and weekday
+        return day or weekday
+
+    def next_after(self, moment: datetime) -> datetime:
+        """First matching minute strictly after `moment`."""
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=366 * 5)
+        while candidate < limit:
+            if candidate.month not in self.months:
+                candidate = (candidate.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"Cron expression {self.expression!r} never matches")
+
+    def __repr__(self) -> str:
+        return f"CronSchedule({self.expression!r})"
+
+
+class IntervalSchedule:
+    """Fixed delay between runs, counted from when the previous run was due."""
+
+    def __init__(self, seconds: float):
+        if seconds <= 0:
+            raise ValueError("Interval must be positive")
+        self.seconds = seconds
+
+    def next_after(self, moment: datetime) -> datetime:
+        return moment + timedelta(seconds=self.seconds)
+
+    def __repr__(self) -> str:
+        return f"IntervalSchedule({self.seconds!r})"
+
+
+class Job:
+    """A coroutine function plus when and how long it may run."""
+
+    def __init__(self, name: str, func: Callable[[], Awaitable[object]], schedule,
+                 jitter_seconds: float = 0.0, timeout_seconds: Optional[float] = None):
+        self.name = name
+        self.func = func
+        self.schedule = schedule
+        self.jitter_seconds = jitter_seconds
+        self.timeout_seconds = timeout_seconds
+
+
+class AdvisoryLockElection:
+    """Leadership through a PostgreSQL session-level advisory lock."""
+
+    def __init__(self, engine: AsyncEngine, name: str = LEADER_LOCK_NAME):
+        self.engine = engine
+        self.key = zlib.crc32(name.encode())
+        self._connection: Optional[AsyncConnection] = None
+
+    async def acquire(self) -> bool:
+        connection = await self.engine.connect()
+        try:
+            acquired = await connection.scalar(text("SELECT pg_try_advisory_lock(:key)"), {"key": self.key})
+            # Don't sit idle in a transaction; the lock outlives it
+            await connection.commit()
+        except Exception:
+            await connection.close()
+            raise
+        if not acquired:
+            await connection.close()
+            return False
+        self._connection = connection
+        return True
+
+    async def renew(self) -> bool:
+        """Check the connection holding the lock is still alive."""
+        try:
+            await self._connection.scalar(text("SELECT 1"))
+            await self._connection.commit()
+            return True
+        except Exception:
+            logger.warning("Lost the scheduler advisory lock connection", exc_info=True)
+            return False
+
+    async def release(self) -> None:
+        connection, self._connection = self._connection, None
+        if connection is None:
+            return
+        try:
+            await connection.scalar(text("SELECT pg_advisory_unlock(:key)"), {"key": self.key})
+            await connection.commit()
+        finally:
+            await connection.close()
+
+
+class LeaseElection:
+    """
+    Leadership through a renewable lease row, for databases without advisory locks.
+
+    The holder must renew before `lease_seconds` pass; a crashed leader is
+    replaced once its lease expires.
+    """
+
+    def __init__(self, sessionmaker: async_sessionmaker, lease_seconds: float,
+                 name: str = LEADER_LOCK_NAME, holder: Optional[str] = None):
+        self.sessionmaker = sessionmaker
+        self.lease_seconds = lease_seconds
+        self.name = name
+        self.holder = holder or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+    async def _claim(self) -> bool:
+        now = datetime.utcnow()
+        expires_at = now + timedelta(seconds=self.lease_seconds)
+        async with self.sessionmaker() as db:
+            result = await db.execute(
+                update(SchedulerLease)
+                .where(
+                    SchedulerLease.name == self.name,
+                    or_(SchedulerLease.holder == self.holder, SchedulerLease.expires_at < now)
+                )
+                .values(holder=self.holder, expires_at=expires_at)
+            )
+            if result.rowcount == 0:
+                db.add(SchedulerLease(name=self.name, holder=self.holder, expires_at=expires_at))
+            try:
+                await db.commit()
+            except IntegrityError:
+                # Someone else holds a live lease
+                return False
+        return True
+
+    async def acquire(self) -> bool:
+        return await self._claim()
+
+    async def renew(self) -> bool:
+        try:
+            return await self._claim()
+        except Exception:
+            logger.warning("Failed to renew the scheduler lease", exc_info=True)
+            return False
+
+    async def release(self) -> None:
+        async with self.sessionmaker() as db:
+            await db.execute(
+                update(SchedulerLease)
+                .where(SchedulerLease.name == self.name, SchedulerLease.holder == self.holder)
+                .values(expires_at=datetime.utcnow())
+            )
+            await db.commit()
+
+
+def create_election(engine: AsyncEngine, sessionmaker: async_sessionmaker, lease_seconds: float):
+    """Advisory lock on PostgreSQL, lease row anywhere else."""
+    if engine.dialect.name == "postgresql":
+        return AdvisoryLockElection(engine)
+    return LeaseElection(sessionmaker, lease_seconds)
+
+
+class Scheduler:
+    """
+    Runs registered jobs on their schedules while this process is the leader.
+
+    Each job gets its own task, so a slow job only delays its own next
+    run. A run that exceeds its timeout is cancelled. Leadership is
+    re-checked every `renew_seconds`; when it is lost, running jobs are
+    cancelled and the process goes back to competing for it.
+    """
+
+    def __init__(self, election, renew_seconds: float = 15.0, retry_seconds: float = 30.0,
+                 registry: MetricsRegistry = metrics):
+        self.election = election
+        self.renew_seconds = renew_seconds
+        self.retry_seconds = retry_seconds
+        self.registry = registry
+        self.jobs: Dict[str, Job] = {}
+        self.is_leader = False
+
+    def add_job(self, name: str, func: Callable[[], Awaitable[object]], *, every: Optional[float] = None,
+                cron: Optional[str] = None, jitter_seconds: float = 0.0,
+                timeout_seconds: Optional[float] = None) -> Job:
+        """
+        Register a job to run every `every` seconds or on the `cron` expression.
+
+        Args:
+            name: Unique job name, used in logs and metric labels
+            func: Coroutine function called with no arguments
+            every: Interval in seconds
+            cron: Five-field cron expression (UTC)
+            jitter_seconds: Up to this much random delay is added to each run
+            timeout_seconds: Cancel a run that takes longer than this
+
+        Returns:
+            The registered job
+
+        Raises:
+            ValueError: If the name is taken or not exactly one of every/cron is given
+        """
+        if name in self.jobs:
+            raise ValueError(f"Job {name!r} is already registered")
+        if (every is None) == (cron is None):
+            raise ValueError("Give exactly one of every= or cron=")
+        schedule = IntervalSchedule(every) if every is not None else CronSchedule(cron)
+        job = Job(name, func, schedule, jitter_seconds, timeout_seconds)
+        self.jobs[name] = job
+        return job
+
+    async def run_job(self, job: Job) -> str:
+        """Run a job once, record its outcome and return it."""
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(job.func(), timeout=job.timeout_seconds)
+            outcome = "success"
+        except asyncio.TimeoutError:
+            logger.error("Scheduled job %s timed out after %ss", job.name, job.timeout_seconds)
+            outcome = "timeout"
+        except Exception:
+            logger.exception("Scheduled job %s failed", job.name)
+            outcome = "failure"
+        self.registry.record_job(job.name, outcome, time.perf_counter() - started)
+        return outcome
+
+    async def _job_loop(self, job: Job) -> None:
+        due = datetime.utcnow()
+        while True:
+            due = job.schedule.next_after(max(due, datetime.utcnow()))
+            delay = (due - datetime.utcnow()).total_seconds()
+            if job.jitter_seconds:
+                delay += random.uniform(0, job.jitter_seconds)
+            await asyncio.sleep(max(delay, 0))
+            await self.run_job(job)
+
+    async def _lead(self) -> None:
+        tasks: List[asyncio.Task] = [asyncio.create_task(self._job_loop(job)) for job in self.jobs.values()]
+        try:
+            while await self.election.renew():
+                await asyncio.sleep(self.renew_seconds)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def run(self) -> None:
+        """Compete for leadership and run jobs while leading, forever; run as a background task."""
+        while True:
+            try:
+                acquired = await self.election.acquire()
+            except Exception:
+                logger.exception("Scheduler leader election failed")
+                acquired = False
+            if not acquired:
+                await asyncio.sleep(self.retry_seconds)
+                continue
+
+            logger.info("This worker is now the scheduler leader")
+            self.is_leader = True
+            self.registry.set_scheduler_leader(True)
+            try:
+                await self._lead()
+            finally:
+                self.is_leader = False
+                self.registry.set_scheduler_leader(False)
+                try:
+                    await self.election.release()
+                except Exception:
+                    logger.warning("Failed to release scheduler leadership", exc_info=True)
+            logger.warning("Scheduler leadership lost; retrying in %ss", self.retry_seconds)
+            await asyncio.sleep(self.retry_seconds)
@@ -1,33 +1,26 @@
 """Security utilities for authentication and authorization."""
 
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi.security import OAuth2PasswordBearer
 from fastapi import Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config import settings
-from app.database.session import get_db
+from app.core.revocation import revocation_list
+from app.core.ttl_cache import TTLCache
+from app.database.session import get_async_db, get_async_read_db
+from app.models.charity import Charity
+from app.models.restaurant import Restaurant
+from app.models.user import User, UserType
 
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 # OAuth2 scheme for token authentication
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login")
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash."""
-    return pwd_context.verify(plain_password, hashed_password)
-
-
-def get_password_hash(password: str) -> str:
-    """Generate password hash."""
-    return pwd_context.hash(password)
-
-
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token."""
     to_encode = data.copy()
@@ -41,32 +34,244 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
-def verify_token(token: str, credentials_exception):
-    """Verify and decode JWT token."""
+def create_refresh_token(data: dict, jti: str, session_id: str, expires_at: datetime) -> str:
+    """Create JWT refresh token for a recorded refresh_tokens row."""
+    to_encode = data.copy()
+    to_encode.update({"exp": expires_at, "jti": jti, "sid": session_id, "type": "refresh"})
+    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+def decode_access_token(token: str) -> Optional[dict]:
+    """
+    Decode an access token, or return None if it is invalid.
+    
+    Refresh tokens and tokens from a revoked session are rejected; the
+    revocation check is an in-memory set lookup.
+    """
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        return None
+    if payload.get("type") == "refresh":
+        return None
+    session_id = payload.get("sid")
+    if session_id and revocation_list.is_session_revoked(session_id):
+        return None
+    return payload
+
+
+def decode_refresh_token(token: str) -> Optional[dict]:
+    """Decode a refresh token, or return None if it is invalid or malformed."""
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-        return email
     except JWTError:
+        return None
+    if payload.get("type") != "refresh" or not all(
+        payload.get(claim) for claim in ("sub", "jti", "sid", "user_id", "user_type")
+    ):
+        return None
+    return payload
+
+
+def verify_token(token: str, credentials_exception):
+    """Verify and decode JWT token."""
+    payload = decode_access_token(token)
+    if payload is None:
+        raise credentials_exception
+    email: str = payload.get("sub")
+    if email is None:
         raise credentials_exception
+    return email
+
+
+def get_token_subject(token: str) -> Optional[str]:
+    """Return the subject of a valid JWT, or None if it doesn't verify."""
+    payload = decode_access_token(token)
+    if payload is None:
+        return None
+    return payload.get("sub")
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    Authenticated caller, detached from any database session.
+    
+    Principals built from token claims alone carry only id, email and
+    user_type; the remaining profile fields are None.
+    """
+    id: int
+    email: str
+    user_type: UserType
+    username: Optional[str] = None
+    is_active: Optional[bool] = None
+    is_superuser: Optional[bool] = None
+    created_at: Optional[datetime] = None
+    
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            user_type=user.user_type,
+            username=user.username,
+            is_active=user.is_active,
+            is_superuser=user.is_superuser,
+            created_at=user.created_at,
+        )
+
+
+# Resolved principals keyed by token subject (email)
+principal_cache = TTLCache(
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+)
+
+
+def invalidate_principal(email: Optional[str]) -> None:
+    """Drop a cached principal so the next request reloads the user."""
+    if email:
+        principal_cache.pop(email)
 
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    """Get current authenticated user from token."""
-    credentials_exception = HTTPException(
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_changed_user(mapper, connection, user: User) -> None:
+    """Evict a user from the principal cache whenever the row changes."""
+    invalidate_principal(user.email)
+    # Also evict the old key if the email itself changed
+    for old_email in inspect(user).attrs.email.history.deleted:
+        invalidate_principal(old_email)
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)) -> Principal:
+    """
+    Get current authenticated user from token.
+    
+    The user row is loaded at most once per PRINCIPAL_CACHE_TTL_SECONDS
+    per subject; repeat requests are served from the principal cache.
+    """
+    credentials_exception = _credentials_exception()
     
     email = verify_token(token, credentials_exception)
     
-    # Import here to avoid circular imports
-    from app.models.user import User
-    user = db.query(User).filter(User.email == email).first()
-    if user is None:
+    principal = principal_cache.get(email)
+    if principal is None:
+        user = await db.scalar(select(User).where(User.email == email))
+        if user is None:
+            raise credentials_exception
+        principal = Principal.from_user(user)
+        principal_cache.set(email, principal)
+    
+    return principal
+
+
+async def get_current_admin(current_user: Principal = Depends(get_current_user)) -> Principal:
+    """Require an active superuser."""
+    if not current_user.is_superuser or not current_user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Administrator access required"
+        )
+    return current_user
+
+
+async def get_current_principal(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)) -> Principal:
+    """
+    Get the caller's identity for authorization checks.
+    
+    Tokens carrying user_id and user_type claims are resolved without
+    touching the database; older tokens fall back to get_current_user.
+    """
+    credentials_exception = _credentials_exception()
+    payload = decode_access_token(token)
+    if payload is None:
         raise credentials_exception
     
-    return user 
\ No newline at end of file
+    email = payload.get("sub")
+    user_id = payload.get("user_id")
+    user_type = payload.get("user_type")
+    if email is None:
+        raise credentials_exception
+    if user_id is not None and user_type is not None:
+        try:
+            return Principal(id=int(user_id), email=email, user_type=UserType(user_type))
+        except ValueError:
+            raise credentials_exception
+    
+    return await get_current_user(token, db)
+
+
+async def _get_current_profile(token: str, db: AsyncSession, model, user_type: UserType, label: str):
+    """
+    Resolve the caller and their restaurant/charity profile in one query.
+    
+    Tokens with identity claims need only the profile lookup by the
+    indexed user_id; older tokens load user and profile with one outer join.
+    """
+    credentials_exception = _credentials_exception()
+    payload = decode_access_token(token)
+    if payload is None or payload.get("sub") is None:
+        raise credentials_exception
+    
+    if payload.get("user_id") is not None and payload.get("user_type") is not None:
+        if payload["user_type"] != user_type.value:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Only {label} users can access this resource"
+            )
+        profile = await db.scalar(
+            select(model).where(model.user_id == int(payload["user_id"])).order_by(model.id).limit(1)
+        )
+    else:
+        row = (await db.execute(
+            select(User, model)
+            .outerjoin(model, model.user_id == User.id)
+            .where(User.email == payload["sub"])
+            .order_by(model.id)
+            .limit(1)
+        )).first()
+        if row is None:
+            raise credentials_exception
+        user, profile = row
+        principal_cache.set(user.email, Principal.from_user(user))
+        if user.user_type != user_type:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Only {label} users can access this resource"
+            )
+    
+    if profile is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"{label.capitalize()} profile not found"
+        )
+    return profile
+
+
+async def get_current_restaurant(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)) -> Restaurant:
+    """Get the authenticated restaurant user's profile (403 for other users, 404 if missing)."""
+    return await _get_current_profile(token, db, Restaurant, UserType.RESTAURANT, "restaurant")
+
+
+async def get_current_charity(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)) -> Charity:
+    """Get the authenticated charity user's profile (403 for other users, 404 if missing)."""
+    return await _get_current_profile(token, db, Charity, UserType.CHARITY, "charity")
+
+
+async def get_current_restaurant_readonly(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_read_db)) -> Restaurant:
+    """Like get_current_restaurant, but may read from a replica; don't modify the result."""
+    return await _get_current_profile(token, db, Restaurant, UserType.RESTAURANT, "restaurant")
+
+
+async def get_current_charity_readonly(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_read_db)) -> Charity:
+    """Like get_current_charity, but may read from a replica; don't modify the result."""
+    return await _get_current_profile(token, db, Charity, UserType.CHARITY, "charity")
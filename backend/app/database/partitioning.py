@@ -0,0 +1,260 @@
+"""Optional monthly range partitioning of ``pickups`` by ``created_at`` (PostgreSQL only).
+
+``partition_pickups`` converts the plain table in place into a
+partitioned one with a ``pickups_YYYY_MM`` partition per month plus a
+``pickups_default`` catch-all, so recent-pickup queries and index
+maintenance only touch the current months and archived months can be
+dropped whole instead of deleted row by row.
+
+A unique index on a partitioned table must include the partition key, so
+the global ``uq_pickups_active_food_item_id`` index cannot be kept. Each
+partition gets the same partial unique index instead, which covers
+pickups created in the same month, and the conditional
+``UPDATE ... WHERE status = 'available'`` in ``claim_food_item`` still
+allows only one active pickup per listing across months. Indexes marked
+``dropped_when_partitioned`` in the models, and the partitions
+themselves, are left out of Alembic autogenerate (see
+``include_in_migrations``). The primary key becomes ``(id, created_at)``.
+
+Run ``ensure_pickup_partitions`` regularly (it is idempotent) so rows
+never land in the default partition; a month whose rows already sit in
+``pickups_default`` cannot be given its own partition.
+"""
+
+import re
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import Connection, text
+
+PARENT_TABLE = "pickups"
+DEFAULT_PARTITION = "pickups_default"
+_PARTITION_NAME = re.compile(r"^pickups_(\d{4})_(\d{2})$")
+
+
+def _month_start(moment: datetime) -> datetime:
+    return datetime(moment.year, moment.month, 1)
+
+
+def _add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: datetime) -> str:
+    """Name of the partition holding pickups created in `month`."""
+    return f"pickups_{month.year:04d}_{month.month:02d}"
+
+
+def is_postgresql(connection: Connection) -> bool:
+    return connection.dialect.name == "postgresql"
+
+
+def is_partitioned(connection: Connection) -> bool:
+    """Whether ``pickups`` is a partitioned table."""
+    if not is_postgresql(connection):
+        return False
+    return bool(connection.scalar(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table p "
+        "JOIN pg_class c ON c.oid = p.partrelid "
+        "WHERE c.relname = :table AND pg_table_is_visible(c.oid))"
+    ), {"table": PARENT_TABLE}))
+
+
+def is_pickup_partition(table_name: str) -> bool:
+    """Whether `table_name` is one of the partitions of ``pickups``."""
+    return table_name == DEFAULT_PARTITION or bool(_PARTITION_NAME.match(table_name))
+
+
+def include_in_migrations(partitioned: bool):
+    """
+    Alembic ``include_object`` filter for a database whose pickups may be partitioned.
+
+    Partition tables are never in the models, and once ``pickups`` is
+    partitioned the indexes it had to drop must not be re-added.
+
+    Args:
+        partitioned: Result of ``is_partitioned`` for the migrated database
+
+    Returns:
+        Callable to pass as ``include_object`` to ``context.configure``
+    """
+    def include_object(obj, name, type_, reflected, compare_to) -> bool:
+        if type_ == "table" and reflected and compare_to is None and is_pickup_partition(name):
+            return False
+        if type_ == "index" and partitioned and obj.info.get("dropped_when_partitioned"):
+            return False
+        return True
+
+    return include_object
+
+
+def _create_active_pickup_index(connection: Connection, table_name: str) -> None:
+    # Per-partition stand-in for uq_pickups_active_food_item_id
+    connection.execute(text(
+        f"CREATE UNIQUE INDEX IF NOT EXISTS uq_{table_name}_active_food_item_id "
+        f"ON {table_name} (food_item_id) WHERE status != 'cancelled'"
+    ))
+
+
+def _create_partition(connection: Connection, month: datetime) -> None:
+    connection.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {partition_name(month)} PARTITION OF {PARENT_TABLE} "
+        f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{_add_months(month, 1):%Y-%m-%d}')"
+    ))
+    _create_active_pickup_index(connection, partition_name(month))
+
+
+def ensure_pickup_partitions(connection: Connection, months_ahead: int = 3,
+                             now: Optional[datetime] = None) -> List[str]:
+    """
+    Create the partitions for the current month and the next `months_ahead` months.
+
+    Args:
+        connection: Database connection (the caller commits)
+        months_ahead: Number of future months to create in advance
+        now: Reference time (defaults to the current UTC time)
+
+    Returns:
+        Names of the partitions that now cover the window; empty when
+        ``pickups`` is not partitioned
+    """
+    if not is_partitioned(connection):
+        return []
+    first = _month_start(now or datetime.utcnow())
+    names = []
+    for offset in range(months_ahead + 1):
+        month = _add_months(first, offset)
+        _create_partition(connection, month)
+        names.append(partition_name(month))
+    return names
+
+
+def partition_pickups(connection: Connection, months_ahead: int = 3, now: Optional[datetime] = None) -> int:
+    """
+    Convert a plain ``pickups`` table into a monthly partitioned one.
+
+    Takes an ACCESS EXCLUSIVE lock for the duration of the copy, so run it
+    in a maintenance window (ideally after archiving, when the table is
+    small). Rows without ``created_at`` are filed under their pickup time.
+
+    Args:
+        connection: Database connection; everything runs in its transaction
+        months_ahead: Number of future months to create in advance
+        now: Reference time (defaults to the current UTC time)
+
+    Returns:
+        Number of rows copied
+
+    Raises:
+        RuntimeError: If the database is not PostgreSQL or the table is already partitioned
+    """
+    if not is_postgresql(connection):
+        raise RuntimeError("Pickup partitioning requires PostgreSQL")
+    if is_partitioned(connection):
+        raise RuntimeError("pickups is already partitioned")
+
+    now = now or datetime.utcnow()
+    connection.execute(text("LOCK TABLE pickups IN ACCESS EXCLUSIVE MODE"))
+    oldest = connection.scalar(text("SELECT min(COALESCE(created_at, pickup_time)) FROM pickups"))
+    connection.execute(text("ALTER TABLE pickups RENAME TO pickups_unpartitioned"))
+    sequence = connection.scalar(text("SELECT pg_get_serial_sequence('pickups_unpartitioned', 'id')"))
+
+    connection.execute(text(
+        "CREATE TABLE pickups (LIKE pickups_unpartitioned INCLUDING DEFAULTS) "
+        "PARTITION BY RANGE (created_at)"
+    ))
+    connection.execute(text("ALTER TABLE pickups ALTER COLUMN created_at SET NOT NULL"))
+    connection.execute(text(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF pickups DEFAULT"))
+    _create_active_pickup_index(connection, DEFAULT_PARTITION)
+    month = _month_start(min(oldest, now) if oldest else now)
+    last = _add_months(_month_start(now), months_ahead)
+    while month <= last:
+        _create_partition(connection, month)
+        month = _add_months(month, 1)
+
+    copied = connection.execute(text(
+        "INSERT INTO pickups (id, status, pickup_time, food_item_id, restaurant_id, charity_id, "
+        "rating, impact, created_at, updated_at) "
+        "SELECT id, status, pickup_time, food_item_id, restaurant_id, charity_id, rating, impact, "
+        "COALESCE(created_at, pickup_time, now()), updated_at FROM pickups_unpartitioned"
+    )).rowcount
+    if sequence:
+        # Keep the id sequence alive when the old table goes
+        connection.execute(text(f"ALTER SEQUENCE {sequence} OWNED BY pickups.id"))
+    connection.execute(text("DROP TABLE pickups_unpartitioned"))
+
+    connection.execute(text("ALTER TABLE pickups ADD CONSTRAINT pickups_pkey PRIMARY KEY (id, created_at)"))
+    for column in ("id", "food_item_id", "restaurant_id", "charity_id", "created_at"):
+        connection.execute(text(f"CREATE INDEX ix_pickups_{column} ON pickups ({column})"))
+    for column, parent in (("food_item_id", "food_items"), ("restaurant_id", "restaurants"),
+                           ("charity_id", "charities")):
+        connection.execute(text(
+            f"ALTER TABLE pickups ADD CONSTRAINT pickups_{column}_fkey "
+            f"FOREIGN KEY ({column}) REFERENCES {parent} (id)"
+        ))
+    connection.execute(text("ANALYZE pickups"))
+    return copied
+
+
+def _monthly_partitions(connection: Connection) -> List[Tuple[str, datetime]]:
+    names = connection.scalars(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = :table AND pg_table_is_visible(p.oid)"
+    ), {"table": PARENT_TABLE}).all()
+    partitions = []
+    for name in names:
+        match = _PARTITION_NAME.match(name)
+        if match:
+            partitions.append((name, datetime(int(match.group(1)), int(match.group(2)), 1)))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+def drop_empty_pickup_partitions(connection: Connection, before: datetime) -> List[str]:
+    """
+    Detach and drop monthly partitions that end before `before` and hold no rows.
+
+    Archiving empties old months except for pickups that never finished,
+    so a month is only dropped once nothing is left in it.
+
+    Args:
+        connection: Database connection (the caller commits)
+        before: Only partitions whose range ends on or before this time are considered
+
+    Returns:
+        Names of the dropped partitions
+    """
+    if not is_partitioned(connection):
+        return []
+    dropped = []
+    for name, month in _monthly_partitions(connection):
+        if _add_months(month, 1) > before:
+            break
+        if connection.scalar(text(f"SELECT EXISTS (SELECT 1 FROM {name})")):
+            continue
+        connection.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+        connection.execute(text(f"DROP TABLE {name}"))
+        dropped.append(name)
+    return dropped
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from app.core.config import settings
+    from app.database.session import engine
+
+    parser = argparse.ArgumentParser(description="Manage monthly partitions of the pickups table (PostgreSQL)")
+    parser.add_argument("command", choices=["partition", "ensure"],
+                        help="partition: convert the plain table; ensure: create upcoming partitions")
+    parser.add_argument("--months-ahead", type=int, default=settings.PICKUP_PARTITION_MONTHS_AHEAD)
+    args = parser.parse_args()
+
+    with engine.begin() as connection:
+        if args.command == "partition":
+            print(f"Partitioned pickups, copied {partition_pickups(connection, args.months_ahead)} rows")
+        else:
+            names = ensure_pickup_partitions(connection, args.months_ahead)
+            print("Partitions: " + ", ".join(names) if names else "pickups is not partitioned")
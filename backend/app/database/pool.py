@@ -0,0 +1,140 @@
+"""Connection pool instrumentation.
+
+Engines built with ``InstrumentedQueuePool`` / ``InstrumentedAsyncQueuePool``
+record how long each checkout waited and how many timed out; pool events
+registered by ``instrument`` count connects, checkouts, checkins and
+invalidations. Stats are per process and keyed by the pool's logging
+name, so they survive ``engine.dispose()`` recreating the pool.
+"""
+
+import bisect
+import threading
+import time
+from typing import Dict, List
+
+from sqlalchemy import Engine, event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+# Upper bounds (ms) of the checkout wait histogram; the last bucket is +Inf
+WAIT_BUCKETS_MS: List[float] = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+
+class PoolStats:
+    """Counters and a checkout wait-time histogram for one pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.connects = 0
+            self.checkouts = 0
+            self.checkins = 0
+            self.invalidations = 0
+            self.timeouts = 0
+            self.wait_counts = [0] * (len(WAIT_BUCKETS_MS) + 1)
+            self.wait_total_ms = 0.0
+            self.wait_max_ms = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        waited_ms = seconds * 1000
+        with self._lock:
+            self.wait_counts[bisect.bisect_left(WAIT_BUCKETS_MS, waited_ms)] += 1
+            self.wait_total_ms += waited_ms
+            self.wait_max_ms = max(self.wait_max_ms, waited_ms)
+
+    def increment(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self, pool: Pool) -> dict:
+        with self._lock:
+            waits = sum(self.wait_counts)
+            histogram = {
+                f"le_{bound:g}ms": count for bound, count in zip(WAIT_BUCKETS_MS, self.wait_counts)
+            }
+            histogram["le_inf"] = self.wait_counts[-1]
+            stats = {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "checkout_wait": {
+                    "count": waits,
+                    "avg_ms": round(self.wait_total_ms / waits, 3) if waits else 0.0,
+                    "max_ms": round(self.wait_max_ms, 3),
+                    "histogram": histogram,
+                },
+            }
+        if isinstance(pool, QueuePool):
+            stats.update({
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": max(0, pool.overflow()),
+                "max_overflow": pool._max_overflow,
+                "timeout_seconds": pool.timeout(),
+            })
+        return stats
+
+
+# Pool logging name -> stats
+pool_stats: Dict[str, PoolStats] = {}
+
+# Pool logging name -> instrumented engine
+_engines: Dict[str, Engine] = {}
+
+
+def _stats_for(pool: Pool) -> PoolStats:
+    name = pool.logging_name or "default"
+    stats = pool_stats.get(name)
+    if stats is None:
+        stats = pool_stats.setdefault(name, PoolStats())
+    return stats
+
+
+class _InstrumentedPoolMixin:
+    """Times every checkout (queue wait plus any new connect) and counts timeouts."""
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            _stats_for(self).increment("timeouts")
+            raise
+        _stats_for(self).record_wait(time.perf_counter() - started)
+        return connection
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument(engine: Engine) -> None:
+    """Count connects, checkouts, checkins and invalidations on an engine's pool."""
+    pool = engine.pool
+    stats = _stats_for(pool)
+    _engines[pool.logging_name or "default"] = engine
+    # Listeners on the pool carry over when dispose() recreates it
+    for event_name, counter in (
+        ("connect", "connects"),
+        ("checkout", "checkouts"),
+        ("checkin", "checkins"),
+        ("invalidate", "invalidations"),
+    ):
+        event.listen(pool, event_name, lambda *args, counter=counter: stats.increment(counter))
+
+
+def pool_snapshot() -> Dict[str, dict]:
+    """Current stats for every instrumented engine in this process."""
+    return {
+        name: _stats_for(engine.pool).snapshot(engine.pool)
+        for name, engine in _engines.items()
+    }
@@ -0,0 +1,128 @@
+"""Read-replica selection with health checks and read-your-writes stickiness."""
+
+import asyncio
+import itertools
+import logging
+import threading
+import time
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+from app.core.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Cookie carrying "read from the primary until <unix time>" to every worker
+STICKY_COOKIE = "read_primary_until"
+
+
+class ReplicaRouter:
+    """
+    Round-robin over healthy replicas, with per-client stickiness to the primary.
+
+    A client that just committed a write reads from the primary for
+    `sticky_seconds`, long enough for replicas to catch up, so it always
+    sees its own writes. The in-memory record only holds within this
+    process; across workers and instances the client carries the window
+    itself in the `STICKY_COOKIE` cookie (see `StickyCookieMiddleware`),
+    so clients that drop cookies are only sticky on the worker that
+    handled their write. Replicas failing a health check are skipped until
+    a later check succeeds; with none healthy, reads go to the primary.
+    """
+
+    def __init__(self, engines: List[AsyncEngine], sessionmakers: List[async_sessionmaker],
+                 sticky_seconds: float, max_sticky_clients: int = 100000):
+        self.engines = engines
+        self.sessionmakers = sessionmakers
+        self.sticky_seconds = sticky_seconds
+        self._healthy = [True] * len(engines)
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._sticky = TTLCache(ttl_seconds=sticky_seconds, max_entries=max_sticky_clients)
+
+    def mark_write(self, client_key: Optional[str]) -> float:
+        """Pin a client to the primary for the stickiness window; returns its end."""
+        if client_key:
+            self._sticky.set(client_key, True)
+        return time.time() + self.sticky_seconds
+
+    def is_sticky(self, client_key: Optional[str], primary_until: Optional[str] = None) -> bool:
+        """True if the client wrote recently, per this process or its cookie."""
+        if primary_until:
+            try:
+                until = float(primary_until)
+            except ValueError:
+                until = 0.0
+            now = time.time()
+            # The cookie is client-controlled; ignore stamps beyond the window
+            if now < until <= now + self.sticky_seconds:
+                return True
+        return bool(client_key) and self._sticky.get(client_key) is not None
+
+    def choose(self, client_key: Optional[str],
+               primary_until: Optional[str] = None) -> Optional[async_sessionmaker]:
+        """Return a replica sessionmaker for a read, or None to use the primary."""
+        if not self.engines or self.is_sticky(client_key, primary_until):
+            return None
+        with self._lock:
+            healthy = [index for index, ok in enumerate(self._healthy) if ok]
+            if not healthy:
+                return None
+            return self.sessionmakers[healthy[next(self._counter) % len(healthy)]]
+
+    def set_health(self, index: int, healthy: bool) -> None:
+        with self._lock:
+            if self._healthy[index] != healthy:
+                logger.warning("Read replica %d is now %s", index, "healthy" if healthy else "unhealthy")
+            self._healthy[index] = healthy
+
+    async def check_health(self, timeout_seconds: float = 2.0) -> None:
+        """Ping every replica once and update its health flag."""
+        for index, engine in enumerate(self.engines):
+            try:
+                async with asyncio.timeout(timeout_seconds):
+                    async with engine.connect() as connection:
+                        await connection.execute(text("SELECT 1"))
+            except Exception:
+                self.set_health(index, False)
+            else:
+                self.set_health(index, True)
+
+    async def monitor(self, interval_seconds: float) -> None:
+        """Run health checks forever; start as a background task."""
+        while True:
+            await self.check_health()
+            await asyncio.sleep(interval_seconds)
+
+
+class StickyCookieMiddleware:
+    """
+    ASGI middleware setting `STICKY_COOKIE` on responses to committed writes.
+
+    The commit hook in app.database.session stamps the request state with
+    the end of the stickiness window; this turns the stamp into a cookie
+    so whichever worker serves the client's next read honours it.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start":
+                until = scope.get("state", {}).get(STICKY_COOKIE)
+                if until is not None:
+                    max_age = max(1, int(until - time.time()) + 1)
+                    cookie = f"{STICKY_COOKIE}={until:.3f}; Max-Age={max_age}; Path=/; HttpOnly"
+                    # The frontend calls the API cross-site; SameSite=None needs Secure
+                    cookie += "; Secure; SameSite=None" if scope.get("scheme") == "https" else "; SameSite=Lax"
+                    message["headers"] = list(message.get("headers", [])) + [(b"set-cookie", cookie.encode())]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
@@ -1,9 +1,17 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.ext.declarative import declarative_base
+import hashlib
+from functools import lru_cache
+from typing import Optional
+from fastapi import Request
+from sqlalchemy import Engine, create_engine, event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
 import os
 from dotenv import load_dotenv
 
+from app.core.config import settings
+from app.database.pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool, instrument
+from app.database.replicas import STICKY_COOKIE, ReplicaRouter
+
 load_dotenv()
 
 # Get the DATABASE_URL from environment variable
@@ -13,22 +21,198 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 if DATABASE_URL and DATABASE_URL.startswith("postgres://"):
     DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
-# Create SQLAlchemy engine
-engine = create_engine(
-    DATABASE_URL,
-    pool_pre_ping=True,
-    pool_size=5,
-    max_overflow=10
-)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def get_async_database_url(url: str) -> str:
+    """Swap a sync driver URL for its asyncio driver (asyncpg / aiosqlite)."""
+    scheme, _, rest = url.partition("://")
+    dialect = scheme.split("+", 1)[0]
+    if dialect == "postgresql":
+        return f"postgresql+asyncpg://{rest}"
+    if dialect == "sqlite":
+        return f"sqlite+aiosqlite://{rest}"
+    return url
+
+
+def get_engine_options(url: str, is_async: bool = False) -> dict:
+    """Pool and connection options for create_engine, taken from settings."""
+    options = {
+        "poolclass": InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    # Server-side statement timeout (PostgreSQL only; SQLite has none)
+    timeout_ms = settings.DB_STATEMENT_TIMEOUT_MS
+    if timeout_ms and url.startswith("postgresql"):
+        if is_async:
+            options["connect_args"] = {"server_settings": {"statement_timeout": str(timeout_ms)}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={timeout_ms}"}
+    return options
+
+
+# Engines are created on first use rather than at import, so importing the
+# app (or any module that needs a session) never loads a driver or connects.
+@lru_cache(maxsize=None)
+def get_engine() -> Engine:
+    """Sync engine for scripts, migrations and maintenance jobs."""
+    sync_engine = create_engine(
+        DATABASE_URL, pool_logging_name="primary_sync", **get_engine_options(DATABASE_URL)
+    )
+    instrument(sync_engine)
+    return sync_engine
+
+
+@lru_cache(maxsize=None)
+def get_sessionmaker() -> sessionmaker:
+    return sessionmaker(autocommit=False, autoflush=False, bind=get_engine())
+
+
+@lru_cache(maxsize=None)
+def get_async_engine() -> AsyncEngine:
+    """Async engine used by the API routes."""
+    async_url = get_async_database_url(DATABASE_URL)
+    primary = create_async_engine(
+        async_url, pool_logging_name="primary", **get_engine_options(async_url, is_async=True)
+    )
+    instrument(primary.sync_engine)
+    return primary
+
+
+@lru_cache(maxsize=None)
+def get_async_sessionmaker() -> async_sessionmaker:
+    # expire_on_commit=False: attributes can't be lazily reloaded under asyncio
+    return async_sessionmaker(
+        bind=get_async_engine(), class_=AsyncSession, autoflush=False, expire_on_commit=False
+    )
+
+
+@lru_cache(maxsize=None)
+def get_replica_router() -> ReplicaRouter:
+    """Router over the optional read replicas (see get_async_read_db)."""
+    replica_engines = []
+    for index, replica_url in enumerate(url.strip() for url in settings.DATABASE_REPLICA_URLS.split(",")):
+        if not replica_url:
+            continue
+        if replica_url.startswith("postgres://"):
+            replica_url = replica_url.replace("postgres://", "postgresql://", 1)
+        replica_url = get_async_database_url(replica_url)
+        replica_engine = create_async_engine(
+            replica_url, pool_logging_name=f"replica_{index}", **get_engine_options(replica_url, is_async=True)
+        )
+        instrument(replica_engine.sync_engine)
+        replica_engines.append(replica_engine)
+
+    return ReplicaRouter(
+        engines=replica_engines,
+        sessionmakers=[
+            async_sessionmaker(bind=replica_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False,
+                               info={"read_only": True})
+            for replica_engine in replica_engines
+        ],
+        sticky_seconds=settings.REPLICA_STICKY_SECONDS,
+    )
+
+
+async def dispose_engines() -> None:
+    """Close the pooled connections of every engine created so far."""
+    if get_async_engine.cache_info().currsize:
+        await get_async_engine().dispose()
+    if get_replica_router.cache_info().currsize:
+        for replica_engine in get_replica_router().engines:
+            await replica_engine.dispose()
+    if get_engine.cache_info().currsize:
+        get_engine().dispose()
+
+
+# Module attributes kept for existing importers, resolved on first access
+_LAZY_ATTRIBUTES = {
+    "engine": get_engine,
+    "SessionLocal": get_sessionmaker,
+    "async_engine": get_async_engine,
+    "AsyncSessionLocal": get_async_sessionmaker,
+    "replica_router": get_replica_router,
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@event.listens_for(Session, "after_flush")
+def _note_flush_write(session: Session, flush_context) -> None:
+    session.info["wrote"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _note_statement_write(orm_execute_state) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _pin_writer_to_primary(session: Session) -> None:
+    """Route the committing client's reads to the primary for a while."""
+    if session.info.pop("wrote", False):
+        replica_router = get_replica_router()
+        primary_until = replica_router.mark_write(session.info.get("client_key"))
+        request_state = session.info.get("request_state")
+        if replica_router.engines and request_state is not None:
+            # Picked up by StickyCookieMiddleware for the other workers
+            request_state[STICKY_COOKIE] = primary_until
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_write(session: Session) -> None:
+    session.info.pop("wrote", None)
+
+
+@event.listens_for(Session, "before_flush")
+def _reject_replica_writes(session: Session, flush_context, instances) -> None:
+    if session.info.get("read_only"):
+        raise RuntimeError("Attempted to write through a read-replica session")
 
-Base = declarative_base()
 
 # Dependency
 def get_db():
-    db = SessionLocal()
+    db = get_sessionmaker()()
     try:
         yield db
     finally:
         db.close()
+
+
+def client_key(authorization: Optional[str], host: Optional[str]) -> Optional[str]:
+    """Identify a client for read-your-writes: its bearer token, else its address."""
+    if authorization:
+        return hashlib.blake2b(authorization.encode(), digest_size=16).hexdigest()
+    return host
+
+
+def _request_client_key(request: Request) -> Optional[str]:
+    return client_key(request.headers.get("authorization"), request.client.host if request.client else None)
+
+
+# Async dependency (primary; use for writes and read-your-writes reads)
+async def get_async_db(request: Request):
+    info = {"client_key": _request_client_key(request), "request_state": request.scope.setdefault("state", {})}
+    async with get_async_sessionmaker()(info=info) as db:
+        yield db
+
+
+# Async dependency for read-only routes: a healthy replica unless the client
+# wrote recently (on this worker, or on any worker per its stickiness cookie)
+# or no replicas are configured
+async def get_async_read_db(request: Request):
+    key = _request_client_key(request)
+    replica_sessionmaker = get_replica_router().choose(key, request.cookies.get(STICKY_COOKIE))
+    if replica_sessionmaker is None:
+        async with get_async_sessionmaker()(info={"client_key": key}) as db:
+            yield db
+    else:
+        async with replica_sessionmaker() as db:
+            yield db
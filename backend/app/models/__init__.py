@@ -1,8 +1,11 @@
 # This file can be empty
 
 from app.models.base import Base
-from app.models.user import User
+from app.models.user import User, RefreshToken
 from app.models.restaurant import Restaurant, FoodItem, Pickup
 from app.models.charity import Charity
+from app.models.history import FoodItemHistory, PickupHistory
+from app.models.scheduler import SchedulerLease
+from app.models import search  # noqa: F401  (registers full-text index DDL)
 
-__all__ = ["Base", "User", "Restaurant", "FoodItem", "Pickup", "Charity"]
+__all__ = ["Base", "User", "RefreshToken", "Restaurant", "FoodItem", "Pickup", "Charity", "FoodItemHistory", "PickupHistory", "SchedulerLease"]
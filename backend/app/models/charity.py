@@ -16,15 +16,18 @@ class Charity(Base):
     phone = Column(String)
     email = Column(String, unique=True, index=True)
     description = Column(String, nullable=True)
-    user_id = Column(Integer, ForeignKey("fastapi_user.id"))
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+    geohash = Column(String(12), nullable=True, index=True)  # Spatial index for radius search
+    user_id = Column(Integer, ForeignKey("fastapi_user.id"), index=True)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     
-    # Impact tracking statistics
-    total_pickups = Column(Integer, default=0)
-    people_helped = Column(Integer, default=0)
-    food_saved_kg = Column(Float, default=0.0)
+    # Impact tracking statistics (maintained by app/services/stats.py)
+    total_pickups = Column(Integer, default=0, server_default="0")
+    people_helped = Column(Integer, default=0, server_default="0")
+    food_saved_kg = Column(Float, default=0.0, server_default="0.0")
     
-    # Relationships
-    owner = relationship("User", back_populates="charity")
-    pickups = relationship("Pickup", back_populates="charity") 
\ No newline at end of file
+    # Relationships (never lazy-loaded: pick joinedload/selectinload in the query)
+    owner = relationship("User", back_populates="charity", lazy="raise_on_sql")
+    pickups = relationship("Pickup", back_populates="charity", lazy="raise_on_sql")
\ No newline at end of file
@@ -0,0 +1,51 @@
+"""Archived food items and pickups (see app/services/archive.py)."""
+
+from sqlalchemy import Column, Integer, String, Float, JSON, DateTime, Index
+from sqlalchemy.sql import func
+from app.models.base import Base
+
+
+class FoodItemHistory(Base):
+    """Food item moved out of food_items once it can no longer be claimed."""
+    __tablename__ = "food_items_history"
+
+    # Same id as the original row; no foreign keys, so the parents can go too
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    name = Column(String)
+    quantity = Column(Float)
+    unit = Column(String)
+    expiry_date = Column(DateTime)
+    description = Column(String, nullable=True)
+    status = Column(String)
+    restaurant_id = Column(Integer)
+    created_at = Column(DateTime)
+    updated_at = Column(DateTime)
+    archived_at = Column(DateTime, server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_food_items_history_restaurant_id", "restaurant_id"),
+        Index("ix_food_items_history_expiry_date", "expiry_date"),
+    )
+
+
+class PickupHistory(Base):
+    """Completed or cancelled pickup moved out of pickups."""
+    __tablename__ = "pickups_history"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    status = Column(String)
+    pickup_time = Column(DateTime)
+    food_item_id = Column(Integer)
+    restaurant_id = Column(Integer)
+    charity_id = Column(Integer)
+    rating = Column(Float, nullable=True)
+    impact = Column(JSON, nullable=True)
+    created_at = Column(DateTime)
+    updated_at = Column(DateTime)
+    archived_at = Column(DateTime, server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_pickups_history_restaurant_id", "restaurant_id"),
+        Index("ix_pickups_history_charity_id", "charity_id"),
+        Index("ix_pickups_history_created_at", "created_at"),
+    )
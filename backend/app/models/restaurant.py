@@ -1,6 +1,6 @@
 """Restaurant and food management models."""
 
-from sqlalchemy import Column, Integer, String, Float, JSON, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Float, JSON, ForeignKey, DateTime, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.models.base import Base
@@ -15,14 +15,23 @@ class Restaurant(Base):
     address = Column(String)
     phone = Column(String)
     email = Column(String, unique=True, index=True)
-    user_id = Column(Integer, ForeignKey("fastapi_user.id"))
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+    geohash = Column(String(12), nullable=True, index=True)  # Spatial index for radius search
+    user_id = Column(Integer, ForeignKey("fastapi_user.id"), index=True)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     
-    # Relationships
-    owner = relationship("User", back_populates="restaurants")
-    food_items = relationship("FoodItem", back_populates="restaurant")
-    pickups = relationship("Pickup", back_populates="restaurant")
+    # Impact tracking statistics (maintained by app/services/stats.py)
+    total_listings = Column(Integer, default=0, server_default="0")
+    total_pickups = Column(Integer, default=0, server_default="0")
+    people_helped = Column(Integer, default=0, server_default="0")
+    food_saved_kg = Column(Float, default=0.0, server_default="0")
+    
+    # Relationships (never lazy-loaded: pick joinedload/selectinload in the query)
+    owner = relationship("User", back_populates="restaurants", lazy="raise_on_sql")
+    food_items = relationship("FoodItem", back_populates="restaurant", lazy="raise_on_sql")
+    pickups = relationship("Pickup", back_populates="restaurant", lazy="raise_on_sql")
 
 
 class FoodItem(Base):
@@ -35,13 +44,26 @@ class FoodItem(Base):
     unit = Column(String)
     expiry_date = Column(DateTime)
     description = Column(String, nullable=True)
-    restaurant_id = Column(Integer, ForeignKey("restaurants.id"))
+    status = Column(String, default="available", server_default="available")  # available, claimed, expired
+    restaurant_id = Column(Integer, ForeignKey("restaurants.id"))  # Covered by ix_food_items_restaurant_id_created_at
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     
     # Relationships
-    restaurant = relationship("Restaurant", back_populates="food_items")
-    pickup = relationship("Pickup", back_populates="food_item")
+    restaurant = relationship("Restaurant", back_populates="food_items", lazy="raise_on_sql")
+    pickup = relationship("Pickup", back_populates="food_item", lazy="raise_on_sql")
+
+    # Composite indexes backing the keyset-paginated browse feed
+    __table_args__ = (
+        Index("ix_food_items_expiry_date_id", "expiry_date", "id"),
+        Index("ix_food_items_restaurant_id_created_at", "restaurant_id", "created_at"),
+        # Partial index so the feed only ever scans live inventory
+        Index(
+            "ix_food_items_available_expiry_date_id", "expiry_date", "id",
+            postgresql_where=text("status = 'available'"),
+            sqlite_where=text("status = 'available'"),
+        ),
+    )
 
 
 class Pickup(Base):
@@ -51,15 +73,27 @@ class Pickup(Base):
     id = Column(Integer, primary_key=True, index=True)
     status = Column(String, default="scheduled")  # scheduled, completed, cancelled
     pickup_time = Column(DateTime)
-    food_item_id = Column(Integer, ForeignKey("food_items.id"))
-    restaurant_id = Column(Integer, ForeignKey("restaurants.id"))
-    charity_id = Column(Integer, ForeignKey("charities.id"))
+    food_item_id = Column(Integer, ForeignKey("food_items.id"), index=True)
+    restaurant_id = Column(Integer, ForeignKey("restaurants.id"), index=True)
+    charity_id = Column(Integer, ForeignKey("charities.id"), index=True)
     rating = Column(Float, nullable=True)
     impact = Column(JSON, nullable=True)  # Store impact metrics
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     
     # Relationships
-    food_item = relationship("FoodItem", back_populates="pickup")
-    restaurant = relationship("Restaurant", back_populates="pickups")
-    charity = relationship("Charity", back_populates="pickups") 
\ No newline at end of file
+    food_item = relationship("FoodItem", back_populates="pickup", lazy="raise_on_sql")
+    restaurant = relationship("Restaurant", back_populates="pickups", lazy="raise_on_sql")
+    charity = relationship("Charity", back_populates="pickups", lazy="raise_on_sql")
+
+    # At most one active (non-cancelled) pickup per food item. Partitioning
+    # replaces it with one index per partition (app/database/partitioning.py),
+    # and migrations ignore it once pickups is partitioned.
+    __table_args__ = (
+        Index(
+            "uq_pickups_active_food_item_id", "food_item_id", unique=True,
+            postgresql_where=text("status != 'cancelled'"),
+            sqlite_where=text("status != 'cancelled'"),
+            info={"dropped_when_partitioned": True},
+        ),
+    ) 
\ No newline at end of file
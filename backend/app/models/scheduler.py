@@ -0,0 +1,19 @@
+"""Leader lease for the background job scheduler (see app/core/scheduler.py)."""
+
+from sqlalchemy import Column, String, DateTime
+from app.models.base import Base
+
+
+class SchedulerLease(Base):
+    """
+    Time-limited lock row naming the worker that runs scheduled jobs.
+
+    Only used where PostgreSQL advisory locks are unavailable (SQLite). The
+    holder renews expires_at well before it passes; any worker may take
+    over a lease that has expired.
+    """
+    __tablename__ = "scheduler_leases"
+
+    name = Column(String(64), primary_key=True)
+    holder = Column(String(128), nullable=False)
+    expires_at = Column(DateTime, nullable=False)
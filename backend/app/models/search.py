@@ -0,0 +1,61 @@
+"""Full-text search index DDL for food items.
+
+The index lives beside ``food_items`` and is maintained by the database
+itself, so every write path (routes, bulk loads, deletes) keeps it in sync:
+
+* SQLite: an external-content FTS5 table updated by triggers.
+* Postgres: a generated ``tsvector`` column with a GIN index, plus a
+  ``pg_trgm`` GIN index over name and description for the typo-tolerant
+  fallback used when the full-text query matches nothing.
+"""
+
+from sqlalchemy import DDL, event
+
+from app.models.restaurant import FoodItem
+
+FTS_TABLE = "food_items_fts"
+
+# Text the trigram index covers; queries must use this exact expression to hit it
+TRIGRAM_TEXT = "(coalesce(name, '') || ' ' || coalesce(description, ''))"
+
+# Search objects created by raw SQL, which migrations must not try to drop
+SEARCH_COLUMNS = {"search_vector"}
+SEARCH_INDEXES = {"ix_food_items_search_vector", "ix_food_items_search_trgm"}
+
+SQLITE_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        name, description, content='food_items', content_rowid='id',
+        tokenize='porter unicode61'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS food_items_fts_ai AFTER INSERT ON food_items BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS food_items_fts_ad AFTER DELETE ON food_items BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS food_items_fts_au AFTER UPDATE OF name, description ON food_items BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END""",
+]
+
+POSTGRES_DDL = [
+    """ALTER TABLE food_items ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(description, '')), 'B')
+        ) STORED""",
+    "CREATE INDEX IF NOT EXISTS ix_food_items_search_vector ON food_items USING GIN (search_vector)",
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"CREATE INDEX IF NOT EXISTS ix_food_items_search_trgm ON food_items USING GIN ({TRIGRAM_TEXT} gin_trgm_ops)",
+]
+
+# Create the index whenever metadata.create_all creates food_items
+for _statement in SQLITE_DDL:
+    event.listen(FoodItem.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+for _statement in POSTGRES_DDL:
+    event.listen(FoodItem.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
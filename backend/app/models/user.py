@@ -1,7 +1,7 @@
 """User model for authentication and user management."""
 
 import enum
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Enum
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Enum, ForeignKey
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.models.base import Base
@@ -27,6 +27,26 @@ class User(Base):
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
-    # Relationships
-    restaurants = relationship("Restaurant", back_populates="owner")
-    charity = relationship("Charity", back_populates="owner", uselist=False) 
\ No newline at end of file
+    # Relationships (never lazy-loaded: pick joinedload/selectinload in the query)
+    restaurants = relationship("Restaurant", back_populates="owner", lazy="raise_on_sql")
+    charity = relationship("Charity", back_populates="owner", uselist=False, lazy="raise_on_sql")
+
+
+class RefreshToken(Base):
+    """
+    Issued refresh token, one row per rotation.
+    
+    Rotating a token revokes its row and inserts the successor in the same
+    family. A family is one login session; revoking its newest row ends the
+    session, and presenting an already-rotated token revokes the family.
+    """
+    __tablename__ = "refresh_tokens"
+
+    id = Column(Integer, primary_key=True, index=True)
+    jti = Column(String(36), unique=True, index=True, nullable=False)
+    family_id = Column(String(36), index=True, nullable=False)
+    user_id = Column(Integer, ForeignKey("fastapi_user.id", ondelete="CASCADE"), index=True, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+    revoked_at = Column(DateTime, nullable=True, index=True)  # indexed for the incremental revocation sync
+    replaced_by = Column(String(36), nullable=True)  # jti of the rotated successor
+    created_at = Column(DateTime, server_default=func.now())
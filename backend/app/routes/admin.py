@@ -0,0 +1,78 @@
+"""Administrative routes for bulk operations and diagnostics."""
+
+import os
+from fastapi import APIRouter, Depends, File, Query, UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+
+from app.core.hashing import password_hasher
+from app.core.security import Principal, get_current_admin
+from app.schemas.onboarding import OnboardingResponse
+from app.database.pool import pool_snapshot
+from app.database.session import get_async_db
+from app.services.onboarding import MAX_ONBOARDING_REQUEST_ROWS, iter_row_batches, onboard_organizations
+
+router = APIRouter()
+
+
+@router.post("/onboard", response_model=OnboardingResponse)
+async def onboard_organizations_file(
+    file: UploadFile = File(...),
+    file_format: Optional[str] = Query(None, alias="format", pattern="^(jsonl|csv)$"),
+    current_user: Principal = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Provision many restaurant/charity accounts with their profiles (admins only).
+
+    Each JSONL line or CSV row holds the account (email, username, password,
+    user_type) and profile (name, address, phone, optional profile_email,
+    description, latitude, longitude). Rows are committed in batches, so
+    earlier batches stay created if a later one fails. If the password
+    hashing pool is saturated, the rows not yet created are reported with
+    a "retry this row" error. Uploads are limited to
+    MAX_ONBOARDING_REQUEST_ROWS rows; use `python -m app.services.onboarding`
+    for larger files.
+
+    Args:
+        file: Uploaded JSONL or CSV file
+        file_format: "jsonl" or "csv"; defaults to the file extension
+        current_user: Currently authenticated administrator
+        db: Database session
+
+    Returns:
+        Created/failed counts and a result for every input row
+
+    Raises:
+        HTTPException: If user is not an administrator
+    """
+    if file_format is None:
+        file_format = "csv" if (file.filename or "").lower().endswith(".csv") else "jsonl"
+
+    batches = iter_row_batches(file.file, file_format, max_rows=MAX_ONBOARDING_REQUEST_ROWS)
+    results = await onboard_organizations(db, batches, password_hasher)
+
+    created = sum(result["status"] == "created" for result in results)
+    return {"created": created, "failed": len(results) - created, "results": results}
+
+
+@router.get("/pool")
+async def get_pool_stats(current_user: Principal = Depends(get_current_admin)):
+    """
+    Connection pool statistics for this worker process (admins only).
+
+    Reports size, checked-out and overflow connections, cumulative
+    connect/checkout/checkin/invalidate counts, checkout timeouts and a
+    histogram of checkout wait times for each engine. Every worker keeps
+    its own pools, so sample several requests to cover all workers.
+
+    Args:
+        current_user: Currently authenticated administrator
+
+    Returns:
+        Worker process id and per-engine pool statistics
+
+    Raises:
+        HTTPException: If user is not an administrator
+    """
+    return {"pid": os.getpid(), "pools": pool_snapshot()}
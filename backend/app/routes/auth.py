@@ -2,25 +2,57 @@
 
 from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Annotated
 
 from ..core.security import (
-    verify_password,
     create_access_token,
-    get_password_hash,
-    get_current_user
+    create_refresh_token,
+    decode_refresh_token,
+    get_current_user,
+    Principal
 )
+from ..core.hashing import PasswordHasherBusy, password_hasher
+from ..core.revocation import revocation_list
 from ..core.config import settings
-from ..schemas.auth import UserCreate, UserLogin, Token, UserResponse
+from ..schemas.auth import UserCreate, UserLogin, Token, UserResponse, RefreshRequest, TokenRefresh
+from ..services.tokens import issue_refresh_token, rotate_refresh_token, revoke_token_family
 from ..models.user import User as UserModel
-from ..database.session import get_db
+from ..database.session import get_async_db
 
 router = APIRouter()
 
 
+def _hashing_unavailable() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication is busy, please retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
+def _invalid_refresh_token() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid or expired refresh token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def _issue_tokens(claims: dict, refresh: tuple) -> dict:
+    """Encode an access/refresh token pair for one session."""
+    jti, session_id, expires_at = refresh
+    access_token = create_access_token(
+        data={**claims, "sid": session_id},
+        expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+    refresh_token = create_refresh_token(claims, jti, session_id, expires_at)
+    return {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer"}
+
+
 @router.post("/signup", response_model=UserResponse)
-def signup(user: UserCreate, db: Session = Depends(get_db)):
+async def signup(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Create a new user account.
     
@@ -32,10 +64,11 @@ def signup(user: UserCreate, db: Session = Depends(get_db)):
         Created user data (without password)
         
     Raises:
-        HTTPException: If email or username already exists
+        HTTPException: If email or username already exists, or 503 if the
+            password hashing pool is saturated
     """
     # Check if user exists
-    db_user = db.query(UserModel).filter(UserModel.email == user.email).first()
+    db_user = await db.scalar(select(UserModel).where(UserModel.email == user.email))
     if db_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -43,15 +76,18 @@ def signup(user: UserCreate, db: Session = Depends(get_db)):
         )
     
     # Check username uniqueness
-    db_username = db.query(UserModel).filter(UserModel.username == user.username).first()
+    db_username = await db.scalar(select(UserModel).where(UserModel.username == user.username))
     if db_username:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already taken"
         )
     
-    # Create new user
-    hashed_password = get_password_hash(user.password)
+    # Create new user (bcrypt runs in the hashing pool)
+    try:
+        hashed_password = await password_hasher.hash(user.password)
+    except PasswordHasherBusy:
+        raise _hashing_unavailable()
     db_user = UserModel(
         email=user.email,
         username=user.username,
@@ -59,13 +95,13 @@ def signup(user: UserCreate, db: Session = Depends(get_db)):
         hashed_password=hashed_password
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     return db_user
 
 
 @router.post("/login", response_model=Token)
-def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
+async def login(user_credentials: UserLogin, db: AsyncSession = Depends(get_async_db)):
     """
     Authenticate user and return access token.
     
@@ -74,35 +110,109 @@ def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
         db: Database session
         
     Returns:
-        Access token and user information
+        Access token, refresh token and user information
         
     Raises:
-        HTTPException: If credentials are invalid
+        HTTPException: If credentials are invalid, or 503 if the password
+            hashing pool is saturated
     """
     # Authenticate user
-    user = db.query(UserModel).filter(UserModel.email == user_credentials.email).first()
-    if not user or not verify_password(user_credentials.password, user.hashed_password):
+    user = await db.scalar(select(UserModel).where(UserModel.email == user_credentials.email))
+    valid, new_hash = False, None
+    if user:
+        try:
+            valid, new_hash = await password_hasher.verify(
+                user_credentials.password, user.hashed_password
+            )
+        except PasswordHasherBusy:
+            raise _hashing_unavailable()
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Create access token
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": user.email}, expires_delta=access_token_expires
-    )
+    # Upgrade hashes made with a different BCRYPT_ROUNDS
+    if new_hash:
+        user.hashed_password = new_hash
+    
+    # Start a new session (refresh token family)
+    refresh = await db.run_sync(issue_refresh_token, user.id)
+    await db.commit()
+    
+    claims = {"sub": user.email, "user_id": user.id, "user_type": user.user_type.value}
+    return {**_issue_tokens(claims, refresh), "user": user}
+
+
+@router.post("/refresh", response_model=TokenRefresh)
+async def refresh_access_token(body: RefreshRequest, db: AsyncSession = Depends(get_async_db)):
+    """
+    Exchange a refresh token for a new access/refresh token pair.
+    
+    The presented refresh token is single use. Presenting one that was
+    already rotated is treated as theft and ends the whole session.
     
-    return {
-        "access_token": access_token,
-        "token_type": "bearer",
-        "user": user
-    }
+    Args:
+        body: Refresh token to redeem
+        db: Database session
+        
+    Returns:
+        New access token and rotated refresh token
+        
+    Raises:
+        HTTPException: If the refresh token is invalid, expired or revoked
+    """
+    payload = decode_refresh_token(body.refresh_token)
+    if payload is None:
+        raise _invalid_refresh_token()
+    jti, session_id = payload["jti"], payload["sid"]
+    if revocation_list.is_session_revoked(session_id):
+        raise _invalid_refresh_token()
+    
+    # A token that was already redeemed fails the conditional UPDATE
+    refresh = await db.run_sync(rotate_refresh_token, jti, payload["user_id"])
+    if refresh is None:
+        # Reuse of a rotated (or revoked) token: end the session everywhere
+        await db.run_sync(revoke_token_family, session_id)
+        await db.commit()
+        revocation_list.revoke_session(session_id)
+        raise _invalid_refresh_token()
+    await db.commit()
+    
+    claims = {key: payload[key] for key in ("sub", "user_id", "user_type")}
+    return _issue_tokens(claims, refresh)
+
+
+@router.post("/logout")
+async def logout(body: RefreshRequest, db: AsyncSession = Depends(get_async_db)):
+    """
+    End a session by revoking its refresh token family.
+    
+    Access tokens issued for the session stop working immediately on this
+    worker and within REVOCATION_SYNC_SECONDS on the others.
+    
+    Args:
+        body: Any refresh token from the session
+        db: Database session
+        
+    Returns:
+        Success message
+        
+    Raises:
+        HTTPException: If the refresh token is invalid
+    """
+    payload = decode_refresh_token(body.refresh_token)
+    if payload is None:
+        raise _invalid_refresh_token()
+    await db.run_sync(revoke_token_family, payload["sid"])
+    await db.commit()
+    revocation_list.revoke_session(payload["sid"])
+    return {"message": "Logged out successfully"}
 
 
 @router.get("/me", response_model=UserResponse)
-def get_current_user_info(current_user: UserModel = Depends(get_current_user)):
+async def get_current_user_info(current_user: Principal = Depends(get_current_user)):
     """
     Get current authenticated user information.
     
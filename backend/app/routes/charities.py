@@ -1,26 +1,30 @@
 """Routes for charity profile management."""
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from app.core.security import get_current_user
+from app.core.cache import response_cache
+from app.core.geo import encode_geohash
+from app.core.security import (
+    Principal, get_current_principal, get_current_charity, get_current_charity_readonly
+)
 from app.schemas.charity_schema import (
-    CharityCreate, CharityUpdate, CharityResponse
+    CharityCreate, CharityUpdate, CharityResponse, CharityStatsResponse
 )
-from app.models.user import User
 from app.models.charity import Charity
 from app.models.restaurant import Pickup
-from app.database.session import get_db
+from app.database.session import get_async_db
 
 router = APIRouter()
 
 
 @router.post("/profile", response_model=CharityResponse)
-def create_charity_profile(
+async def create_charity_profile(
     charity_data: CharityCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create charity profile for authenticated charity users.
@@ -43,7 +47,7 @@ def create_charity_profile(
         )
     
     # Check if profile already exists
-    existing_charity = db.query(Charity).filter(Charity.user_id == current_user.id).first()
+    existing_charity = await db.scalar(select(Charity).where(Charity.user_id == current_user.id))
     if existing_charity:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -54,50 +58,47 @@ def create_charity_profile(
         **charity_data.dict(),
         user_id=current_user.id
     )
+    if db_charity.latitude is not None and db_charity.longitude is not None:
+        db_charity.geohash = encode_geohash(db_charity.latitude, db_charity.longitude)
     db.add(db_charity)
-    db.commit()
-    db.refresh(db_charity)
+    await db.commit()
+    await db.refresh(db_charity)
+    response_cache.invalidate(f"charity:{current_user.email}")
     return db_charity
 
 
 @router.get("/profile", response_model=CharityResponse)
-def get_charity_profile(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+async def get_charity_profile(
+    charity: Charity = Depends(get_current_charity_readonly)
 ):
     """
     Get current user's charity profile.
     
     Args:
-        current_user: Currently authenticated user
-        db: Database session
+        charity: Current user's charity profile (user and profile load in one query)
         
     Returns:
         Charity profile data
         
     Raises:
-        HTTPException: If charity profile not found
+        HTTPException: If user is not a charity user or charity profile not found
     """
-    charity = db.query(Charity).filter(Charity.user_id == current_user.id).first()
-    if not charity:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Charity profile not found"
-        )
     return charity
 
 
 @router.put("/profile", response_model=CharityResponse)
-def update_charity_profile(
+async def update_charity_profile(
     charity_update: CharityUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    charity: Charity = Depends(get_current_charity),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update charity profile for current user.
     
     Args:
         charity_update: Updated charity data
+        charity: Current user's charity profile
         current_user: Currently authenticated user
         db: Database session
         
@@ -105,20 +106,44 @@ def update_charity_profile(
         Updated charity profile
         
     Raises:
-        HTTPException: If charity profile not found
+        HTTPException: If user is not a charity user or charity profile not found
     """
-    charity = db.query(Charity).filter(Charity.user_id == current_user.id).first()
-    if not charity:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Charity profile not found"
-        )
-    
     # Update fields
     update_data = charity_update.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(charity, field, value)
     
-    db.commit()
-    db.refresh(charity)
+    # Keep the spatial index column in step with the coordinates
+    if charity.latitude is not None and charity.longitude is not None:
+        charity.geohash = encode_geohash(charity.latitude, charity.longitude)
+    else:
+        charity.geohash = None
+    
+    await db.commit()
+    await db.refresh(charity)
+    response_cache.invalidate(f"charity:{current_user.email}")
     return charity
+
+
+@router.get("/stats", response_model=CharityStatsResponse)
+async def get_charity_stats(
+    charity: Charity = Depends(get_current_charity_readonly)
+):
+    """
+    Get charity impact statistics.
+    
+    Args:
+        charity: Current user's charity profile
+        
+    Returns:
+        Charity pickup count and impact metrics
+        
+    Raises:
+        HTTPException: If user is not a charity user or charity profile not found
+    """
+    # Counters are kept current by the pickup write path
+    return {
+        "total_pickups": charity.total_pickups or 0,
+        "food_saved_kg": charity.food_saved_kg or 0.0,
+        "people_helped": charity.people_helped or 0
+    }
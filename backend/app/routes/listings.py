@@ -1,85 +1,571 @@
 """Routes for food item listings and pickup management."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+import base64
+import binascii
+import csv
+import codecs
+import json
+from datetime import datetime
+from fastapi import APIRouter, Body, Depends, File, Header, HTTPException, Query, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy import case, insert, or_, select, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from typing import BinaryIO, Iterator, List, Optional, Tuple
 
-from app.core.security import get_current_user
+from app.core.cache import response_cache
+from app.core.geo import geohash_ranges, haversine_km
+from app.core.security import (
+    Principal, get_current_principal, get_current_restaurant, get_current_charity
+)
+from app.core.streaming import DEFAULT_CHUNK_SIZE, JSONArrayStreamingResponse
 from app.schemas.listing import (
-    FoodItemCreate, FoodItemUpdate, FoodItemResponse,
+    FoodItemCreate, FoodItemUpdate, FoodItemResponse, FoodItemPage,
+    NearbyFoodItemResponse, BulkCreateResponse,
     PickupCreate, PickupUpdate, PickupResponse
 )
-from app.models.user import User
+from app.models.charity import Charity
 from app.models.restaurant import FoodItem, Pickup, Restaurant
-from app.database.session import get_db
+from app.database.session import get_async_db, get_async_read_db
+from app.services.events import listing_events
+from app.services.listings import claim_food_item, is_active_pickup_conflict
+from app.services.search import search_food_items
+from app.services.stats import record_listing_deleted, record_listings_created, record_pickup
 
 router = APIRouter()
 
 
-@router.get("/", response_model=List[FoodItemResponse])
-def get_available_food_items(db: Session = Depends(get_db)):
+# Page size limits for the browse feed
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Bulk creation limits
+BULK_BATCH_SIZE = 500
+MAX_BULK_ITEMS = 1000
+MAX_IMPORT_ROWS = 10000
+
+# Rows per server-side cursor fetch when streaming an export
+EXPORT_CHUNK_SIZE = DEFAULT_CHUNK_SIZE
+
+# Radius limits for nearby search, in kilometres
+DEFAULT_RADIUS_KM = 5.0
+MAX_RADIUS_KM = 100.0
+
+# Restaurants per nearby listings query, bounding its parameter count
+NEARBY_RESTAURANT_BATCH = 250
+
+# Columns selected for streamed exports, in FoodItemResponse field order
+_RESPONSE_COLUMNS = [getattr(FoodItem, name) for name in FoodItemResponse.model_fields]
+
+
+def _publish_food_item(event_type: str, food_item: FoodItem) -> None:
+    """Push a committed listing change to live subscribers."""
+    listing_events.publish(
+        event_type, FoodItemResponse.model_validate(food_item).model_dump(mode="json")
+    )
+
+
+def _validation_messages(exc: ValidationError) -> List[str]:
+    """Flatten a pydantic ValidationError into 'field: message' strings."""
+    return [
+        f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}"
+        for error in exc.errors()
+    ]
+
+
+async def _insert_food_items(db: AsyncSession, restaurant_id: int, rows: List[dict]) -> List[int]:
+    """
+    Insert validated rows in one multi-row INSERT ... RETURNING and commit.
+    
+    Returns:
+        IDs of the created food items
+    """
+    if not rows:
+        return []
+    for row in rows:
+        row["restaurant_id"] = restaurant_id
+    food_items = (await db.scalars(insert(FoodItem).returning(FoodItem), rows)).all()
+    await db.run_sync(record_listings_created, restaurant_id, len(food_items))
+    payloads = [FoodItemResponse.model_validate(item).model_dump(mode="json") for item in food_items]
+    await db.commit()
+    for payload in payloads:
+        listing_events.publish("created", payload)
+    return [payload["id"] for payload in payloads]
+
+
+def _validated_csv_batches(file: BinaryIO, errors: List[dict]) -> Iterator[List[dict]]:
     """
-    Get all available food items for charities to browse.
+    Parse and validate a CSV upload, yielding batches of valid rows.
+    
+    Invalid rows are appended to `errors` by CSV line number.
+    """
+    batch = []
+    reader = csv.DictReader(codecs.iterdecode(file, "utf-8-sig"))
+    try:
+        for row in reader:
+            if reader.line_num > MAX_IMPORT_ROWS + 1:
+                errors.append({"row": reader.line_num, "errors": [f"row limit of {MAX_IMPORT_ROWS} exceeded"]})
+                break
+            # Treat empty cells as missing values
+            row = {key: value for key, value in row.items() if key and value not in (None, "")}
+            try:
+                batch.append(FoodItemCreate.model_validate(row).model_dump())
+            except ValidationError as exc:
+                errors.append({"row": reader.line_num, "errors": _validation_messages(exc)})
+                continue
+            if len(batch) >= BULK_BATCH_SIZE:
+                yield batch
+                batch = []
+    except (UnicodeDecodeError, csv.Error) as exc:
+        errors.append({"row": reader.line_num, "errors": [f"unreadable CSV: {exc}"]})
+    if batch:
+        yield batch
+
+
+async def _get_owned_food_item(food_item_id: int, current_user: Principal, db: AsyncSession, action: str,
+                               *options) -> FoodItem:
+    """
+    Load a food item and check ownership in one joined query.
+
+    Only the owning restaurant's id and user_id are loaded; pass extra
+    loader options for anything else the caller will touch (the models
+    never lazy-load).
+    """
+    result = await db.execute(
+        select(FoodItem)
+        .options(joinedload(FoodItem.restaurant).load_only(Restaurant.id, Restaurant.user_id), *options)
+        .where(FoodItem.id == food_item_id)
+    )
+    food_item = result.unique().scalar_one_or_none()
+    if not food_item:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Food item not found"
+        )
+    
+    # Check if user owns this food item
+    if food_item.restaurant.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"You can only {action} your own food listings"
+        )
+    return food_item
+
+
+def _encode_cursor(food_item: FoodItem) -> str:
+    """Encode the (expiry_date, id) sort key of the last row on a page."""
+    raw = json.dumps([food_item.expiry_date.isoformat(), food_item.id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor produced by _encode_cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        expiry, item_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(expiry), int(item_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def _filter_available(query, expires_after: Optional[datetime], expires_before: Optional[datetime],
+                      unit: Optional[str], restaurant_id: Optional[int], created_after: Optional[datetime],
+                      created_before: Optional[datetime]):
+    """Restrict a food item query to live inventory and the browse filters."""
+    # Only live inventory: matches the partial index on available rows.
+    # Items past their expiry that the sweep hasn't reached yet are skipped too.
+    query = query.where(
+        FoodItem.status == "available",
+        FoodItem.expiry_date > datetime.utcnow()
+    )
+    if expires_after is not None:
+        query = query.where(FoodItem.expiry_date >= expires_after)
+    if expires_before is not None:
+        query = query.where(FoodItem.expiry_date < expires_before)
+    if unit is not None:
+        query = query.where(FoodItem.unit == unit)
+    if restaurant_id is not None:
+        query = query.where(FoodItem.restaurant_id == restaurant_id)
+    if created_after is not None:
+        query = query.where(FoodItem.created_at >= created_after)
+    if created_before is not None:
+        query = query.where(FoodItem.created_at < created_before)
+    return query
+
+
+@router.get("/", response_model=FoodItemPage)
+async def get_available_food_items(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    expires_after: Optional[datetime] = None,
+    expires_before: Optional[datetime] = None,
+    unit: Optional[str] = None,
+    restaurant_id: Optional[int] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Browse available food items for charities, soonest-expiring first.
+    
+    Claimed and expired items are excluded. Results are keyset-paginated
+    on (expiry_date, id): pass the returned next_cursor back as `cursor`
+    to fetch the following page. Each page is a single range scan of the
+    partial index on available items, so deep pages cost the same as the first.
     
     Args:
-        db: Database session
+        cursor: Opaque cursor from the previous page
+        limit: Maximum number of items to return
+        expires_after: Only items expiring at or after this time
+        expires_before: Only items expiring before this time
+        unit: Only items listed in this unit
+        restaurant_id: Only items from this restaurant
+        created_after: Only items listed at or after this time
+        created_before: Only items listed before this time
+        db: Database session (a read replica when configured)
+        
+    Returns:
+        A page of food items and the cursor for the next page
+        
+    Raises:
+        HTTPException: If the cursor is malformed
+    """
+    query = _filter_available(
+        select(FoodItem), expires_after, expires_before, unit, restaurant_id, created_after, created_before
+    )
+    
+    # Seek past the last row of the previous page
+    if cursor:
+        last_expiry, last_id = _decode_cursor(cursor)
+        query = query.where(
+            tuple_(FoodItem.expiry_date, FoodItem.id) > (last_expiry, last_id)
+        )
+    
+    # Fetch one extra row to learn whether another page exists
+    food_items = (await db.scalars(
+        query.order_by(FoodItem.expiry_date, FoodItem.id).limit(limit + 1)
+    )).all()
+    next_cursor = None
+    if len(food_items) > limit:
+        food_items = food_items[:limit]
+        next_cursor = _encode_cursor(food_items[-1])
+    
+    return {"items": food_items, "next_cursor": next_cursor}
+
+
+@router.get("/export", response_class=JSONArrayStreamingResponse,
+            responses={200: {"model": List[FoodItemResponse]}})
+async def export_food_items(
+    expires_after: Optional[datetime] = None,
+    expires_before: Optional[datetime] = None,
+    unit: Optional[str] = None,
+    restaurant_id: Optional[int] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Stream every available food item matching the filters as one JSON array.
+    
+    For bulk consumers (syncs, reports) that would otherwise page through
+    the whole feed. Rows come from a server-side cursor in chunks of
+    EXPORT_CHUNK_SIZE and are validated and serialized one chunk at a
+    time, so memory stays flat however many rows match. Only the response
+    columns are selected; no ORM objects are built.
+    
+    Args:
+        expires_after: Only items expiring at or after this time
+        expires_before: Only items expiring before this time
+        unit: Only items listed in this unit
+        restaurant_id: Only items from this restaurant
+        created_after: Only items listed at or after this time
+        created_before: Only items listed before this time
+        db: Database session (a read replica when configured)
+        
+    Returns:
+        A streamed JSON array of food items, soonest-expiring first
+    """
+    query = _filter_available(
+        select(*_RESPONSE_COLUMNS), expires_after, expires_before, unit, restaurant_id,
+        created_after, created_before
+    ).order_by(FoodItem.expiry_date, FoodItem.id)
+
+    async def chunks():
+        # The session stays open until the response has been sent
+        result = await db.stream(query.execution_options(yield_per=EXPORT_CHUNK_SIZE))
+        async for partition in result.partitions():
+            yield partition
+    
+    return JSONArrayStreamingResponse(chunks(), FoodItemResponse)
+
+
+@router.get("/nearby", response_model=List[NearbyFoodItemResponse])
+async def get_nearby_food_items(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius: float = Query(DEFAULT_RADIUS_KM, gt=0, le=MAX_RADIUS_KM),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Find available food items from restaurants within a radius, nearest first.
+    
+    Candidate restaurants are found with geohash range scans on the
+    indexed geohash column; exact distances are only computed for those
+    candidates, never for every listing. Listings are then fetched for
+    the nearest NEARBY_RESTAURANT_BATCH restaurants at a time, ordered by
+    distance rank and limited in SQL, so statement size stays bounded
+    however dense the area is; usually the first batch fills the page.
+    
+    Args:
+        lat: Search centre latitude
+        lon: Search centre longitude
+        radius: Search radius in kilometres
+        limit: Maximum number of items to return
+        db: Database session (a read replica when configured)
+        
+    Returns:
+        Available food items with their distance in kilometres
+    """
+    query = select(Restaurant.id, Restaurant.latitude, Restaurant.longitude).where(
+        Restaurant.geohash.isnot(None)
+    )
+    ranges = geohash_ranges(lat, lon, radius)
+    if ranges:
+        query = query.where(or_(*[Restaurant.geohash.between(low, high) for low, high in ranges]))
+    
+    # Drop candidates in the covering cells but outside the circle
+    distances = {}
+    for restaurant_id, latitude, longitude in await db.execute(query):
+        distance = haversine_km(lat, lon, latitude, longitude)
+        if distance <= radius:
+            distances[restaurant_id] = distance
+    
+    # Query restaurants nearest first, a bounded batch at a time, until the page is full
+    nearest = sorted(distances, key=distances.get)
+    now = datetime.utcnow()
+    items = []
+    start = 0
+    while start < len(nearest) and len(items) < limit:
+        end = min(start + NEARBY_RESTAURANT_BATCH, len(nearest))
+        # Never split equally distant restaurants, whose items interleave by expiry
+        while end < len(nearest) and distances[nearest[end]] == distances[nearest[end - 1]]:
+            end += 1
+        batch = nearest[start:end]
+        start = end
+        
+        batch_distances = sorted({distances[restaurant_id] for restaurant_id in batch})
+        ranks = {distance: rank for rank, distance in enumerate(batch_distances)}
+        distance_rank = case(
+            {restaurant_id: ranks[distances[restaurant_id]] for restaurant_id in batch},
+            value=FoodItem.restaurant_id
+        )
+        rows = await db.execute(
+            select(*_RESPONSE_COLUMNS)
+            .where(
+                FoodItem.restaurant_id.in_(batch),
+                FoodItem.status == "available",
+                FoodItem.expiry_date > now
+            )
+            .order_by(distance_rank, FoodItem.expiry_date, FoodItem.id)
+            .limit(limit - len(items))
+        )
+        items += rows
+    
+    # Plain dicts: the response model validates each item exactly once
+    return [
+        {**row._mapping, "distance_km": round(distances[row.restaurant_id], 3)}
+        for row in items
+    ]
+
+
+@router.get("/search", response_model=List[FoodItemResponse])
+async def search_listings(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Full-text search over available food item names and descriptions.
+    
+    Args:
+        q: Search terms; each term also matches as a prefix
+        limit: Maximum number of items to return
+        db: Database session (a read replica when configured)
         
     Returns:
-        List of all available food items
+        Matching food items ordered by relevance
+    """
+    return await db.run_sync(search_food_items, q, limit)
+
+
+@router.get("/stream")
+async def stream_listings(last_event_id: Optional[int] = Header(None)):
+    """
+    Stream listing changes as Server-Sent Events.
+    
+    Emits `created`, `updated`, `claimed` and `deleted` events as they
+    are committed, so dashboards can load the feed once and then apply
+    changes instead of polling. A comment line is sent every 15 seconds
+    of silence to keep proxies from closing the connection.
+    
+    A `reset` event means events were missed (the client fell too far
+    behind, or reconnected after they left the replay buffer) and the
+    feed should be reloaded. Browsers resend the last event id as
+    `Last-Event-ID` when they reconnect, and missed events are replayed.
+    
+    Args:
+        last_event_id: Id of the last event the client received
+    
+    Returns:
+        A text/event-stream response
     """
-    food_items = db.query(FoodItem).all()
-    return food_items
+    async def event_stream():
+        async for event, is_keepalive in listing_events.subscribe(last_event_id):
+            if is_keepalive:
+                yield ": keepalive\n\n"
+                continue
+            yield (
+                f"id: {event['id']}\n"
+                f"event: {event['type']}\n"
+                f"data: {json.dumps(event['data'])}\n\n"
+            )
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 @router.post("/", response_model=FoodItemResponse)
-def create_food_item(
+async def create_food_item(
     food_item: FoodItemCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    restaurant: Restaurant = Depends(get_current_restaurant),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a new food listing for restaurants.
     
     Args:
         food_item: Food item data
-        current_user: Currently authenticated user
+        restaurant: Current user's restaurant profile
         db: Database session
         
     Returns:
         Created food item
         
     Raises:
-        HTTPException: If user is not a restaurant or restaurant profile not found
+        HTTPException: If user is not a restaurant user or restaurant profile not found
     """
-    if current_user.user_type.value != "restaurant":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only restaurants can create food listings"
-        )
-    
-    # Get restaurant profile
-    restaurant = db.query(Restaurant).filter(Restaurant.user_id == current_user.id).first()
-    if not restaurant:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Restaurant profile not found"
-        )
-    
     db_food_item = FoodItem(
         **food_item.dict(),
         restaurant_id=restaurant.id
     )
     db.add(db_food_item)
-    db.commit()
-    db.refresh(db_food_item)
+    await db.run_sync(record_listings_created, restaurant.id)
+    # INSERT ... RETURNING already fetched the server defaults; no refresh needed
+    await db.commit()
+    response_cache.invalidate("listings")
+    _publish_food_item("created", db_food_item)
     return db_food_item
 
+
+@router.post("/bulk", response_model=BulkCreateResponse)
+async def create_food_items_bulk(
+    food_items: List[dict] = Body(..., max_length=MAX_BULK_ITEMS),
+    restaurant: Restaurant = Depends(get_current_restaurant),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Create many food listings in one request (restaurants only).
+    
+    Each row is validated against FoodItemCreate on its own; valid rows
+    are inserted in batched multi-row INSERTs, invalid rows are reported
+    back by index and skipped.
+    
+    Args:
+        food_items: List of food item rows
+        restaurant: Current user's restaurant profile
+        db: Database session
+        
+    Returns:
+        Number and IDs of created items, plus per-row errors
+        
+    Raises:
+        HTTPException: If user is not a restaurant user or restaurant profile not found
+    """
+    created_ids = []
+    errors = []
+    batch = []
+    for index, row in enumerate(food_items):
+        try:
+            batch.append(FoodItemCreate.model_validate(row).model_dump())
+        except ValidationError as exc:
+            errors.append({"row": index, "errors": _validation_messages(exc)})
+            continue
+        if len(batch) >= BULK_BATCH_SIZE:
+            created_ids += await _insert_food_items(db, restaurant.id, batch)
+            batch = []
+    created_ids += await _insert_food_items(db, restaurant.id, batch)
+    
+    if created_ids:
+        response_cache.invalidate("listings")
+    return {"created": len(created_ids), "ids": created_ids, "errors": errors}
+
+
+@router.post("/import", response_model=BulkCreateResponse)
+async def import_food_items_csv(
+    file: UploadFile = File(...),
+    restaurant: Restaurant = Depends(get_current_restaurant),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Import food listings from a CSV inventory file (restaurants only).
+    
+    The file needs a header row with name, quantity, unit and expiry_date
+    columns (description is optional). It is parsed as a stream and
+    inserted in batches, so memory stays flat for large files. Errors are
+    reported by CSV line number.
+    
+    Args:
+        file: Uploaded CSV file
+        restaurant: Current user's restaurant profile
+        db: Database session
+        
+    Returns:
+        Number and IDs of created items, plus per-row errors
+        
+    Raises:
+        HTTPException: If user is not a restaurant user or restaurant profile not found
+    """
+    created_ids = []
+    errors = []
+    # Parse each batch on the threadpool so the event loop stays free
+    batches = _validated_csv_batches(file.file, errors)
+    while True:
+        batch = await run_in_threadpool(next, batches, None)
+        if batch is None:
+            break
+        created_ids += await _insert_food_items(db, restaurant.id, batch)
+    
+    if created_ids:
+        response_cache.invalidate("listings")
+    return {"created": len(created_ids), "ids": created_ids, "errors": errors}
+
+
 @router.put("/{food_item_id}", response_model=FoodItemResponse)
-def update_food_item(
+async def update_food_item(
     food_item_id: int,
     food_item_update: FoodItemUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update a food listing (restaurant owner only).
@@ -96,35 +582,29 @@ def update_food_item(
     Raises:
         HTTPException: If food item not found or user doesn't own it
     """
-    food_item = db.query(FoodItem).filter(FoodItem.id == food_item_id).first()
-    if not food_item:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Food item not found"
-        )
-    
-    # Check if user owns this food item
-    if food_item.restaurant.user_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You can only update your own food listings"
-        )
+    food_item = await _get_owned_food_item(food_item_id, current_user, db, "update")
     
     # Update fields
     update_data = food_item_update.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(food_item, field, value)
     
-    db.commit()
-    db.refresh(food_item)
+    # Extending the expiry of an expired item puts it back on the feed
+    if food_item.status == "expired" and food_item.expiry_date > datetime.utcnow():
+        food_item.status = "available"
+    
+    # No refresh: the response only uses columns already loaded
+    await db.commit()
+    response_cache.invalidate("listings")
+    _publish_food_item("updated", food_item)
     return food_item
 
 
 @router.delete("/{food_item_id}")
-def delete_food_item(
+async def delete_food_item(
     food_item_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Delete a food listing (restaurant owner only).
@@ -140,31 +620,26 @@ def delete_food_item(
     Raises:
         HTTPException: If food item not found or user doesn't own it
     """
-    food_item = db.query(FoodItem).filter(FoodItem.id == food_item_id).first()
-    if not food_item:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Food item not found"
-        )
-    
-    # Check if user owns this food item
-    if food_item.restaurant.user_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You can only delete your own food listings"
-        )
+    # The flush detaches any pickups from the deleted item, so load them up front
+    food_item = await _get_owned_food_item(
+        food_item_id, current_user, db, "delete", joinedload(FoodItem.pickup)
+    )
     
-    db.delete(food_item)
-    db.commit()
+    await db.run_sync(record_listing_deleted, food_item.restaurant_id)
+    await db.delete(food_item)
+    await db.commit()
+    response_cache.invalidate("listings")
+    listing_events.publish("deleted", {"id": food_item_id})
     return {"message": "Food item deleted successfully"}
 
 
 @router.post("/{food_item_id}/pickup", response_model=PickupResponse)
-def schedule_pickup(
+async def schedule_pickup(
     food_item_id: int,
     pickup_data: PickupCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    charity: Charity = Depends(get_current_charity),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Schedule a pickup for a food item (charities only).
@@ -172,6 +647,7 @@ def schedule_pickup(
     Args:
         food_item_id: ID of the food item to pick up
         pickup_data: Pickup scheduling data
+        charity: Current user's charity profile
         current_user: Currently authenticated user
         db: Database session
         
@@ -179,38 +655,44 @@ def schedule_pickup(
         Created pickup record
         
     Raises:
-        HTTPException: If user is not a charity, food item not found, or charity profile not found
+        HTTPException: If user is not a charity user, food item not found or no
+            longer available, or charity profile not found
     """
-    if current_user.user_type.value != "charity":
+    # Claim and book in one transaction; losers of a race get a 409
+    restaurant_id = await db.run_sync(claim_food_item, food_item_id)
+    if restaurant_id is None:
+        await db.rollback()
+        if not await db.scalar(select(FoodItem.id).where(FoodItem.id == food_item_id)):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Food item not found"
+            )
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only charities can schedule pickups"
-        )
-    
-    food_item = db.query(FoodItem).filter(FoodItem.id == food_item_id).first()
-    if not food_item:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Food item not found"
-        )
-    
-    # Get charity profile
-    from app.models.charity import Charity
-    charity = db.query(Charity).filter(Charity.user_id == current_user.id).first()
-    if not charity:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Charity profile not found"
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Food item is no longer available"
         )
     
     db_pickup = Pickup(
         food_item_id=food_item_id,
-        restaurant_id=food_item.restaurant_id,
+        restaurant_id=restaurant_id,
         charity_id=charity.id,
         pickup_time=pickup_data.pickup_time,
         status="scheduled"
     )
     db.add(db_pickup)
-    db.commit()
-    db.refresh(db_pickup)
+    await db.run_sync(record_pickup, restaurant_id, charity.id)
+    try:
+        await db.commit()
+    except IntegrityError as exc:
+        await db.rollback()
+        if not is_active_pickup_conflict(exc):
+            raise
+        # The unique active-pickup index caught a double booking
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Food item is no longer available"
+        )
+    response_cache.invalidate("listings")
+    response_cache.invalidate(f"charity:{current_user.email}")
+    listing_events.publish("claimed", {"id": food_item_id, "status": "claimed"})
     return db_pickup
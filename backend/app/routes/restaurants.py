@@ -1,26 +1,30 @@
 """Routes for restaurant profile management and statistics."""
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from app.core.security import get_current_user
+from app.core.cache import response_cache
+from app.core.geo import encode_geohash
+from app.core.security import (
+    Principal, get_current_principal, get_current_restaurant, get_current_restaurant_readonly
+)
 from app.schemas.restaurant_schema import (
     RestaurantCreate, RestaurantUpdate, RestaurantResponse, RestaurantStatsResponse
 )
-from app.models.user import User
 from app.models.restaurant import Restaurant
 from app.models.charity import Charity
-from app.database.session import get_db
+from app.database.session import get_async_db
 
 router = APIRouter()
 
 
 @router.post("/profile", response_model=RestaurantResponse)
-def create_restaurant_profile(
+async def create_restaurant_profile(
     restaurant_data: RestaurantCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create restaurant profile for authenticated restaurant users.
@@ -43,7 +47,7 @@ def create_restaurant_profile(
         )
     
     # Check if profile already exists
-    existing_restaurant = db.query(Restaurant).filter(Restaurant.user_id == current_user.id).first()
+    existing_restaurant = await db.scalar(select(Restaurant).where(Restaurant.user_id == current_user.id))
     if existing_restaurant:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -54,50 +58,50 @@ def create_restaurant_profile(
         **restaurant_data.dict(),
         user_id=current_user.id
     )
+    if db_restaurant.latitude is not None and db_restaurant.longitude is not None:
+        db_restaurant.geohash = encode_geohash(db_restaurant.latitude, db_restaurant.longitude)
     db.add(db_restaurant)
-    db.commit()
-    db.refresh(db_restaurant)
+    await db.commit()
+    await db.refresh(db_restaurant)
+    response_cache.invalidate(f"restaurant:{current_user.email}")
+    if db_restaurant.geohash is not None:
+        # Cached nearby results rank restaurants by location
+        response_cache.invalidate("listings")
     return db_restaurant
 
 
 @router.get("/profile", response_model=RestaurantResponse)
-def get_restaurant_profile(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+async def get_restaurant_profile(
+    restaurant: Restaurant = Depends(get_current_restaurant_readonly)
 ):
     """
     Get current user's restaurant profile.
     
     Args:
-        current_user: Currently authenticated user
-        db: Database session
+        restaurant: Current user's restaurant profile (user and profile load in one query)
         
     Returns:
         Restaurant profile data
         
     Raises:
-        HTTPException: If restaurant profile not found
+        HTTPException: If user is not a restaurant user or restaurant profile not found
     """
-    restaurant = db.query(Restaurant).filter(Restaurant.user_id == current_user.id).first()
-    if not restaurant:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Restaurant profile not found"
-        )
     return restaurant
 
 
 @router.put("/profile", response_model=RestaurantResponse)
-def update_restaurant_profile(
+async def update_restaurant_profile(
     restaurant_update: RestaurantUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    restaurant: Restaurant = Depends(get_current_restaurant),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update restaurant profile for current user.
     
     Args:
         restaurant_update: Updated restaurant data
+        restaurant: Current user's restaurant profile
         current_user: Currently authenticated user
         db: Database session
         
@@ -105,61 +109,50 @@ def update_restaurant_profile(
         Updated restaurant profile
         
     Raises:
-        HTTPException: If restaurant profile not found
+        HTTPException: If user is not a restaurant user or restaurant profile not found
     """
-    restaurant = db.query(Restaurant).filter(Restaurant.user_id == current_user.id).first()
-    if not restaurant:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Restaurant profile not found"
-        )
-    
     # Update fields
+    previous_location = (restaurant.latitude, restaurant.longitude)
     update_data = restaurant_update.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(restaurant, field, value)
     
-    db.commit()
-    db.refresh(restaurant)
+    # Keep the spatial index column in step with the coordinates
+    moved = (restaurant.latitude, restaurant.longitude) != previous_location
+    if restaurant.latitude is not None and restaurant.longitude is not None:
+        restaurant.geohash = encode_geohash(restaurant.latitude, restaurant.longitude)
+    else:
+        restaurant.geohash = None
+    
+    await db.commit()
+    await db.refresh(restaurant)
+    response_cache.invalidate(f"restaurant:{current_user.email}")
+    if moved:
+        # Cached nearby results rank restaurants by location
+        response_cache.invalidate("listings")
     return restaurant
 
 
 @router.get("/stats", response_model=RestaurantStatsResponse)
-def get_restaurant_stats(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+async def get_restaurant_stats(
+    restaurant: Restaurant = Depends(get_current_restaurant_readonly)
 ):
     """
     Get restaurant statistics and impact metrics.
     
     Args:
-        current_user: Currently authenticated user
-        db: Database session
+        restaurant: Current user's restaurant profile
         
     Returns:
         Restaurant statistics including total listings, pickups, and impact metrics
         
     Raises:
-        HTTPException: If restaurant profile not found
+        HTTPException: If user is not a restaurant user or restaurant profile not found
     """
-    restaurant = db.query(Restaurant).filter(Restaurant.user_id == current_user.id).first()
-    if not restaurant:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Restaurant profile not found"
-        )
-    
-    # Calculate stats
-    total_listings = 0  # This would count food items if that table exists
-    total_pickups = 0   # This would count pickups if that table exists
-    
-    # Calculate impact (simplified for MVP)
-    food_saved_kg = total_pickups * 2.5  # Estimate 2.5kg per pickup
-    people_helped = total_pickups * 4    # Estimate 4 people helped per pickup
-    
+    # Counters are kept current by the listing and pickup write paths
     return {
-        "total_listings": total_listings,
-        "total_pickups": total_pickups,
-        "food_saved_kg": food_saved_kg,
-        "people_helped": people_helped
+        "total_listings": restaurant.total_listings or 0,
+        "total_pickups": restaurant.total_pickups or 0,
+        "food_saved_kg": restaurant.food_saved_kg or 0.0,
+        "people_helped": restaurant.people_helped or 0
     }
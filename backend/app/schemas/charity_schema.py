@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from typing import Optional
 from datetime import datetime
 
@@ -8,6 +8,8 @@ class CharityBase(BaseModel):
     phone: str
     email: EmailStr
     description: Optional[str] = None
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
 
 class CharityCreate(CharityBase):
     pass
@@ -18,6 +20,8 @@ class CharityUpdate(BaseModel):
     phone: Optional[str] = None
     email: Optional[EmailStr] = None
     description: Optional[str] = None
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
 
 class CharityResponse(CharityBase):
     id: int
@@ -29,3 +33,8 @@ class CharityResponse(CharityBase):
     
     class Config:
         from_attributes = True
+
+class CharityStatsResponse(BaseModel):
+    total_pickups: int
+    food_saved_kg: float
+    people_helped: int
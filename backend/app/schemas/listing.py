@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 class FoodItemBase(BaseModel):
@@ -18,11 +18,28 @@ class FoodItemResponse(FoodItemBase):
     id: int
     restaurant_id: int
     expiry_date: datetime
+    status: str
     created_at: datetime
     
     class Config:
         from_attributes = True
 
+class NearbyFoodItemResponse(FoodItemResponse):
+    distance_km: float
+
+class FoodItemPage(BaseModel):
+    items: List[FoodItemResponse]
+    next_cursor: Optional[str] = None
+
+class BulkRowError(BaseModel):
+    row: int
+    errors: List[str]
+
+class BulkCreateResponse(BaseModel):
+    created: int
+    ids: List[int]
+    errors: List[BulkRowError]
+
 class PickupBase(BaseModel):
     pickup_time: datetime
 
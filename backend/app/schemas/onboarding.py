@@ -0,0 +1,29 @@
+from pydantic import BaseModel, EmailStr, Field
+from typing import List, Optional
+from app.models.user import UserType
+
+class OnboardingRow(BaseModel):
+    """One organization to provision: a user account plus its profile."""
+    email: EmailStr
+    username: str
+    password: str
+    user_type: UserType
+    name: str
+    address: str
+    phone: str
+    profile_email: Optional[EmailStr] = None  # defaults to the account email
+    description: Optional[str] = None  # charities only
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
+
+class OnboardingRowResult(BaseModel):
+    row: int
+    status: str  # created, error
+    user_id: Optional[int] = None
+    profile_id: Optional[int] = None
+    errors: List[str] = []
+
+class OnboardingResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[OnboardingRowResult]
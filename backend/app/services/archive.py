@@ -0,0 +1,137 @@
+"""Archival of finished listings and pickups into history tables.
+
+``food_items`` and ``pickups`` should hold only rows that can still
+change. Completed or cancelled pickups older than
+ARCHIVE_PICKUPS_AFTER_DAYS, and listings that expired more than
+ARCHIVE_LISTINGS_AFTER_DAYS ago with no pickup left pointing at them,
+are copied into ``pickups_history`` / ``food_items_history`` and deleted
+in batches of ARCHIVE_BATCH_SIZE. Each batch is its own short
+transaction (copy then delete by primary key), so archiving a large
+backlog never holds long locks and can be interrupted and resumed.
+"""
+
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import delete, exists, insert, literal, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.database.partitioning import drop_empty_pickup_partitions
+from app.models.history import FoodItemHistory, PickupHistory
+from app.models.restaurant import FoodItem, Pickup
+
+ARCHIVABLE_PICKUP_STATUSES = ("completed", "cancelled")
+
+
+def _archive_in_batches(db: Session, model, history_model, condition, batch_size: int, now: datetime,
+                        max_batches: Optional[int], pause_seconds: float) -> int:
+    columns = [column.name for column in model.__table__.columns if column.name in history_model.__table__.c]
+    archived = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        # SKIP LOCKED (PostgreSQL) leaves rows another archiver holds to it
+        ids = db.scalars(
+            select(model.id).where(condition).order_by(model.id).limit(batch_size)
+            .with_for_update(skip_locked=True)
+        ).all()
+        if not ids:
+            break
+        db.execute(
+            insert(history_model).from_select(
+                columns + ["archived_at"],
+                select(*(model.__table__.c[name] for name in columns), literal(now)).where(model.id.in_(ids))
+            )
+        )
+        db.execute(delete(model).where(model.id.in_(ids)).execution_options(synchronize_session=False))
+        db.commit()
+        archived += len(ids)
+        batches += 1
+        if len(ids) < batch_size:
+            break
+        if pause_seconds:
+            time.sleep(pause_seconds)
+    return archived
+
+
+def archive_pickups(db: Session, older_than: timedelta, batch_size: int = 1000, now: Optional[datetime] = None,
+                    max_batches: Optional[int] = None, pause_seconds: float = 0.0) -> int:
+    """
+    Move completed and cancelled pickups created before `now - older_than` to pickups_history.
+
+    Args:
+        db: Database session
+        older_than: Minimum age of an archived pickup
+        batch_size: Rows moved per transaction
+        now: Reference time (defaults to the current UTC time)
+        max_batches: Stop after this many batches (default: until done)
+        pause_seconds: Sleep between batches to leave the database some headroom
+
+    Returns:
+        Number of pickups archived
+    """
+    now = now or datetime.utcnow()
+    condition = (Pickup.status.in_(ARCHIVABLE_PICKUP_STATUSES)) & (Pickup.created_at < now - older_than)
+    return _archive_in_batches(db, Pickup, PickupHistory, condition, batch_size, now, max_batches, pause_seconds)
+
+
+def archive_food_items(db: Session, older_than: timedelta, batch_size: int = 1000, now: Optional[datetime] = None,
+                       max_batches: Optional[int] = None, pause_seconds: float = 0.0) -> int:
+    """
+    Move listings that expired before `now - older_than` to food_items_history.
+
+    Expired and never-claimed listings qualify, as do claimed ones whose
+    pickups were already archived; a listing any pickup still references
+    stays. Run after archive_pickups.
+
+    Args:
+        db: Database session
+        older_than: Minimum time since expiry of an archived listing
+        batch_size: Rows moved per transaction
+        now: Reference time (defaults to the current UTC time)
+        max_batches: Stop after this many batches (default: until done)
+        pause_seconds: Sleep between batches to leave the database some headroom
+
+    Returns:
+        Number of food items archived
+    """
+    now = now or datetime.utcnow()
+    condition = (
+        (FoodItem.expiry_date < now - older_than)
+        & ~exists().where(Pickup.food_item_id == FoodItem.id)
+    )
+    return _archive_in_batches(db, FoodItem, FoodItemHistory, condition, batch_size, now, max_batches, pause_seconds)
+
+
+def archive_all(db: Session, now: Optional[datetime] = None) -> Dict[str, int]:
+    """
+    Archive pickups, then listings, using the ARCHIVE_* settings.
+
+    When pickups is partitioned (PostgreSQL), monthly partitions emptied by
+    the archive are dropped as well.
+    """
+    now = now or datetime.utcnow()
+    pickups_cutoff = timedelta(days=settings.ARCHIVE_PICKUPS_AFTER_DAYS)
+    pickups = archive_pickups(
+        db, pickups_cutoff, settings.ARCHIVE_BATCH_SIZE, now, pause_seconds=settings.ARCHIVE_PAUSE_SECONDS
+    )
+    food_items = archive_food_items(
+        db, timedelta(days=settings.ARCHIVE_LISTINGS_AFTER_DAYS), settings.ARCHIVE_BATCH_SIZE, now,
+        pause_seconds=settings.ARCHIVE_PAUSE_SECONDS
+    )
+    dropped = drop_empty_pickup_partitions(db.connection(), now - pickups_cutoff)
+    db.commit()
+    return {"pickups": pickups, "food_items": food_items, "partitions_dropped": len(dropped)}
+
+
+if __name__ == "__main__":
+    from app.database.session import SessionLocal
+
+    db = SessionLocal()
+    try:
+        archived = archive_all(db)
+        print(f"Archived {archived['pickups']} pickups and {archived['food_items']} food items, "
+              f"dropped {archived['partitions_dropped']} empty pickup partitions")
+    finally:
+        db.close()
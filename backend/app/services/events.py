@@ -0,0 +1,112 @@
+"""In-process pub/sub hub for live food listing events."""
+
+import asyncio
+import itertools
+import threading
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+# Events buffered per subscriber before it is told to resync
+SUBSCRIBER_QUEUE_SIZE = 100
+
+# Recent events kept for clients reconnecting with Last-Event-ID
+REPLAY_BUFFER_SIZE = 100
+
+# Sent instead of events a subscriber missed; clients reload the feed
+RESET_EVENT_TYPE = "reset"
+
+
+class ListingEventHub:
+    """
+    Fan listing changes out to connected subscribers.
+
+    Routes publish from the event loop, but publish() hands each event to
+    the subscriber's loop with call_soon_threadsafe, so code running in a
+    worker thread can publish too. A slow subscriber only ever holds
+    SUBSCRIBER_QUEUE_SIZE events: on overflow its queue is replaced by a
+    single ``reset`` event, so it reloads instead of silently missing
+    changes. The last REPLAY_BUFFER_SIZE events are kept so a client that
+    reconnects with the id of the last event it saw gets what it missed.
+    """
+
+    def __init__(self, queue_size: int = SUBSCRIBER_QUEUE_SIZE, replay_size: int = REPLAY_BUFFER_SIZE):
+        self._queue_size = queue_size
+        self._subscribers: Dict[asyncio.Queue, asyncio.AbstractEventLoop] = {}
+        self._recent: Deque[Dict[str, Any]] = deque(maxlen=replay_size)
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, event_type: str, data: Dict[str, Any]) -> None:
+        """Queue an event for every subscriber. Safe to call from any thread."""
+        with self._lock:
+            event = {"id": next(self._ids), "type": event_type, "data": data}
+            self._recent.append(event)
+            subscribers = list(self._subscribers.items())
+        for queue, loop in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._deliver, queue, event)
+            except RuntimeError:
+                # Subscriber's loop already closed
+                self._unsubscribe(queue)
+
+    @staticmethod
+    def _reset_event(last_id: int) -> Dict[str, Any]:
+        # Carries the id of the newest event it stands for, so a reconnect
+        # after the reload resumes from there
+        return {"id": last_id, "type": RESET_EVENT_TYPE, "data": {}}
+
+    @classmethod
+    def _deliver(cls, queue: asyncio.Queue, event: Dict[str, Any]) -> None:
+        if queue.full():
+            while not queue.empty():
+                queue.get_nowait()
+            event = cls._reset_event(event["id"])
+        queue.put_nowait(event)
+
+    def _unsubscribe(self, queue: asyncio.Queue) -> None:
+        with self._lock:
+            self._subscribers.pop(queue, None)
+
+    def _missed_events(self, last_event_id: int) -> List[Dict[str, Any]]:
+        """Events after `last_event_id`, or a reset if some are no longer buffered."""
+        if not self._recent:
+            # Nothing published since this process started; ids from before a restart mean nothing
+            return [self._reset_event(0)] if last_event_id else []
+        newest = self._recent[-1]["id"]
+        oldest = self._recent[0]["id"]
+        if last_event_id > newest or last_event_id < oldest - 1:
+            return [self._reset_event(newest)]
+        return [event for event in self._recent if event["id"] > last_event_id]
+
+    async def subscribe(self, last_event_id: Optional[int] = None,
+                        keepalive: float = 15.0) -> AsyncIterator[Tuple[Dict[str, Any], bool]]:
+        """
+        Yield (event, False) as events arrive, or (None, True) after
+        `keepalive` seconds of silence so callers can ping the client.
+
+        With `last_event_id`, events published after it are replayed
+        first, or a single reset event if they have left the buffer.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self._queue_size)
+        with self._lock:
+            # Registering and replaying under the lock leaves no gap before live events
+            self._subscribers[queue] = asyncio.get_running_loop()
+            if last_event_id is not None:
+                for event in self._missed_events(last_event_id):
+                    self._deliver(queue, event)
+        try:
+            while True:
+                try:
+                    yield await asyncio.wait_for(queue.get(), timeout=keepalive), False
+                except asyncio.TimeoutError:
+                    yield None, True
+        finally:
+            self._unsubscribe(queue)
+
+
+# Global hub shared by the listings routes
+listing_events = ListingEventHub()
@@ -0,0 +1,86 @@
+"""Periodic maintenance jobs run by the scheduler leader (see app/core/scheduler.py)."""
+
+import asyncio
+from datetime import datetime, timedelta
+
+from app.core.config import settings
+from app.core.scheduler import Scheduler, create_election
+from app.database.partitioning import drop_empty_pickup_partitions, ensure_pickup_partitions
+from app.database.session import get_async_engine, get_async_sessionmaker
+from app.services.archive import archive_food_items, archive_pickups
+from app.services.listings import expire_food_items
+from app.services.stats import reconcile_stats
+from app.services.tokens import purge_expired_refresh_tokens
+
+
+async def _in_session(func, *args):
+    async with get_async_sessionmaker()() as db:
+        return await db.run_sync(func, *args)
+
+
+async def expire_listings() -> None:
+    await _in_session(expire_food_items)
+
+
+async def purge_refresh_tokens() -> None:
+    await _in_session(purge_expired_refresh_tokens)
+
+
+async def reconcile_impact_stats() -> None:
+    await _in_session(reconcile_stats)
+
+
+async def ensure_partitions() -> None:
+    async with get_async_engine().begin() as connection:
+        await connection.run_sync(ensure_pickup_partitions, settings.PICKUP_PARTITION_MONTHS_AHEAD)
+
+
+async def archive_history() -> None:
+    """
+    Same work as archive_all, one batch at a time.
+
+    Pausing between batches with asyncio.sleep keeps the event loop free,
+    and a timeout cancels the job between (or during) batches.
+    """
+    now = datetime.utcnow()
+    pickups_cutoff = timedelta(days=settings.ARCHIVE_PICKUPS_AFTER_DAYS)
+    for archive, older_than in (
+        (archive_pickups, pickups_cutoff),
+        (archive_food_items, timedelta(days=settings.ARCHIVE_LISTINGS_AFTER_DAYS)),
+    ):
+        while True:
+            archived = await _in_session(archive, older_than, settings.ARCHIVE_BATCH_SIZE, now, 1)
+            if archived < settings.ARCHIVE_BATCH_SIZE:
+                break
+            await asyncio.sleep(settings.ARCHIVE_PAUSE_SECONDS)
+
+    async with get_async_engine().begin() as connection:
+        await connection.run_sync(drop_empty_pickup_partitions, now - pickups_cutoff)
+
+
+def build_scheduler() -> Scheduler:
+    """
+    The application's scheduler with every maintenance job registered.
+
+    Jobs whose schedule setting is empty (or 0 for intervals) are left out.
+
+    Returns:
+        Scheduler ready to run as a background task
+    """
+    scheduler = Scheduler(
+        create_election(get_async_engine(), get_async_sessionmaker(), settings.SCHEDULER_LEASE_SECONDS),
+        renew_seconds=settings.SCHEDULER_RENEW_SECONDS,
+        retry_seconds=settings.SCHEDULER_RETRY_SECONDS,
+    )
+    if settings.EXPIRE_LISTINGS_EVERY_SECONDS:
+        scheduler.add_job("expire_listings", expire_listings, every=settings.EXPIRE_LISTINGS_EVERY_SECONDS,
+                          jitter_seconds=5, timeout_seconds=30)
+    for name, func, cron, timeout in (
+        ("purge_refresh_tokens", purge_refresh_tokens, settings.PURGE_REFRESH_TOKENS_CRON, 120),
+        ("reconcile_stats", reconcile_impact_stats, settings.RECONCILE_STATS_CRON, 900),
+        ("archive_history", archive_history, settings.ARCHIVE_CRON, 3600),
+        ("ensure_pickup_partitions", ensure_partitions, settings.PICKUP_PARTITIONS_CRON, 120),
+    ):
+        if cron:
+            scheduler.add_job(name, func, cron=cron, jitter_seconds=30, timeout_seconds=timeout)
+    return scheduler
@@ -0,0 +1,99 @@
+"""Food listing availability maintenance and claiming."""
+
+import re
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.restaurant import FoodItem
+
+# uq_pickups_active_food_item_id, or its per-partition copies
+_ACTIVE_PICKUP_INDEX = re.compile(r"^uq_pickups(_\w+)?_active_food_item_id$")
+
+
+def expire_food_items(db: Session, now: Optional[datetime] = None) -> int:
+    """
+    Mark available food items whose expiry date has passed as expired.
+    
+    Expired rows drop out of the partial index on available items, so
+    the browse feed keeps scanning only live inventory.
+    
+    Args:
+        db: Database session
+        now: Cut-off time (defaults to the current UTC time)
+        
+    Returns:
+        Number of food items marked as expired
+    """
+    now = now or datetime.utcnow()
+    expired = (
+        db.query(FoodItem)
+        .filter(FoodItem.status == "available", FoodItem.expiry_date <= now)
+        .update({FoodItem.status: "expired"}, synchronize_session=False)
+    )
+    db.commit()
+    return expired
+
+
+def claim_food_item(db: Session, food_item_id: int) -> Optional[int]:
+    """
+    Atomically claim an available food item.
+    
+    A single conditional UPDATE flips the item from available to claimed,
+    so under any number of concurrent claimers exactly one sees a row
+    come back. The caller inserts the pickup in the same transaction.
+    
+    Args:
+        db: Database session
+        food_item_id: ID of the food item to claim
+        
+    Returns:
+        The item's restaurant ID if this call won the claim, otherwise None
+    """
+    statement = (
+        update(FoodItem)
+        .where(
+            FoodItem.id == food_item_id,
+            FoodItem.status == "available",
+            FoodItem.expiry_date > datetime.utcnow()
+        )
+        .values(status="claimed")
+        .returning(FoodItem.restaurant_id)
+        .execution_options(synchronize_session=False)
+    )
+    row = db.execute(statement).first()
+    return row.restaurant_id if row else None
+
+
+def is_active_pickup_conflict(exc: IntegrityError) -> bool:
+    """
+    Tell whether an IntegrityError came from the one-active-pickup index.
+    
+    PostgreSQL reports the violated index by name; SQLite only names the
+    column, so a unique failure on pickups.food_item_id is taken as it.
+    
+    Args:
+        exc: Error raised while committing a new pickup
+        
+    Returns:
+        True for a double booking, False for any other integrity failure
+    """
+    orig = exc.orig
+    # psycopg2 exposes diag; asyncpg's error is chained behind the adapter
+    constraint = getattr(getattr(orig, "diag", None), "constraint_name", None) or \
+        getattr(getattr(orig, "__cause__", None), "constraint_name", None)
+    if constraint:
+        return bool(_ACTIVE_PICKUP_INDEX.match(constraint))
+    return "UNIQUE constraint failed: pickups.food_item_id" in str(orig)
+
+
+if __name__ == "__main__":
+    from app.database.session import SessionLocal
+
+    db = SessionLocal()
+    try:
+        print(f"Expired {expire_food_items(db)} food items")
+    finally:
+        db.close()
@@ -0,0 +1,295 @@
+"""Bulk provisioning of restaurant and charity organizations.
+
+Takes a JSONL or CSV file of rows (see ``OnboardingRow``) and, per batch:
+validates every row, checks email/username/profile-email uniqueness with
+one ``IN`` query per column, hashes all passwords in parallel on the
+bcrypt pool, then inserts users and profiles with multi-row
+``INSERT ... RETURNING`` in a single transaction. Each input row gets a
+result with its line number, so a partly bad file still onboards the
+good rows. If the bcrypt pool is saturated, the batches committed so far
+keep their results and every remaining row is reported as retryable.
+
+Uploads through the API are capped at MAX_ONBOARDING_REQUEST_ROWS, since
+every row costs a bcrypt hash inside one HTTP request; run
+``python -m app.services.onboarding <file>`` for larger files.
+"""
+
+import codecs
+import csv
+import json
+from typing import BinaryIO, Dict, Iterator, List, Optional, Set, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.geo import encode_geohash
+from app.core.hashing import PasswordHasher, PasswordHasherBusy
+from app.models.charity import Charity
+from app.models.restaurant import Restaurant
+from app.models.user import User, UserType
+from app.schemas.onboarding import OnboardingRow
+
+ONBOARDING_BATCH_SIZE = 500
+MAX_ONBOARDING_REQUEST_ROWS = 2000  # per upload; the CLI has no limit
+RETRY_ERROR = "password hashing was busy; retry this row"
+
+# (line number, parsed row or None, errors)
+ParsedRow = Tuple[int, Optional[OnboardingRow], List[str]]
+
+
+def _parse(line_number: int, raw) -> ParsedRow:
+    if not isinstance(raw, dict):
+        return line_number, None, ["row must be an object"]
+    try:
+        return line_number, OnboardingRow.model_validate(raw), []
+    except ValidationError as exc:
+        return line_number, None, [
+            f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}"
+            for error in exc.errors()
+        ]
+
+
+def _iter_rows(file: BinaryIO, file_format: str) -> Iterator[ParsedRow]:
+    lines = codecs.iterdecode(file, "utf-8-sig")
+    if file_format == "csv":
+        reader = csv.DictReader(lines)
+        try:
+            for row in reader:
+                # Treat empty cells as missing values
+                yield _parse(reader.line_num, {
+                    key: value for key, value in row.items() if key and value not in (None, "")
+                })
+        except (UnicodeDecodeError, csv.Error) as exc:
+            yield reader.line_num, None, [f"unreadable CSV: {exc}"]
+        return
+
+    line_number = 0
+    try:
+        for line_number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                raw = json.loads(line)
+            except ValueError as exc:
+                yield line_number, None, [f"invalid JSON: {exc}"]
+                continue
+            yield _parse(line_number, raw)
+    except UnicodeDecodeError as exc:
+        yield line_number + 1, None, [f"unreadable JSONL: {exc}"]
+
+
+def iter_row_batches(file: BinaryIO, file_format: str,
+                     max_rows: Optional[int] = None) -> Iterator[List[ParsedRow]]:
+    """Stream a JSONL or CSV upload as batches of parsed rows, stopping after `max_rows` if given."""
+    batch = []
+    for count, parsed in enumerate(_iter_rows(file, file_format), start=1):
+        if max_rows is not None and count > max_rows:
+            batch.append((parsed[0], None, [
+                f"row limit of {max_rows} exceeded; use `python -m app.services.onboarding` for larger files"
+            ]))
+            break
+        batch.append(parsed)
+        if len(batch) >= ONBOARDING_BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def find_taken(db: Session, rows: List[OnboardingRow]) -> Dict[str, Set[str]]:
+    """Return the emails, usernames and profile emails already in use (4 queries)."""
+    def existing(column, values) -> Set[str]:
+        if not values:
+            return set()
+        return set(db.scalars(select(column).where(column.in_(values))))
+
+    restaurant_emails = {_profile_email(row) for row in rows if row.user_type == UserType.RESTAURANT}
+    charity_emails = {_profile_email(row) for row in rows if row.user_type == UserType.CHARITY}
+    return {
+        "email": existing(User.email, {row.email for row in rows}),
+        "username": existing(User.username, {row.username for row in rows}),
+        UserType.RESTAURANT.value: existing(Restaurant.email, restaurant_emails),
+        UserType.CHARITY.value: existing(Charity.email, charity_emails),
+    }
+
+
+def insert_organizations(db: Session, rows: List[OnboardingRow], hashes: List[str]) -> List[Tuple[int, int]]:
+    """
+    Insert users and their profiles with multi-row INSERTs. The caller commits.
+
+    Returns:
+        (user_id, profile_id) for each row, in input order
+    """
+    user_ids = db.scalars(
+        insert(User).returning(User.id, sort_by_parameter_order=True),
+        [
+            {
+                "email": row.email,
+                "username": row.username,
+                "user_type": row.user_type,
+                "hashed_password": hashed_password,
+            }
+            for row, hashed_password in zip(rows, hashes)
+        ]
+    ).all()
+
+    profile_ids: Dict[int, int] = {}
+    for model, user_type in ((Restaurant, UserType.RESTAURANT), (Charity, UserType.CHARITY)):
+        indexes = [index for index, row in enumerate(rows) if row.user_type == user_type]
+        if not indexes:
+            continue
+        values = []
+        for index in indexes:
+            row = rows[index]
+            profile = {
+                "user_id": user_ids[index],
+                "name": row.name,
+                "address": row.address,
+                "phone": row.phone,
+                "email": _profile_email(row),
+                "latitude": row.latitude,
+                "longitude": row.longitude,
+                "geohash": (
+                    encode_geohash(row.latitude, row.longitude)
+                    if row.latitude is not None and row.longitude is not None else None
+                ),
+            }
+            if model is Charity:
+                profile["description"] = row.description
+            values.append(profile)
+        ids = db.scalars(insert(model).returning(model.id, sort_by_parameter_order=True), values).all()
+        profile_ids.update(zip(indexes, ids))
+
+    return [(user_ids[index], profile_ids[index]) for index in range(len(rows))]
+
+
+def _profile_email(row: OnboardingRow) -> str:
+    return row.profile_email or row.email
+
+
+def _conflicts(row: OnboardingRow, taken: Dict[str, Set[str]]) -> List[str]:
+    errors = []
+    if row.email in taken["email"]:
+        errors.append("email: already registered")
+    if row.username in taken["username"]:
+        errors.append("username: already taken")
+    if _profile_email(row) in taken[row.user_type.value]:
+        errors.append(f"profile_email: already used by another {row.user_type.value}")
+    return errors
+
+
+def _retry_results(batch: List[ParsedRow]) -> List[dict]:
+    """Results for a batch that was not attempted: parse errors, or retry for valid rows."""
+    return [
+        {"row": line, "status": "error", "errors": errors if row is None else [RETRY_ERROR]}
+        for line, row, errors in batch
+    ]
+
+
+async def onboard_batch(db: AsyncSession, batch: List[ParsedRow], hasher: PasswordHasher) -> List[dict]:
+    """
+    Provision one batch and return per-row results.
+
+    The conflict lookup's read transaction ends before hashing, so no
+    connection sits idle in a transaction while bcrypt runs; the insert
+    is one transaction of its own, and its unique constraints catch any
+    value taken in between.
+
+    Raises:
+        PasswordHasherBusy: If the hashing pool is saturated (nothing was written)
+    """
+    results = {line: {"row": line, "status": "error", "errors": errors} for line, row, errors in batch if row is None}
+    candidates = [(line, row) for line, row, _ in batch if row is not None]
+
+    taken = await db.run_sync(find_taken, [row for _, row in candidates])
+    # Hand the connection back to the pool for the length of the hashing
+    await db.rollback()
+    accepted = []
+    for line, row in candidates:
+        errors = _conflicts(row, taken)
+        if errors:
+            results[line] = {"row": line, "status": "error", "errors": errors}
+            continue
+        # Later rows in the same batch must not reuse these values
+        taken["email"].add(row.email)
+        taken["username"].add(row.username)
+        taken[row.user_type.value].add(_profile_email(row))
+        accepted.append((line, row))
+
+    if accepted:
+        hashes = await hasher.hash_many([row.password for _, row in accepted])
+        try:
+            ids = await db.run_sync(insert_organizations, [row for _, row in accepted], hashes)
+            await db.commit()
+        except IntegrityError:
+            # A concurrent signup claimed a value between the check and the insert
+            await db.rollback()
+            for line, _ in accepted:
+                results[line] = {
+                    "row": line, "status": "error",
+                    "errors": ["conflicted with a concurrent registration; retry this row"],
+                }
+        else:
+            for (line, _), (user_id, profile_id) in zip(accepted, ids):
+                results[line] = {"row": line, "status": "created", "user_id": user_id, "profile_id": profile_id}
+
+    return [results[line] for line, _, _ in batch]
+
+
+async def onboard_organizations(db: AsyncSession, batches: Iterator[List[ParsedRow]],
+                                hasher: PasswordHasher) -> List[dict]:
+    """
+    Provision every batch from `iter_row_batches`, committing batch by batch.
+
+    Once the hashing pool rejects a batch, that batch and all later ones
+    are reported row by row as retryable instead of failing the whole run,
+    so committed rows keep their results.
+    """
+    results = []
+    hasher_busy = False
+    while True:
+        # Parse on the threadpool so the event loop stays free
+        batch = await run_in_threadpool(next, batches, None)
+        if batch is None:
+            break
+        if not hasher_busy:
+            try:
+                results += await onboard_batch(db, batch, hasher)
+                continue
+            except PasswordHasherBusy:
+                hasher_busy = True
+        results += _retry_results(batch)
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+    import asyncio
+
+    from app.core.hashing import password_hasher
+    from app.database.session import AsyncSessionLocal
+
+    parser = argparse.ArgumentParser(description="Bulk-provision restaurants and charities")
+    parser.add_argument("path", help="JSONL or CSV file of OnboardingRow records")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="Defaults to the file extension")
+    args = parser.parse_args()
+    file_format = args.format or ("csv" if args.path.lower().endswith(".csv") else "jsonl")
+
+    async def main():
+        with open(args.path, "rb") as file:
+            async with AsyncSessionLocal() as db:
+                return await onboard_organizations(db, iter_row_batches(file, file_format), password_hasher)
+
+    try:
+        results = asyncio.run(main())
+    finally:
+        password_hasher.shutdown()
+    for result in results:
+        if result["status"] != "created":
+            print(json.dumps(result))
+    created = sum(result["status"] == "created" for result in results)
+    print(f"Created {created} organizations, {len(results) - created} rows failed")
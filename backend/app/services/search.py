@@ -0,0 +1,90 @@
+"""Ranked full-text search over food item names and descriptions."""
+
+import re
+from datetime import datetime
+from typing import List
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.models.restaurant import FoodItem
+from app.models.search import FTS_TABLE, TRIGRAM_TEXT
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _tokens(query: str) -> List[str]:
+    """Split a free-text query into safe search terms."""
+    return _TOKEN_RE.findall(query.lower())
+
+
+def search_food_items(db: Session, query: str, limit: int) -> List[FoodItem]:
+    """
+    Search available food items, best match first.
+
+    Every term is matched as a prefix, so "bre" finds "bread". Names
+    weigh more than descriptions in the ranking. On Postgres, a query
+    with no full-text hits falls back to pg_trgm word similarity, so
+    misspellings ("bred") and irregular forms ("loaf" for "loaves") still
+    find items. SQLite, used for development, has no fuzzy fallback.
+
+    Args:
+        db: Database session
+        query: Free-text search query
+        limit: Maximum number of items to return
+
+    Returns:
+        Matching available food items ordered by relevance
+    """
+    terms = _tokens(query)
+    if not terms:
+        return []
+
+    params = {"now": datetime.utcnow(), "limit": limit}
+    if db.get_bind().dialect.name == "postgresql":
+        params["query"] = " & ".join(f"{term}:*" for term in terms)
+        statement = text(
+            """
+            SELECT food_items.* FROM food_items
+            WHERE food_items.search_vector @@ to_tsquery('english', :query)
+              AND food_items.status = 'available'
+              AND food_items.expiry_date > :now
+            ORDER BY ts_rank(food_items.search_vector, to_tsquery('english', :query)) DESC,
+                     food_items.id
+            LIMIT :limit
+            """
+        )
+        food_items = db.query(FoodItem).from_statement(statement.params(**params)).all()
+        if food_items:
+            return food_items
+        return _search_similar(db, " ".join(terms), params)
+    else:
+        params["query"] = " ".join(f'"{term}"*' for term in terms)
+        statement = text(
+            f"""
+            SELECT food_items.* FROM {FTS_TABLE}
+            JOIN food_items ON food_items.id = {FTS_TABLE}.rowid
+            WHERE {FTS_TABLE} MATCH :query
+              AND food_items.status = 'available'
+              AND food_items.expiry_date > :now
+            ORDER BY bm25({FTS_TABLE}, 10.0, 1.0), food_items.id
+            LIMIT :limit
+            """
+        )
+
+    return db.query(FoodItem).from_statement(statement.params(**params)).all()
+
+
+def _search_similar(db: Session, text_query: str, params: dict) -> List[FoodItem]:
+    """Postgres fallback: items whose name or description contains a word similar to the query."""
+    statement = text(
+        f"""
+        SELECT food_items.* FROM food_items
+        WHERE :text_query <% {TRIGRAM_TEXT}
+          AND food_items.status = 'available'
+          AND food_items.expiry_date > :now
+        ORDER BY word_similarity(:text_query, {TRIGRAM_TEXT}) DESC, food_items.id
+        LIMIT :limit
+        """
+    )
+    params = {**params, "text_query": text_query}
+    return db.query(FoodItem).from_statement(statement.params(**params)).all()
@@ -0,0 +1,119 @@
+"""Incrementally maintained impact statistics for restaurants and charities.
+
+Counters live on the restaurants and charities rows and are bumped with
+atomic ``col = col + n`` updates in the same transaction as the listing
+or pickup write, so dashboards read them in O(1). ``reconcile_stats``
+recomputes every counter from the raw tables.
+"""
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app.models.charity import Charity
+from app.models.history import FoodItemHistory, PickupHistory
+from app.models.restaurant import FoodItem, Pickup, Restaurant
+
+# Impact estimates per completed pickup (simplified for MVP)
+FOOD_SAVED_KG_PER_PICKUP = 2.5
+PEOPLE_HELPED_PER_PICKUP = 4
+
+
+def record_listings_created(db: Session, restaurant_id: int, count: int = 1) -> None:
+    """Count new food listings for a restaurant. The caller commits."""
+    db.execute(
+        update(Restaurant)
+        .where(Restaurant.id == restaurant_id)
+        .values(total_listings=Restaurant.total_listings + count)
+    )
+
+
+def record_listing_deleted(db: Session, restaurant_id: int) -> None:
+    """Uncount a deleted food listing. The caller commits."""
+    db.execute(
+        update(Restaurant)
+        .where(Restaurant.id == restaurant_id)
+        .values(total_listings=Restaurant.total_listings - 1)
+    )
+
+
+def record_pickup(db: Session, restaurant_id: int, charity_id: int) -> None:
+    """Count a scheduled pickup for both sides. The caller commits."""
+    db.execute(
+        update(Restaurant)
+        .where(Restaurant.id == restaurant_id)
+        .values(
+            total_pickups=Restaurant.total_pickups + 1,
+            food_saved_kg=Restaurant.food_saved_kg + FOOD_SAVED_KG_PER_PICKUP,
+            people_helped=Restaurant.people_helped + PEOPLE_HELPED_PER_PICKUP
+        )
+    )
+    db.execute(
+        update(Charity)
+        .where(Charity.id == charity_id)
+        .values(
+            total_pickups=Charity.total_pickups + 1,
+            food_saved_kg=Charity.food_saved_kg + FOOD_SAVED_KG_PER_PICKUP,
+            people_helped=Charity.people_helped + PEOPLE_HELPED_PER_PICKUP
+        )
+    )
+
+
+def reconcile_stats(db: Session) -> None:
+    """
+    Recompute every restaurant and charity counter from the raw tables.
+
+    Archived listings and pickups (the history tables) still count. Use
+    after backfills or to repair drift; runs as two set-based UPDATEs.
+    """
+    listings = (
+        select(func.count(FoodItem.id))
+        .where(FoodItem.restaurant_id == Restaurant.id)
+        .scalar_subquery()
+        + select(func.count(FoodItemHistory.id))
+        .where(FoodItemHistory.restaurant_id == Restaurant.id)
+        .scalar_subquery()
+    )
+    restaurant_pickups = (
+        select(func.count(Pickup.id))
+        .where(Pickup.restaurant_id == Restaurant.id, Pickup.status != "cancelled")
+        .scalar_subquery()
+        + select(func.count(PickupHistory.id))
+        .where(PickupHistory.restaurant_id == Restaurant.id, PickupHistory.status != "cancelled")
+        .scalar_subquery()
+    )
+    db.execute(
+        update(Restaurant).values(
+            total_listings=listings,
+            total_pickups=restaurant_pickups,
+            food_saved_kg=restaurant_pickups * FOOD_SAVED_KG_PER_PICKUP,
+            people_helped=restaurant_pickups * PEOPLE_HELPED_PER_PICKUP
+        )
+    )
+
+    charity_pickups = (
+        select(func.count(Pickup.id))
+        .where(Pickup.charity_id == Charity.id, Pickup.status != "cancelled")
+        .scalar_subquery()
+        + select(func.count(PickupHistory.id))
+        .where(PickupHistory.charity_id == Charity.id, PickupHistory.status != "cancelled")
+        .scalar_subquery()
+    )
+    db.execute(
+        update(Charity).values(
+            total_pickups=charity_pickups,
+            food_saved_kg=charity_pickups * FOOD_SAVED_KG_PER_PICKUP,
+            people_helped=charity_pickups * PEOPLE_HELPED_PER_PICKUP
+        )
+    )
+    db.commit()
+
+
+if __name__ == "__main__":
+    from app.database.session import SessionLocal
+
+    db = SessionLocal()
+    try:
+        reconcile_stats(db)
+        print("Restaurant and charity statistics reconciled")
+    finally:
+        db.close()
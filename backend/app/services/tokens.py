@@ -0,0 +1,86 @@
+"""Refresh token issuance, rotation and revocation.
+
+Each login starts a token family (the session id carried by access tokens
+as ``sid``). Refreshing revokes the presented token and issues its
+successor in the same family with one conditional UPDATE, so a token can
+be redeemed at most once even across workers. The caller commits.
+"""
+
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+from sqlalchemy import delete, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.user import RefreshToken
+
+
+def issue_refresh_token(db: Session, user_id: int, family_id: Optional[str] = None,
+                        jti: Optional[str] = None) -> Tuple[str, str, datetime]:
+    """
+    Record a new refresh token, starting a new family unless one is given.
+
+    Returns:
+        (jti, family_id, expires_at) for encoding into the JWT
+    """
+    jti = jti or str(uuid.uuid4())
+    family_id = family_id or str(uuid.uuid4())
+    expires_at = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    db.add(RefreshToken(jti=jti, family_id=family_id, user_id=user_id, expires_at=expires_at))
+    return jti, family_id, expires_at
+
+
+def rotate_refresh_token(db: Session, jti: str, user_id: int) -> Optional[Tuple[str, str, datetime]]:
+    """
+    Redeem a refresh token and issue its successor.
+
+    Returns:
+        The successor's (jti, family_id, expires_at), or None if the token
+        is unknown, expired, or was already rotated or revoked.
+    """
+    now = datetime.utcnow()
+    successor = str(uuid.uuid4())
+    family_id = db.execute(
+        update(RefreshToken)
+        .where(
+            RefreshToken.jti == jti,
+            RefreshToken.user_id == user_id,
+            RefreshToken.revoked_at.is_(None),
+            RefreshToken.expires_at > now
+        )
+        .values(revoked_at=now, replaced_by=successor)
+        .returning(RefreshToken.family_id)
+    ).scalar_one_or_none()
+    if family_id is None:
+        return None
+    return issue_refresh_token(db, user_id, family_id=family_id, jti=successor)
+
+
+def revoke_token_family(db: Session, family_id: str) -> None:
+    """Revoke every outstanding token in a family, ending the session."""
+    db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.utcnow())
+    )
+
+
+def purge_expired_refresh_tokens(db: Session) -> int:
+    """Delete refresh tokens past expiry plus the access-token lifetime; commits."""
+    horizon = datetime.utcnow() - timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    result = db.execute(delete(RefreshToken).where(RefreshToken.expires_at <= horizon))
+    db.commit()
+    return result.rowcount
+
+
+if __name__ == "__main__":
+    from app.database.session import SessionLocal
+
+    db = SessionLocal()
+    try:
+        count = purge_expired_refresh_tokens(db)
+        print(f"Purged {count} expired refresh tokens")
+    finally:
+        db.close()
@@ -0,0 +1,193 @@
+"""
+Pickup claim race benchmark.
+
+Releases many concurrent claimers at a handful of food items at once and
+reports claim throughput and double bookings. The atomic path is the one
+used by POST /api/listings/{id}/pickup; ``--naive`` runs the old
+read-then-insert path for comparison.
+
+Usage (from backend/):
+    python -m benchmarks.claim_race --claimers 200 --items 5
+    python -m benchmarks.claim_race --database-url postgresql://localhost/leftoverlove_bench
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, func
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Base, Charity, FoodItem, Pickup, Restaurant, User
+from app.models.user import UserType
+from app.services.listings import claim_food_item
+
+
+def seed(Session, items: int, claimers: int):
+    """Create one restaurant with `items` listings and `claimers` charities."""
+    db = Session()
+    try:
+        owner = User(email="bench-restaurant@example.com", username="bench-restaurant",
+                     user_type=UserType.RESTAURANT)
+        db.add(owner)
+        db.flush()
+        restaurant = Restaurant(name="Bench Kitchen", user_id=owner.id)
+        db.add(restaurant)
+        db.flush()
+        expiry = datetime.utcnow() + timedelta(days=1)
+        food_ids = []
+        for i in range(items):
+            food_item = FoodItem(name=f"Bench item {i}", quantity=1, unit="kg",
+                                 expiry_date=expiry, restaurant_id=restaurant.id)
+            db.add(food_item)
+            db.flush()
+            food_ids.append(food_item.id)
+        charity_ids = []
+        for i in range(claimers):
+            user = User(email=f"bench-charity-{i}@example.com", username=f"bench-charity-{i}",
+                        user_type=UserType.CHARITY)
+            db.add(user)
+            db.flush()
+            charity = Charity(name=f"Bench Charity {i}", email=user.email, user_id=user.id)
+            db.add(charity)
+            db.flush()
+            charity_ids.append(charity.id)
+        db.commit()
+        return food_ids, charity_ids
+    finally:
+        db.close()
+
+
+def atomic_claim(db, food_item_id: int, charity_id: int) -> bool:
+    """The production claim path: conditional update plus insert."""
+    restaurant_id = claim_food_item(db, food_item_id)
+    if restaurant_id is None:
+        db.rollback()
+        return False
+    db.add(Pickup(food_item_id=food_item_id, restaurant_id=restaurant_id,
+                  charity_id=charity_id, pickup_time=datetime.utcnow(), status="scheduled"))
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        return False
+    return True
+
+
+def naive_claim(db, food_item_id: int, charity_id: int) -> bool:
+    """The pre-fix path: read, check, then insert without a lock."""
+    food_item = db.query(FoodItem).filter(FoodItem.id == food_item_id).first()
+    if food_item.status != "available":
+        db.rollback()
+        return False
+    food_item.status = "claimed"
+    db.add(Pickup(food_item_id=food_item_id, restaurant_id=food_item.restaurant_id,
+                  charity_id=charity_id, pickup_time=datetime.utcnow(), status="scheduled"))
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        return False
+    return True
+
+
+def run(database_url: str, claimers: int, items: int, naive: bool):
+    engine_options = {"pool_size": claimers, "max_overflow": 0}
+    if database_url.startswith("sqlite"):
+        engine_options = {"connect_args": {"timeout": 60, "check_same_thread": False}}
+    engine = create_engine(database_url, **engine_options)
+    if naive:
+        # Without the unique index the database can't catch the race
+        Pickup.__table__.indexes.clear()
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+
+    food_ids, charity_ids = seed(Session, items, claimers)
+    claim = naive_claim if naive else atomic_claim
+    barrier = threading.Barrier(claimers)
+    results = []
+    errors = []
+    lock = threading.Lock()
+
+    def claimer(index: int):
+        db = Session()
+        try:
+            barrier.wait()
+            started = time.perf_counter()
+            try:
+                won = claim(db, food_ids[index % len(food_ids)], charity_ids[index])
+            except OperationalError as exc:
+                db.rollback()
+                with lock:
+                    errors.append(exc)
+                return
+            with lock:
+                results.append((won, time.perf_counter() - started))
+        finally:
+            db.close()
+
+    threads = [threading.Thread(target=claimer, args=(i,)) for i in range(claimers)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    db = Session()
+    try:
+        double_claims = (
+            db.query(Pickup.food_item_id)
+            .filter(Pickup.status != "cancelled")
+            .group_by(Pickup.food_item_id)
+            .having(func.count(Pickup.id) > 1)
+            .count()
+        )
+        pickups = db.query(Pickup).count()
+    finally:
+        db.close()
+    engine.dispose()
+
+    latencies = sorted(latency for _, latency in results)
+    wins = sum(1 for won, _ in results if won)
+    p50 = latencies[len(latencies) // 2] * 1000 if latencies else 0.0
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000 if latencies else 0.0
+
+    print(f"mode:            {'naive' if naive else 'atomic'}")
+    print(f"database:        {engine.url.render_as_string(hide_password=True)}")
+    print(f"claimers/items:  {claimers}/{items}")
+    print(f"elapsed:         {elapsed:.3f}s")
+    print(f"throughput:      {len(results) / elapsed:.0f} claim attempts/s")
+    print(f"latency p50/p99: {p50:.1f}ms / {p99:.1f}ms")
+    print(f"successful:      {wins}")
+    print(f"pickups:         {pickups}")
+    print(f"errors:          {len(errors)}")
+    print(f"double claims:   {double_claims}")
+    return double_claims
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--database-url", help="Defaults to a throwaway SQLite file")
+    parser.add_argument("--claimers", type=int, default=200)
+    parser.add_argument("--items", type=int, default=5)
+    parser.add_argument("--naive", action="store_true", help="Run the unlocked read-then-insert path")
+    args = parser.parse_args()
+
+    database_url = args.database_url
+    if not database_url:
+        path = os.path.join(tempfile.mkdtemp(), "claim_race.db")
+        database_url = f"sqlite:///{path}"
+
+    double_claims = run(database_url, args.claimers, args.items, args.naive)
+    if double_claims and not args.naive:
+        raise SystemExit("double claims detected")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Memory profile of the streamed listings export.
+
+Seeds a throwaway SQLite database with a small and a large restaurant
+inventory, streams ``GET /api/listings/export`` for each straight through
+the ASGI app (the body is counted and dropped, never buffered), and
+records peak Python memory during each request with ``tracemalloc``.
+Peak memory should depend on the chunk size, not on the number of rows.
+
+Exits non-zero when the large export peaks at more than --max-ratio times
+the small one.
+
+Usage (from backend/):
+    python -m benchmarks.export_memory
+    python -m benchmarks.export_memory --small 1000 --large 50000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+
+def _setup(database_path: str, small: int, large: int):
+    os.environ["DATABASE_URL"] = f"sqlite:///{database_path}"
+    os.environ.setdefault("SECRET_KEY", "export-memory-benchmark")
+    os.environ.setdefault("FRONTEND_URL", "http://localhost:3000")
+    os.environ["SCHEDULER_ENABLED"] = "False"
+    os.environ["METRICS_ENABLED"] = "False"
+
+    import main
+    from sqlalchemy import insert
+    from app.database.session import get_engine
+    from app.models import Base, FoodItem, Restaurant, User
+
+    engine = get_engine()
+    Base.metadata.create_all(engine)
+    expiry = datetime.utcnow() + timedelta(days=2)
+    with engine.begin() as connection:
+        for restaurant_id in (1, 2):
+            connection.execute(insert(User), [{
+                "id": restaurant_id, "email": f"export-{restaurant_id}@example.com",
+                "username": f"export-{restaurant_id}", "hashed_password": "-", "user_type": "restaurant",
+            }])
+            connection.execute(insert(Restaurant), [{
+                "id": restaurant_id, "user_id": restaurant_id, "name": f"Export {restaurant_id}",
+            }])
+        for restaurant_id, count in ((1, small), (2, large)):
+            for start in range(0, count, 5000):
+                connection.execute(insert(FoodItem), [
+                    {
+                        "name": f"Item {index}", "quantity": 1.0, "unit": "kg",
+                        "description": "Streamed export benchmark row",
+                        "expiry_date": expiry + timedelta(seconds=index), "status": "available",
+                        "restaurant_id": restaurant_id,
+                    }
+                    for index in range(start, min(start + 5000, count))
+                ])
+    return main.create_app()
+
+
+async def _export(app, restaurant_id: int, keep_body: bool):
+    """Run one export through the ASGI app; returns (status, bytes, body or None)."""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": "/api/listings/export", "raw_path": b"/api/listings/export",
+        "query_string": f"restaurant_id={restaurant_id}".encode(), "root_path": "",
+        "headers": [(b"host", b"benchmark")], "client": ("127.0.0.1", 50000), "server": ("benchmark", 80),
+    }
+    status = 0
+    size = 0
+    chunks = []
+    request_sent = False
+    finished = asyncio.Event()
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # Streaming responses listen for a disconnect; only send it once done
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status, size
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            size += len(message.get("body", b""))
+            if keep_body:
+                chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                finished.set()
+
+    await app(scope, receive, send)
+    return status, size, b"".join(chunks) if keep_body else None
+
+
+async def _measure(app, restaurant_id: int, keep_body: bool = False):
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    status, size, body = await _export(app, restaurant_id, keep_body)
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    return status, size, body, elapsed, peak
+
+
+async def _profile(app, small: int, large: int):
+    """Peak memory per export size, or None if an export failed."""
+    from app.database.session import dispose_engines
+
+    try:
+        # Warm up imports, engine and statement caches outside the measurement
+        status, _, body, _, _ = await _measure(app, 1, keep_body=True)
+        if status != 200 or len(json.loads(body)) != small:
+            print(f"FAIL: warm-up export returned {status} or the wrong number of rows")
+            return None
+
+        print(f"{'rows':>8} {'status':>6} {'MB sent':>8} {'seconds':>8} {'rows/s':>9} {'peak MB':>8}")
+        peaks = {}
+        for restaurant_id, rows in ((1, small), (2, large)):
+            status, size, _, elapsed, peak = await _measure(app, restaurant_id)
+            peaks[rows] = peak
+            print(f"{rows:>8} {status:>6} {size / 1e6:>8.2f} {elapsed:>8.2f} {rows / elapsed:>9.0f} "
+                  f"{peak / 1e6:>8.2f}")
+            if status != 200:
+                print(f"FAIL: export of {rows} rows returned {status}")
+                return None
+        return peaks
+    finally:
+        await dispose_engines()
+
+
+def run(small: int, large: int, max_ratio: float) -> bool:
+    with tempfile.TemporaryDirectory() as directory:
+        app = _setup(os.path.join(directory, "export.db"), small, large)
+        tracemalloc.start()
+        peaks = asyncio.run(_profile(app, small, large))
+        tracemalloc.stop()
+    if peaks is None:
+        return False
+
+    ratio = peaks[large] / peaks[small] if peaks[small] else float("inf")
+    print(f"peak ratio {ratio:.2f} for {large / small:.0f}x the rows (max {max_ratio})")
+    return ratio <= max_ratio
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--small", type=int, default=2000, help="Rows in the small export")
+    parser.add_argument("--large", type=int, default=20000, help="Rows in the large export")
+    parser.add_argument("--max-ratio", type=float, default=2.0,
+                        help="Largest allowed peak memory ratio between the two exports")
+    args = parser.parse_args()
+
+    ok = run(args.small, args.large, args.max_ratio)
+    if not ok:
+        print("FAIL: export memory grows with the number of rows")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
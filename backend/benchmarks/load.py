@@ -0,0 +1,159 @@
+"""
+HTTP load generator reporting throughput at a fixed p99 latency budget.
+
+Drives a running server with keep-alive connections, stepping up the
+number of concurrent clients and reporting requests/s and latency at
+each level. The headline number is the best throughput whose p99 stays
+within the budget. Standard library only.
+
+Usage (from backend/, against a running uvicorn):
+    python -m benchmarks.load --url http://127.0.0.1:8000/api/restaurants/stats \\
+        --header "Authorization: Bearer <token>" --p99-budget-ms 100
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+
+class _Connection:
+    """Minimal HTTP/1.1 keep-alive client for GET requests."""
+
+    def __init__(self, host: str, port: int, request: bytes):
+        self.host = host
+        self.port = port
+        self.request = request
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def get(self) -> int:
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self.writer.write(self.request)
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError("server closed the connection")
+        status = int(status_line.split()[1])
+        length = 0
+        chunked = False
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            name = name.strip().lower()
+            if name == "content-length":
+                length = int(value)
+            elif name == "transfer-encoding" and "chunked" in value.lower():
+                chunked = True
+        if chunked:
+            while True:
+                size = int((await self.reader.readline()).strip(), 16)
+                await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        elif length:
+            await self.reader.readexactly(length)
+        return status
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def _percentile(samples: List[float], fraction: float) -> float:
+    if not samples:
+        return 0.0
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+async def run_level(url: str, headers: Dict[str, str], concurrency: int, duration: float) -> Dict[str, float]:
+    """Run `concurrency` closed-loop clients for `duration` seconds."""
+    parts = urlsplit(url)
+    path = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+    header_lines = "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+    request = (
+        f"GET {path} HTTP/1.1\r\nHost: {parts.netloc}\r\n{header_lines}\r\n"
+    ).encode("latin-1")
+
+    latencies: List[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def client():
+        nonlocal errors
+        connection = _Connection(parts.hostname, parts.port or 80, request)
+        try:
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    status = await connection.get()
+                except (ConnectionError, asyncio.IncompleteReadError, OSError):
+                    errors += 1
+                    connection.close()
+                    connection = _Connection(parts.hostname, parts.port or 80, request)
+                    continue
+                if status >= 400:
+                    errors += 1
+                latencies.append(time.perf_counter() - started)
+        finally:
+            connection.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": _percentile(latencies, 0.50) * 1000,
+        "p99_ms": _percentile(latencies, 0.99) * 1000,
+    }
+
+
+async def sweep(url: str, headers: Dict[str, str], levels: List[int], duration: float, budget_ms: float):
+    print(f"{'clients':>8} {'req/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    best = None
+    for concurrency in levels:
+        result = await run_level(url, headers, concurrency, duration)
+        print(f"{result['concurrency']:>8} {result['rps']:>10.0f} {result['p50_ms']:>9.1f} "
+              f"{result['p99_ms']:>9.1f} {result['errors']:>7}")
+        if result["p99_ms"] <= budget_ms and not result["errors"]:
+            if best is None or result["rps"] > best["rps"]:
+                best = result
+    if best:
+        print(f"best within p99 <= {budget_ms:.0f}ms: {best['rps']:.0f} req/s "
+              f"at {best['concurrency']} clients (p99 {best['p99_ms']:.1f}ms)")
+    else:
+        print(f"no level met p99 <= {budget_ms:.0f}ms")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", required=True)
+    parser.add_argument("--header", action="append", default=[], help="'Name: value', repeatable")
+    parser.add_argument("--levels", default="1,4,16,32,64,128", help="Comma-separated client counts")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per level")
+    parser.add_argument("--p99-budget-ms", type=float, default=100.0)
+    args = parser.parse_args()
+
+    headers = {"Connection": "keep-alive"}
+    for header in args.header:
+        name, _, value = header.partition(":")
+        headers[name.strip()] = value.strip()
+    levels = [int(level) for level in args.levels.split(",")]
+    asyncio.run(sweep(args.url, headers, levels, args.duration, args.p99_budget_ms))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Password hashing throughput and its latency impact on other routes.
+
+Two modes:
+
+  local   Hash passwords through PasswordHasher with 1..N worker
+          processes and report hashes/s and hashes/s per core at the
+          configured BCRYPT_ROUNDS (one login costs one hash).
+
+  server  Against a running API, measure a probe GET route's p50/p99
+          alone, then again while clients hammer /api/auth/login, and
+          report logins/s and how many were shed with 503.
+
+Usage (from backend/):
+    python -m benchmarks.password_hashing local --workers 1,2,4
+    python -m benchmarks.password_hashing server --base-url http://127.0.0.1:8000 \\
+        --email r@x.com --password secret --probe-path /api/health
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from typing import Dict, List
+from urllib.parse import urlsplit
+
+from benchmarks.load import _Connection, _percentile
+
+
+async def _hash_rate(workers: int, rounds: int, duration: float) -> float:
+    from app.core.hashing import PasswordHasher
+
+    hasher = PasswordHasher(rounds=rounds, workers=workers, queue_size=workers)
+    try:
+        # Warm the worker processes before timing
+        await asyncio.gather(*(hasher.hash("warmup") for _ in range(workers)))
+        done = 0
+        deadline = time.perf_counter() + duration
+        started = time.perf_counter()
+
+        async def worker():
+            nonlocal done
+            while time.perf_counter() < deadline:
+                await hasher.hash("correct horse battery staple")
+                done += 1
+
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        return done / (time.perf_counter() - started)
+    finally:
+        hasher.shutdown()
+
+
+def run_local(levels: List[int], rounds: int, duration: float):
+    print(f"bcrypt rounds={rounds}, {os.cpu_count()} CPUs")
+    print(f"{'workers':>8} {'hashes/s':>10} {'per core':>10}")
+    for workers in levels:
+        rate = asyncio.run(_hash_rate(workers, rounds, duration))
+        print(f"{workers:>8} {rate:>10.1f} {rate / workers:>10.1f}")
+
+
+async def _closed_loop(host: str, port: int, request: bytes, deadline: float,
+                       latencies: List[float], statuses: Dict[int, int]):
+    connection = _Connection(host, port, request)
+    try:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                status = await connection.get()
+            except (ConnectionError, asyncio.IncompleteReadError, OSError):
+                statuses[0] = statuses.get(0, 0) + 1
+                connection.close()
+                connection = _Connection(host, port, request)
+                continue
+            latencies.append(time.perf_counter() - started)
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        connection.close()
+
+
+async def _probe_phase(base_url: str, probe_path: str, probe_clients: int, duration: float,
+                       login_request: bytes = None, login_clients: int = 0):
+    parts = urlsplit(base_url)
+    host, port = parts.hostname, parts.port or 80
+    probe_request = (
+        f"GET {probe_path} HTTP/1.1\r\nHost: {parts.netloc}\r\nConnection: keep-alive\r\n\r\n"
+    ).encode("latin-1")
+
+    deadline = time.perf_counter() + duration
+    probe_latencies: List[float] = []
+    probe_statuses: Dict[int, int] = {}
+    login_latencies: List[float] = []
+    login_statuses: Dict[int, int] = {}
+    tasks = [
+        _closed_loop(host, port, probe_request, deadline, probe_latencies, probe_statuses)
+        for _ in range(probe_clients)
+    ]
+    if login_request:
+        tasks += [
+            _closed_loop(host, port, login_request, deadline, login_latencies, login_statuses)
+            for _ in range(login_clients)
+        ]
+    started = time.perf_counter()
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+    probe_latencies.sort()
+    login_latencies.sort()
+    return {
+        "probe_p50_ms": _percentile(probe_latencies, 0.50) * 1000,
+        "probe_p99_ms": _percentile(probe_latencies, 0.99) * 1000,
+        "probe_rps": len(probe_latencies) / elapsed,
+        "logins_per_s": login_statuses.get(200, 0) / elapsed,
+        "login_p99_ms": _percentile(login_latencies, 0.99) * 1000,
+        "shed": login_statuses.get(503, 0),
+        "login_errors": sum(n for code, n in login_statuses.items() if code not in (200, 503)),
+    }
+
+
+def run_server(args):
+    parts = urlsplit(args.base_url)
+    body = json.dumps({"email": args.email, "password": args.password}).encode()
+    login_request = (
+        f"POST /api/auth/login HTTP/1.1\r\nHost: {parts.netloc}\r\nConnection: keep-alive\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+    ).encode("latin-1") + body
+
+    baseline = asyncio.run(_probe_phase(args.base_url, args.probe_path, args.probe_clients, args.duration))
+    burst = asyncio.run(_probe_phase(
+        args.base_url, args.probe_path, args.probe_clients, args.duration,
+        login_request, args.login_clients,
+    ))
+    print(f"probe {args.probe_path} with {args.probe_clients} clients")
+    print(f"{'phase':>10} {'probe p50':>10} {'probe p99':>10} {'probe r/s':>10} "
+          f"{'logins/s':>9} {'login p99':>10} {'503s':>6} {'errors':>7}")
+    for name, result in (("idle", baseline), ("login", burst)):
+        print(f"{name:>10} {result['probe_p50_ms']:>10.1f} {result['probe_p99_ms']:>10.1f} "
+              f"{result['probe_rps']:>10.0f} {result['logins_per_s']:>9.1f} "
+              f"{result['login_p99_ms']:>10.1f} {result['shed']:>6} {result['login_errors']:>7}")
+    if args.server_cores:
+        print(f"logins/s per server core: {burst['logins_per_s'] / args.server_cores:.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    modes = parser.add_subparsers(dest="mode", required=True)
+
+    local = modes.add_parser("local", help="Hash throughput per worker process")
+    local.add_argument("--workers", default="1,2,4", help="Comma-separated worker counts")
+    local.add_argument("--rounds", type=int, default=None, help="Defaults to BCRYPT_ROUNDS")
+    local.add_argument("--duration", type=float, default=5.0, help="Seconds per level")
+
+    server = modes.add_parser("server", help="Probe latency during a login burst")
+    server.add_argument("--base-url", default="http://127.0.0.1:8000")
+    server.add_argument("--email", required=True)
+    server.add_argument("--password", required=True)
+    server.add_argument("--probe-path", default="/api/health")
+    server.add_argument("--probe-clients", type=int, default=4)
+    server.add_argument("--login-clients", type=int, default=64)
+    server.add_argument("--duration", type=float, default=10.0, help="Seconds per phase")
+    server.add_argument("--server-cores", type=int, default=0,
+                        help="Hashing cores on the server, for the per-core figure")
+
+    args = parser.parse_args()
+    if args.mode == "local":
+        if args.rounds is None:
+            from app.core.config import settings
+            args.rounds = settings.BCRYPT_ROUNDS
+        run_local([int(level) for level in args.workers.split(",")], args.rounds, args.duration)
+    else:
+        run_server(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+SQL statement budgets for the API routes.
+
+Seeds a throwaway SQLite database with a restaurant, a charity and a page
+of listings, then calls each route in-process and counts the SQL it runs
+with ``app.core.query_budget``. Budgets do not depend on how much data is
+returned, so a route that starts lazy-loading per row (N+1) fails here.
+Responses are never served from the response cache while measuring.
+
+Exits non-zero when any route exceeds its budget, so it can gate CI.
+
+Usage (from backend/):
+    python -m benchmarks.query_budgets
+    python -m benchmarks.query_budgets --listings 200 -v
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+# Maximum SQL statements per request, keyed by the label printed below
+BUDGETS = {
+    "GET /api/auth/me": 1,
+    "GET /api/listings/": 1,
+    "GET /api/listings/nearby": 2,
+    "GET /api/listings/search": 1,
+    "GET /api/listings/export": 1,
+    "POST /api/listings/": 3,
+    "PUT /api/listings/{id}": 2,
+    "PUT /api/listings/{id} (not owner)": 1,
+    "DELETE /api/listings/{id}": 3,
+    "DELETE /api/listings/{id} (claimed)": 4,
+    "POST /api/listings/{id}/pickup": 5,
+    "GET /api/restaurants/profile": 1,
+    "GET /api/restaurants/stats": 1,
+    "GET /api/charities/profile": 1,
+    "GET /api/charities/stats": 1,
+}
+
+
+def _setup(database_path: str):
+    os.environ["DATABASE_URL"] = f"sqlite:///{database_path}"
+    os.environ.setdefault("SECRET_KEY", "query-budget-benchmark")
+    os.environ.setdefault("FRONTEND_URL", "http://localhost:3000")
+    os.environ["RATE_LIMIT_ENABLED"] = "False"
+    os.environ["SCHEDULER_ENABLED"] = "False"
+
+    from fastapi.testclient import TestClient
+
+    import main
+    from app.database.session import get_engine
+    from app.models import Base
+
+    Base.metadata.create_all(get_engine())
+    return TestClient(main.create_app())
+
+
+def _login(client, email: str, user_type: str) -> dict:
+    password = "budget-password"
+    client.post("/api/auth/signup", json={
+        "email": email, "username": email.split("@")[0], "user_type": user_type, "password": password,
+    }).raise_for_status()
+    response = client.post("/api/auth/login", json={"email": email, "password": password})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def run(listings: int, verbose: bool) -> int:
+    with tempfile.TemporaryDirectory() as directory:
+        client = _setup(os.path.join(directory, "budgets.db"))
+        from app.core.cache import response_cache
+        from app.core.query_budget import count_queries
+
+        restaurant = _login(client, "budget-restaurant@example.com", "restaurant")
+        charity = _login(client, "budget-charity@example.com", "charity")
+        profile = {"address": "1 Main St", "phone": "555-0100", "latitude": 49.28, "longitude": -123.12}
+        client.post("/api/restaurants/profile", headers=restaurant, json={
+            "name": "Budget Bistro", "email": "budget-restaurant@example.com", **profile,
+        }).raise_for_status()
+        client.post("/api/charities/profile", headers=charity, json={
+            "name": "Budget Pantry", "email": "budget-charity@example.com", **profile,
+        }).raise_for_status()
+
+        expiry = (datetime.utcnow() + timedelta(days=1)).isoformat()
+        listing = {"name": "Bread", "quantity": 2, "unit": "kg", "expiry_date": expiry}
+        update = {"name": "Rye bread", "quantity": 3, "unit": "kg"}
+        client.post("/api/listings/bulk", headers=restaurant, json=[listing] * listings).raise_for_status()
+        ids = [item["id"] for item in client.get("/api/listings/", params={"limit": 4}).json()["items"]]
+        client.post(f"/api/listings/{ids[3]}/pickup", headers=charity, json={
+            "food_item_id": ids[3], "pickup_time": expiry,
+        }).raise_for_status()
+
+        requests = [
+            ("GET /api/auth/me", "GET", "/api/auth/me", restaurant, None, None),
+            ("GET /api/listings/", "GET", "/api/listings/", None, {"limit": 100}, None),
+            ("GET /api/listings/nearby", "GET", "/api/listings/nearby", None,
+             {"lat": 49.28, "lon": -123.12, "radius": 5}, None),
+            ("GET /api/listings/search", "GET", "/api/listings/search", None, {"q": "bread"}, None),
+            ("GET /api/listings/export", "GET", "/api/listings/export", None, None, None),
+            ("POST /api/listings/", "POST", "/api/listings/", restaurant, None, listing),
+            ("PUT /api/listings/{id}", "PUT", f"/api/listings/{ids[0]}", restaurant, None, update),
+            ("PUT /api/listings/{id} (not owner)", "PUT", f"/api/listings/{ids[0]}", charity, None, update),
+            ("POST /api/listings/{id}/pickup", "POST", f"/api/listings/{ids[2]}/pickup", charity, None,
+             {"food_item_id": ids[2], "pickup_time": expiry}),
+            ("DELETE /api/listings/{id}", "DELETE", f"/api/listings/{ids[1]}", restaurant, None, None),
+            ("DELETE /api/listings/{id} (claimed)", "DELETE", f"/api/listings/{ids[3]}", restaurant, None, None),
+            ("GET /api/restaurants/profile", "GET", "/api/restaurants/profile", restaurant, None, None),
+            ("GET /api/restaurants/stats", "GET", "/api/restaurants/stats", restaurant, None, None),
+            ("GET /api/charities/profile", "GET", "/api/charities/profile", charity, None, None),
+            ("GET /api/charities/stats", "GET", "/api/charities/stats", charity, None, None),
+        ]
+
+        failures = 0
+        print(f"{'route':<40} {'status':>6} {'queries':>8} {'budget':>7}")
+        for label, method, path, headers, params, body in requests:
+            response_cache.clear()
+            with count_queries() as statements:
+                response = client.request(method, path, headers=headers, params=params, json=body)
+            budget = BUDGETS[label]
+            over = len(statements) > budget
+            failures += over
+            print(f"{label:<40} {response.status_code:>6} {len(statements):>8} {budget:>7}"
+                  f"{'  OVER BUDGET' if over else ''}")
+            if verbose or over:
+                for statement in statements:
+                    print(f"    {' '.join(statement.split())[:140]}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--listings", type=int, default=50, help="Listings to seed")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Print every statement")
+    args = parser.parse_args()
+
+    failures = run(args.listings, args.verbose)
+    if failures:
+        print(f"FAIL: {failures} route(s) over budget")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Benchmark reports: save scenario results as JSON and compare two runs.
+
+A report records the git commit, machine, database and run settings
+beside each scenario's throughput and latency percentiles, so results
+from different commits can be compared side by side.
+
+Usage (from backend/):
+    python -m benchmarks.report show benchmarks/results/<run>.json
+    python -m benchmarks.report compare base.json head.json --threshold 10
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+# (key, label, higher is better)
+COMPARED_METRICS: List[Tuple[str, str, bool]] = [
+    ("rps", "req/s", True),
+    ("p50_ms", "p50 ms", False),
+    ("p99_ms", "p99 ms", False),
+]
+
+
+def _git(*args: str) -> Optional[str]:
+    try:
+        completed = subprocess.run(
+            ["git", *args], cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, timeout=10,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return completed.stdout.strip() if completed.returncode == 0 else None
+
+
+def environment() -> Dict[str, object]:
+    """Where and on what code a run happened."""
+    import sqlalchemy
+
+    status = _git("status", "--porcelain", "--untracked-files=no")
+    return {
+        "commit": _git("rev-parse", "HEAD"),
+        "commit_subject": _git("log", "-1", "--format=%s"),
+        "dirty": bool(status) if status is not None else None,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "sqlalchemy": sqlalchemy.__version__,
+    }
+
+
+def summarize(latencies: List[float], statuses: Dict[int, int], errors: int, elapsed: float) -> Dict[str, object]:
+    """Throughput and latency percentiles for one scenario (latencies in seconds)."""
+    from benchmarks.load import _percentile
+
+    latencies = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "statuses": {str(code): count for code, count in sorted(statuses.items())},
+        "elapsed_s": round(elapsed, 3),
+        "rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+        "p50_ms": round(_percentile(latencies, 0.50) * 1000, 3),
+        "p90_ms": round(_percentile(latencies, 0.90) * 1000, 3),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+    }
+
+
+def build(settings: Dict[str, object], results: Dict[str, dict]) -> Dict[str, object]:
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "environment": environment(),
+        "settings": settings,
+        "scenarios": results,
+    }
+
+
+def save(report: Dict[str, object], path: Optional[str] = None) -> str:
+    """Write a report; defaults to benchmarks/results/<timestamp>-<commit>.json."""
+    if path is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        commit = (report["environment"].get("commit") or "nogit")[:10]
+        path = os.path.join(RESULTS_DIR, f"{stamp}-{commit}.json")
+    with open(path, "w") as file:
+        json.dump(report, file, indent=2)
+        file.write("\n")
+    return path
+
+
+def load(path: str) -> Dict[str, object]:
+    with open(path) as file:
+        return json.load(file)
+
+
+def print_table(results: Dict[str, dict]) -> None:
+    print(f"{'scenario':<10} {'requests':>9} {'req/s':>9} {'p50 ms':>8} {'p90 ms':>8} "
+          f"{'p99 ms':>8} {'max ms':>8} {'errors':>7}")
+    for name, result in results.items():
+        print(f"{name:<10} {result['requests']:>9} {result['rps']:>9.1f} {result['p50_ms']:>8.1f} "
+              f"{result['p90_ms']:>8.1f} {result['p99_ms']:>8.1f} {result['max_ms']:>8.1f} {result['errors']:>7}")
+        notes = {key: value for key, value in result.items() if key.startswith("race_")}
+        if notes:
+            print(f"{'':<10} " + ", ".join(f"{key[5:]}={value}" for key, value in notes.items()))
+
+
+def _describe(report: Dict[str, object]) -> str:
+    env = report.get("environment", {})
+    commit = (env.get("commit") or "unknown")[:10]
+    return f"{commit}{' (dirty)' if env.get('dirty') else ''} {env.get('commit_subject') or ''}".strip()
+
+
+def compare(base: Dict[str, object], head: Dict[str, object], threshold_pct: float) -> List[str]:
+    """
+    Print per-scenario deltas and return the regressions beyond the threshold.
+
+    A regression is throughput dropping, or a latency percentile rising, by
+    more than `threshold_pct` percent, or new errors appearing.
+    """
+    print(f"base: {_describe(base)}")
+    print(f"head: {_describe(head)}")
+    for side, report in (("base", base), ("head", head)):
+        settings = report.get("settings", {})
+        print(f"{side} settings: " + ", ".join(f"{key}={value}" for key, value in settings.items()))
+    if base.get("settings") != head.get("settings"):
+        print("warning: run settings differ, deltas may not be comparable")
+
+    regressions = []
+    print(f"{'scenario':<10} {'metric':<7} {'base':>10} {'head':>10} {'change':>9}")
+    for name, head_result in head["scenarios"].items():
+        base_result = base["scenarios"].get(name)
+        if base_result is None:
+            print(f"{name:<10} (new scenario)")
+            continue
+        for key, label, higher_is_better in COMPARED_METRICS:
+            before, after = base_result[key], head_result[key]
+            change = (after - before) / before * 100 if before else 0.0
+            worse = -change if higher_is_better else change
+            flag = ""
+            if worse > threshold_pct:
+                flag = "  REGRESSION"
+                regressions.append(f"{name} {label} {change:+.1f}%")
+            print(f"{name:<10} {label:<7} {before:>10.1f} {after:>10.1f} {change:>+8.1f}%{flag}")
+        if head_result["errors"] > base_result["errors"]:
+            regressions.append(f"{name} errors {base_result['errors']} -> {head_result['errors']}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    show = commands.add_parser("show", help="Print a saved report")
+    show.add_argument("path")
+    diff = commands.add_parser("compare", help="Compare two saved reports")
+    diff.add_argument("base")
+    diff.add_argument("head")
+    diff.add_argument("--threshold", type=float, default=10.0,
+                      help="Percent change counted as a regression")
+    args = parser.parse_args()
+
+    if args.command == "show":
+        report = load(args.path)
+        print(_describe(report))
+        print_table(report["scenarios"])
+        return
+
+    regressions = compare(load(args.base), load(args.head), args.threshold)
+    for regression in regressions:
+        print(f"FAIL: {regression}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
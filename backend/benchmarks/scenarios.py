@@ -0,0 +1,372 @@
+"""
+Scripted API scenarios with latency/throughput reports.
+
+Scenarios (each run for --duration seconds by --concurrency closed-loop
+clients):
+
+  browse   GET /api/listings/, following next_cursor for a few pages
+  nearby   GET /api/listings/nearby around a random seeded location
+  search   GET /api/listings/search for a random food word
+  login    POST /api/auth/login as a random seeded account
+  create   POST /api/listings/ as a random seeded restaurant
+  claim    create one listing, then release --claimers charities at it
+           at once; reports double bookings (must be 0)
+
+Targets:
+
+  asgi     the app in-process through httpx's ASGI transport (default)
+  uvicorn  a uvicorn subprocess (--workers) on a free local port
+  --base-url  an already running server (seeded with benchmarks.seed)
+
+Without --database-url a throwaway SQLite database is created and seeded
+with --restaurants/--charities/--food-items/--pickups; otherwise the
+database must already hold data from ``python -m benchmarks.seed`` with
+at least --accounts restaurants and charities. Login throttling is
+turned off and the response cache is bypassed (unless --response-cache)
+for the app started here. Results are printed and saved as a JSON report
+(see benchmarks.report) to compare across commits. Requires httpx.
+
+Usage (from backend/):
+    python -m benchmarks.scenarios
+    python -m benchmarks.scenarios --target uvicorn --workers 4 \\
+        --database-url postgresql://localhost/leftoverlove_bench --scenarios browse,search
+    python -m benchmarks.report compare benchmarks/results/<base>.json benchmarks/results/<head>.json
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+from benchmarks import report
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCENARIO_NAMES = ["browse", "nearby", "search", "login", "create", "claim"]
+
+
+class Recorder:
+    """Latency and status samples for one scenario."""
+
+    def __init__(self, expected_statuses=(200,)):
+        self.expected_statuses = set(expected_statuses)
+        self.latencies: List[float] = []
+        self.statuses: Dict[int, int] = {}
+        self.errors = 0
+        self.extra: Dict[str, int] = {}
+
+    def record(self, latency: float, status: int) -> None:
+        self.latencies.append(latency)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        if status not in self.expected_statuses:
+            self.errors += 1
+
+    def count(self, name: str, amount: int = 1) -> None:
+        self.extra[name] = self.extra.get(name, 0) + amount
+
+
+class Context:
+    """Shared state for scenario operations: the client and seeded accounts."""
+
+    def __init__(self, client: httpx.AsyncClient, password: str, accounts: int,
+                 restaurant_tokens: List[str], charity_tokens: List[str], claimers: int):
+        self.client = client
+        self.password = password
+        self.accounts = accounts
+        self.restaurant_tokens = restaurant_tokens
+        self.charity_tokens = charity_tokens
+        self.claimers = claimers
+
+    async def timed(self, recorder: Recorder, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            recorder.record(time.perf_counter() - started, 599)
+            return None
+        recorder.record(time.perf_counter() - started, response.status_code)
+        return response
+
+
+def _bearer(token: str) -> Dict[str, str]:
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _new_listing(rng: random.Random) -> dict:
+    from benchmarks.seed import ADJECTIVES, FOODS, UNITS
+
+    expiry = datetime.utcnow() + timedelta(hours=rng.randint(2, 72))
+    return {
+        "name": f"{rng.choice(ADJECTIVES)} {rng.choice(FOODS)}",
+        "quantity": rng.randint(1, 20),
+        "unit": rng.choice(UNITS),
+        "expiry_date": expiry.isoformat(),
+    }
+
+
+async def browse(ctx: Context, recorder: Recorder, rng: random.Random) -> None:
+    params = {"limit": 20}
+    for _ in range(rng.randint(1, 4)):
+        response = await ctx.timed(recorder, "GET", "/api/listings/", params=params)
+        if response is None or response.status_code != 200:
+            return
+        cursor = response.json().get("next_cursor")
+        if not cursor:
+            return
+        params = {"limit": 20, "cursor": cursor}
+
+
+async def nearby(ctx: Context, recorder: Recorder, rng: random.Random) -> None:
+    from benchmarks.seed import CENTRE, SPREAD_DEGREES
+
+    await ctx.timed(recorder, "GET", "/api/listings/nearby", params={
+        "lat": CENTRE[0] + rng.uniform(-SPREAD_DEGREES[0], SPREAD_DEGREES[0]),
+        "lon": CENTRE[1] + rng.uniform(-SPREAD_DEGREES[1], SPREAD_DEGREES[1]),
+        "radius": rng.choice([1, 2, 5]),
+    })
+
+
+async def search(ctx: Context, recorder: Recorder, rng: random.Random) -> None:
+    from benchmarks.seed import FOODS
+
+    await ctx.timed(recorder, "GET", "/api/listings/search", params={"q": rng.choice(FOODS)})
+
+
+async def export(ctx: Context, recorder: Recorder, rng: random.Random) -> None:
+    # One restaurant's whole live inventory, streamed as a single JSON array
+    await ctx.timed(recorder, "GET", "/api/listings/export", params={"restaurant_id": rng.randint(1, ctx.accounts)})
+
+
+async def login(ctx: Context, recorder: Recorder, rng: random.Random) -> None:
+    kind = rng.choice(["restaurant", "charity"])
+    await ctx.timed(recorder, "POST", "/api/auth/login", json={
+        "email": f"bench-{kind}-{rng.randrange(ctx.accounts)}@example.com", "password": ctx.password,
+    })
+
+
+async def create(ctx: Context, recorder: Recorder, rng: random.Random) -> None:
+    await ctx.timed(recorder, "POST", "/api/listings/", json=_new_listing(rng),
+                    headers=_bearer(rng.choice(ctx.restaurant_tokens)))
+
+
+async def claim(ctx: Context, recorder: Recorder, rng: random.Random) -> None:
+    # Setting up the listing is not part of the measurement
+    created = await ctx.client.post("/api/listings/", json=_new_listing(rng),
+                                    headers=_bearer(rng.choice(ctx.restaurant_tokens)))
+    if created.status_code != 200:
+        recorder.record(0.0, created.status_code)
+        return
+    food_item_id = created.json()["id"]
+    pickup_time = (datetime.utcnow() + timedelta(hours=1)).isoformat()
+    tokens = rng.sample(ctx.charity_tokens, min(ctx.claimers, len(ctx.charity_tokens)))
+    responses = await asyncio.gather(*(
+        ctx.timed(recorder, "POST", f"/api/listings/{food_item_id}/pickup",
+                  json={"food_item_id": food_item_id, "pickup_time": pickup_time}, headers=_bearer(token))
+        for token in tokens
+    ))
+    winners = sum(1 for response in responses if response is not None and response.status_code == 200)
+    recorder.count("race_rounds")
+    if winners > 1:
+        recorder.count("race_double_bookings")
+    elif winners == 0:
+        recorder.count("race_no_winner")
+
+
+SCENARIOS: Dict[str, Callable[[Context, Recorder, random.Random], Awaitable[None]]] = {
+    "browse": browse,
+    "nearby": nearby,
+    "search": search,
+    "export": export,
+    "login": login,
+    "create": create,
+    "claim": claim,
+}
+EXPECTED_STATUSES = {"claim": (200, 409)}
+
+
+async def run_scenario(ctx: Context, name: str, concurrency: int, duration: float, seed_value: int) -> dict:
+    recorder = Recorder(EXPECTED_STATUSES.get(name, (200,)))
+    operation = SCENARIOS[name]
+    deadline = time.perf_counter() + duration
+
+    async def worker(index: int):
+        rng = random.Random(f"{seed_value}-{name}-{index}")
+        while time.perf_counter() < deadline:
+            await operation(ctx, recorder, rng)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(index) for index in range(concurrency)))
+    result = report.summarize(recorder.latencies, recorder.statuses, recorder.errors,
+                              time.perf_counter() - started)
+    if name == "claim":
+        result.update({"race_rounds": 0, "race_double_bookings": 0, "race_no_winner": 0, **recorder.extra})
+    return result
+
+
+async def _login_tokens(client: httpx.AsyncClient, kind: str, count: int, password: str) -> List[str]:
+    tokens = []
+    for n in range(count):
+        response = await client.post("/api/auth/login", json={
+            "email": f"bench-{kind}-{n}@example.com", "password": password,
+        })
+        if response.status_code != 200:
+            raise SystemExit(f"login as bench-{kind}-{n} failed ({response.status_code}): is the database seeded?")
+        tokens.append(response.json()["access_token"])
+    return tokens
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@asynccontextmanager
+async def _client(args, env: Dict[str, str]):
+    """Yield an httpx client for the chosen target."""
+    if args.base_url:
+        async with httpx.AsyncClient(base_url=args.base_url, timeout=60) as client:
+            yield client
+        return
+
+    if args.target == "asgi":
+        os.environ.update(env)
+        import main
+
+        app = main.create_app()
+        transport = httpx.ASGITransport(app=app)
+        async with app.router.lifespan_context(app):
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+                yield client
+        return
+
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "--factory", "main:create_app", "--host", "127.0.0.1",
+         "--port", str(port), "--workers", str(args.workers), "--log-level", "warning", "--no-access-log"],
+        cwd=BACKEND_DIR, env={**os.environ, **env},
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+            for _ in range(300):
+                if server.poll() is not None:
+                    raise SystemExit("uvicorn exited during startup")
+                try:
+                    if (await client.get("/api/health")).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                await asyncio.sleep(0.1)
+            else:
+                raise SystemExit("uvicorn did not become healthy")
+            yield client
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+async def run(args, env: Dict[str, str]) -> Dict[str, dict]:
+    results = {}
+    async with _client(args, env) as client:
+        restaurant_tokens = await _login_tokens(client, "restaurant", args.accounts, args.password)
+        charity_tokens = await _login_tokens(client, "charity", args.accounts, args.password)
+        ctx = Context(client, args.password, args.accounts, restaurant_tokens, charity_tokens, args.claimers)
+        for name in args.scenarios:
+            results[name] = await run_scenario(ctx, name, args.concurrency, args.duration, args.seed)
+            print(f"  {name}: {results[name]['requests']} requests, {results[name]['rps']:.1f} req/s")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scenarios", default=",".join(SCENARIO_NAMES),
+                        help=f"Comma-separated subset of {', '.join(SCENARIOS)} "
+                             f"(default: {', '.join(SCENARIO_NAMES)})")
+    parser.add_argument("--target", choices=["asgi", "uvicorn"], default="asgi")
+    parser.add_argument("--base-url", help="Benchmark a running server instead")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--database-url", help="Seeded database; defaults to a new seeded SQLite file")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per scenario")
+    parser.add_argument("--claimers", type=int, default=16, help="Concurrent claimers per claim race")
+    parser.add_argument("--accounts", type=int, default=32, help="Seeded restaurants and charities to log in as")
+    parser.add_argument("--password", default=None, help="Seeded account password")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for data and request mix")
+    parser.add_argument("--bcrypt-rounds", type=int, default=int(os.getenv("BCRYPT_ROUNDS", "12")))
+    parser.add_argument("--response-cache", action="store_true", help="Leave the response cache on")
+    parser.add_argument("--restaurants", type=int, default=200)
+    parser.add_argument("--charities", type=int, default=100)
+    parser.add_argument("--food-items", type=int, default=20000)
+    parser.add_argument("--pickups", type=int, default=2000)
+    parser.add_argument("--output", help="Report path; defaults to benchmarks/results/")
+    args = parser.parse_args()
+    args.scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    from benchmarks.seed import DEFAULT_PASSWORD, create_seed_engine, seed
+
+    args.password = args.password or DEFAULT_PASSWORD
+    database_url = args.database_url
+    seeded = None
+    if not args.base_url and not database_url:
+        database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'scenarios.db')}"
+        from app.models import Base
+
+        engine = create_seed_engine(database_url)
+        Base.metadata.create_all(engine)
+        print(f"seeding {database_url}")
+        seeded = seed(engine, args.restaurants, args.charities, args.food_items, args.pickups,
+                      seed_value=args.seed, password=args.password, bcrypt_rounds=args.bcrypt_rounds,
+                      verbose=False)
+        engine.dispose()
+
+    env = {
+        "SECRET_KEY": os.getenv("SECRET_KEY", "benchmark-secret"),
+        "FRONTEND_URL": os.getenv("FRONTEND_URL", "http://localhost:3000"),
+        "BCRYPT_ROUNDS": str(args.bcrypt_rounds),
+        "RATE_LIMIT_ENABLED": "False",
+        # Background jobs would add load that varies from run to run
+        "SCHEDULER_ENABLED": "False",
+    }
+    if database_url:
+        env["DATABASE_URL"] = database_url
+    if not args.response_cache:
+        env["RESPONSE_CACHE_TTL_SECONDS"] = "0"
+
+    target = args.base_url or (f"uvicorn x{args.workers}" if args.target == "uvicorn" else "asgi")
+    print(f"running {', '.join(args.scenarios)} against {target}")
+    results = asyncio.run(run(args, env))
+
+    settings = {
+        "target": "external" if args.base_url else args.target,
+        "workers": args.workers if args.target == "uvicorn" and not args.base_url else None,
+        "database": (database_url.split(":", 1)[0].split("+", 1)[0] if database_url else "external"),
+        "concurrency": args.concurrency,
+        "duration_s": args.duration,
+        "claimers": args.claimers,
+        "seed": args.seed,
+        "bcrypt_rounds": args.bcrypt_rounds,
+        "response_cache": args.response_cache,
+        "seeded_rows": seeded,
+    }
+    saved = report.save(report.build(settings, results), args.output)
+    report.print_table(results)
+    print(f"report saved to {saved}")
+    if results.get("claim", {}).get("race_double_bookings"):
+        raise SystemExit("double bookings detected")
+
+
+if __name__ == "__main__":
+    main()
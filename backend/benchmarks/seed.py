@@ -0,0 +1,280 @@
+"""
+Synthetic data generator for benchmarks.
+
+Creates restaurants and charities (each with a user account that can log
+in), food items and pickups with multi-row INSERTs in large batches,
+assigning primary keys up front so no row has to be read back. Output is
+deterministic for a given --seed, so runs on different commits load the
+same data. Impact counters are reconciled at the end, and on PostgreSQL
+the id sequences are moved past the seeded rows.
+
+Seeded accounts are bench-restaurant-<n>@example.com and
+bench-charity-<n>@example.com (n from 0), all with --password.
+
+Usage (from backend/):
+    python -m benchmarks.seed --database-url sqlite:///bench.db --food-items 1000000
+    python -m benchmarks.seed --database-url postgresql://localhost/leftoverlove_bench \\
+        --restaurants 5000 --charities 2000 --food-items 5000000 --pickups 1000000
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from array import array
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterator, List
+
+from passlib.context import CryptContext
+from sqlalchemy import Engine, create_engine, event, func, insert, select, text
+from sqlalchemy.orm import Session
+
+from app.core.geo import encode_geohash
+from app.models import Base, Charity, FoodItem, Pickup, Restaurant, User
+from app.models.user import UserType
+from app.services.stats import reconcile_stats
+
+DEFAULT_PASSWORD = "bench-password"
+
+# Listings cluster around a city centre, roughly 20 km across
+CENTRE = (49.2827, -123.1207)
+SPREAD_DEGREES = (0.18, 0.27)
+
+FOODS = [
+    "bread", "bagels", "croissants", "muffins", "rice", "pasta", "noodles", "soup", "chili", "curry",
+    "salad", "sandwiches", "wraps", "burritos", "pizza", "lasagna", "stew", "dumplings", "sushi", "tofu",
+    "apples", "bananas", "oranges", "berries", "carrots", "potatoes", "spinach", "tomatoes", "yogurt", "cheese",
+]
+ADJECTIVES = ["fresh", "day-old", "organic", "homemade", "roasted", "vegan", "spicy", "whole-grain", "seasonal", "mixed"]
+UNITS = ["kg", "lbs", "servings", "items", "trays"]
+
+
+def _batches(rows: Iterator[dict], size: int) -> Iterator[List[dict]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _location(rng: random.Random) -> Dict[str, object]:
+    latitude = CENTRE[0] + rng.uniform(-SPREAD_DEGREES[0], SPREAD_DEGREES[0])
+    longitude = CENTRE[1] + rng.uniform(-SPREAD_DEGREES[1], SPREAD_DEGREES[1])
+    return {"latitude": latitude, "longitude": longitude, "geohash": encode_geohash(latitude, longitude)}
+
+
+def _next_ids(engine: Engine) -> Dict[str, int]:
+    with engine.connect() as connection:
+        return {
+            model.__tablename__: (connection.scalar(select(func.max(model.id))) or 0) + 1
+            for model in (User, Restaurant, Charity, FoodItem, Pickup)
+        }
+
+
+def _is_claimed(index: int, items: int, pickups: int) -> bool:
+    # Spreads exactly `pickups` claimed items evenly over the listings
+    return (index * pickups) // items != ((index + 1) * pickups) // items
+
+
+def _claimed_index(n: int, items: int, pickups: int) -> int:
+    """Index of the n-th item for which _is_claimed is true."""
+    return ((n + 1) * items + pickups - 1) // pickups - 1
+
+
+def _insert(engine: Engine, model, rows: Iterator[dict], batch_size: int, progress: Callable[[int], None]) -> int:
+    count = 0
+    for batch in _batches(rows, batch_size):
+        with engine.begin() as connection:
+            connection.execute(insert(model), batch)
+        count += len(batch)
+        progress(count)
+    return count
+
+
+def seed(engine: Engine, restaurants: int, charities: int, food_items: int, pickups: int,
+         seed_value: int = 42, password: str = DEFAULT_PASSWORD, bcrypt_rounds: int = 12,
+         expired_fraction: float = 0.1, batch_size: int = 10000, verbose: bool = True) -> Dict[str, int]:
+    """
+    Insert a synthetic data set and return the number of rows per table.
+
+    Every restaurant and charity gets its own user account. Pickups claim
+    distinct food items (so the active-pickup index holds); those items are
+    marked claimed, and `expired_fraction` of the rest are already expired.
+    """
+    if pickups > food_items:
+        raise ValueError("pickups cannot exceed food_items: each pickup claims a distinct item")
+    if restaurants < 1 or (pickups and charities < 1):
+        raise ValueError("need at least one restaurant, and one charity when seeding pickups")
+
+    rng = random.Random(seed_value)
+    ids = _next_ids(engine)
+    now = datetime.utcnow().replace(microsecond=0)
+    # One hash for everyone: bcrypt per row would dominate seeding time
+    hashed_password = CryptContext(schemes=["bcrypt"], bcrypt__rounds=bcrypt_rounds).hash(password)
+    counts: Dict[str, int] = {}
+    # Restaurant of each claimed item, in order; pickups are built from it
+    claimed_restaurant_ids = array("q")
+
+    def report(table: str, total: int) -> Callable[[int], None]:
+        started = time.perf_counter()
+
+        def progress(done: int) -> None:
+            if verbose and (done == total or done % (batch_size * 10) == 0):
+                elapsed = time.perf_counter() - started
+                print(f"  {table:<12} {done:>10}/{total} rows  {done / max(elapsed, 1e-9):>9.0f} rows/s")
+        return progress
+
+    def users() -> Iterator[dict]:
+        for kind, total in ((UserType.RESTAURANT, restaurants), (UserType.CHARITY, charities)):
+            for n in range(total):
+                yield {
+                    "id": ids["fastapi_user"] + (n if kind == UserType.RESTAURANT else restaurants + n),
+                    "email": f"bench-{kind.value}-{n}@example.com",
+                    "username": f"bench-{kind.value}-{n}",
+                    "hashed_password": hashed_password,
+                    "user_type": kind,
+                    "is_active": True,
+                    "is_superuser": False,
+                }
+
+    def restaurant_rows() -> Iterator[dict]:
+        for n in range(restaurants):
+            yield {
+                "id": ids["restaurants"] + n,
+                "user_id": ids["fastapi_user"] + n,
+                "name": f"{rng.choice(ADJECTIVES).title()} {rng.choice(FOODS).title()} Kitchen {n}",
+                "address": f"{rng.randint(1, 9999)} Bench Street",
+                "phone": f"555-{n:07d}",
+                "email": f"bench-restaurant-{n}@example.com",
+                **_location(rng),
+            }
+
+    def charity_rows() -> Iterator[dict]:
+        for n in range(charities):
+            yield {
+                "id": ids["charities"] + n,
+                "user_id": ids["fastapi_user"] + restaurants + n,
+                "name": f"Bench Food Bank {n}",
+                "address": f"{rng.randint(1, 9999)} Charity Avenue",
+                "phone": f"556-{n:07d}",
+                "email": f"bench-charity-{n}@example.com",
+                "description": "Synthetic charity for benchmarks",
+                "total_pickups": 0,
+                "people_helped": 0,
+                "food_saved_kg": 0.0,
+                **_location(rng),
+            }
+
+    def food_item_rows() -> Iterator[dict]:
+        for n in range(food_items):
+            created_at = now - timedelta(minutes=rng.randint(0, 30 * 24 * 60))
+            if _is_claimed(n, food_items, pickups):
+                item_status, expiry = "claimed", now + timedelta(minutes=rng.randint(60, 7 * 24 * 60))
+            elif rng.random() < expired_fraction:
+                item_status, expiry = "expired", now - timedelta(minutes=rng.randint(1, 7 * 24 * 60))
+            else:
+                item_status, expiry = "available", now + timedelta(minutes=rng.randint(60, 7 * 24 * 60))
+            food = rng.choice(FOODS)
+            restaurant_id = ids["restaurants"] + rng.randrange(restaurants)
+            if item_status == "claimed":
+                claimed_restaurant_ids.append(restaurant_id)
+            yield {
+                "id": ids["food_items"] + n,
+                "restaurant_id": restaurant_id,
+                "name": f"{rng.choice(ADJECTIVES)} {food}",
+                "description": f"Surplus {food} from today's service",
+                "quantity": round(rng.uniform(0.5, 40), 1),
+                "unit": rng.choice(UNITS),
+                "status": item_status,
+                "expiry_date": expiry,
+                "created_at": created_at,
+                "updated_at": created_at,
+            }
+
+    def pickup_rows() -> Iterator[dict]:
+        pickup_rng = random.Random(seed_value + 1)
+        for n, restaurant_id in enumerate(claimed_restaurant_ids):
+            yield {
+                "id": ids["pickups"] + n,
+                "food_item_id": ids["food_items"] + _claimed_index(n, food_items, pickups),
+                "restaurant_id": restaurant_id,
+                "charity_id": ids["charities"] + pickup_rng.randrange(charities),
+                "status": "completed" if pickup_rng.random() < 0.3 else "scheduled",
+                "pickup_time": now + timedelta(minutes=pickup_rng.randint(30, 48 * 60)),
+            }
+
+    started = time.perf_counter()
+    counts["fastapi_user"] = _insert(engine, User, users(), batch_size,
+                                     report("users", restaurants + charities))
+    counts["restaurants"] = _insert(engine, Restaurant, restaurant_rows(), batch_size,
+                                    report("restaurants", restaurants))
+    counts["charities"] = _insert(engine, Charity, charity_rows(), batch_size, report("charities", charities))
+    counts["food_items"] = _insert(engine, FoodItem, food_item_rows(), batch_size,
+                                   report("food_items", food_items))
+    counts["pickups"] = _insert(engine, Pickup, pickup_rows(), batch_size, report("pickups", pickups))
+
+    with Session(engine) as db:
+        reconcile_stats(db)
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as connection:
+            for table in counts:
+                connection.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT max(id) FROM {table}))"
+                ))
+        with engine.connect() as connection:
+            connection.execution_options(isolation_level="AUTOCOMMIT").execute(text("ANALYZE"))
+
+    if verbose:
+        total = sum(counts.values())
+        elapsed = time.perf_counter() - started
+        print(f"seeded {total} rows in {elapsed:.1f}s ({total / elapsed:.0f} rows/s)")
+    return counts
+
+
+def create_seed_engine(database_url: str) -> Engine:
+    """Engine tuned for bulk loading; SQLite skips fsync while seeding."""
+    engine = create_engine(database_url)
+    if engine.dialect.name == "sqlite":
+        @event.listens_for(engine, "connect")
+        def _fast_sqlite(dbapi_connection, connection_record):
+            dbapi_connection.execute("PRAGMA journal_mode = WAL")
+            dbapi_connection.execute("PRAGMA synchronous = OFF")
+    return engine
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--database-url", help="Defaults to a throwaway SQLite file")
+    parser.add_argument("--restaurants", type=int, default=1000)
+    parser.add_argument("--charities", type=int, default=500)
+    parser.add_argument("--food-items", type=int, default=100000)
+    parser.add_argument("--pickups", type=int, default=20000)
+    parser.add_argument("--expired-fraction", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=42, help="Random seed; same seed, same data")
+    parser.add_argument("--password", default=DEFAULT_PASSWORD)
+    parser.add_argument("--bcrypt-rounds", type=int, default=int(os.getenv("BCRYPT_ROUNDS", "12")))
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--create-schema", action="store_true",
+                        help="Create missing tables (otherwise run `alembic upgrade head` first)")
+    args = parser.parse_args()
+
+    database_url = args.database_url
+    if not database_url:
+        database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+        args.create_schema = True
+    engine = create_seed_engine(database_url)
+    if args.create_schema:
+        Base.metadata.create_all(engine)
+    print(f"seeding {engine.url.render_as_string(hide_password=True)}")
+    seed(engine, args.restaurants, args.charities, args.food_items, args.pickups,
+         seed_value=args.seed, password=args.password, bcrypt_rounds=args.bcrypt_rounds,
+         expired_fraction=args.expired_fraction, batch_size=args.batch_size)
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -9,78 +9,169 @@ Author: Leftover Love Team
 Version: 1.0.0
 """
 
+import asyncio
 import uvicorn
 import os
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-
-from app.routes import auth, restaurants, charities, listings
-from app.database.session import engine
-from app.models.base import Base
-from app.models.restaurant import Restaurant, FoodItem, Pickup
-from app.models.charity import Charity
-from app.models.user import User
 
 # Load environment variables
 load_dotenv()
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
-
-# Initialize FastAPI application
-app = FastAPI(
-    title="Leftover Love API",
-    description="Connecting restaurants with charities to reduce food waste and help communities",
-    version="1.0.0",
-    docs_url="/docs",
-    redoc_url="/redoc"
-)
-
-# Configure CORS for frontend connectivity
-origins = [
-    "http://localhost:3000",  # Local development
-    "https://journey-hacks2025.vercel.app",  # Production
-    os.getenv("FRONTEND_URL", "http://localhost:3000")
-]
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=origins,
-    allow_credentials=True,
-    allow_methods=["GET", "POST", "PUT", "DELETE"],
-    allow_headers=["*"],
-)
-
-# Include API routers
-app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
-app.include_router(restaurants.router, prefix="/api/restaurants", tags=["Restaurants"])
-app.include_router(charities.router, prefix="/api/charities", tags=["Charities"])
-app.include_router(listings.router, prefix="/api/listings", tags=["Food Listings"])
-
-@app.get("/", tags=["Health Check"])
-def health_check():
-    """API health check endpoint"""
-    return {
-        "message": "Leftover Love API is running! 🍽️❤️",
-        "status": "healthy",
-        "version": "1.0.0"
-    }
-
-@app.get("/api/health", tags=["Health Check"])
-def api_health():
-    """Detailed API health check"""
-    return {
-        "api": "Leftover Love",
-        "status": "operational",
-        "version": "1.0.0",
-        "docs": "/docs"
-    }
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start background work on startup and release resources on shutdown"""
+    from app.core.config import settings
+    from app.core.hashing import password_hasher
+    from app.core.revocation import sync_revocations
+    from app.database.session import dispose_engines, get_async_engine, get_replica_router
+
+    if settings.AUTO_CREATE_TABLES:
+        # Opt-in for throwaway databases; deployments run `alembic upgrade head`
+        from app.models import Base  # registers every table on Base.metadata
+
+        async with get_async_engine().begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+
+    # Keep the in-memory token revocation list in step with the database
+    tasks = [asyncio.create_task(sync_revocations(settings.REVOCATION_SYNC_SECONDS))]
+
+    # Probe read replicas so unhealthy ones are taken out of rotation
+    replica_router = get_replica_router()
+    if replica_router.engines:
+        tasks.append(asyncio.create_task(replica_router.monitor(settings.REPLICA_HEALTH_CHECK_SECONDS)))
+
+    # Maintenance jobs; every worker competes, only the elected leader runs them
+    if settings.SCHEDULER_ENABLED:
+        from app.services.jobs import build_scheduler
+
+        tasks.append(asyncio.create_task(build_scheduler().run()))
+
+    try:
+        yield
+    finally:
+        for task in tasks:
+            task.cancel()
+        # Let the scheduler release leadership before the engines go
+        await asyncio.gather(*tasks, return_exceptions=True)
+        password_hasher.shutdown()
+        await dispose_engines()
+
+
+def create_app() -> FastAPI:
+    """
+    Build the FastAPI application.
+
+    Nothing here connects to the database: engines are created on first
+    use and the schema is left to Alembic unless AUTO_CREATE_TABLES is set.
+
+    Returns:
+        Configured application instance
+    """
+    from fastapi.middleware.cors import CORSMiddleware
+
+    from app.routes import auth, restaurants, charities, listings, admin
+    from app.core.cache import ResponseCacheMiddleware
+    from app.core.config import settings
+    from app.core.metrics import MetricsMiddleware
+    from app.core.rate_limit import RateLimitMiddleware, load_backend
+    from app.database.replicas import StickyCookieMiddleware
+
+    # Initialize FastAPI application
+    app = FastAPI(
+        title="Leftover Love API",
+        description="Connecting restaurants with charities to reduce food waste and help communities",
+        version="1.0.0",
+        docs_url="/docs",
+        redoc_url="/redoc",
+        lifespan=lifespan
+    )
+
+    # Configure CORS for frontend connectivity
+    origins = [
+        "http://localhost:3000",  # Local development
+        "https://journey-hacks2025.vercel.app",  # Production
+        os.getenv("FRONTEND_URL", "http://localhost:3000")
+    ]
+
+    # Tell other workers about a client's fresh writes via a cookie
+    app.add_middleware(StickyCookieMiddleware)
+
+    # Serve cached GET responses before routing (inside CORS so headers still apply)
+    app.add_middleware(ResponseCacheMiddleware)
+
+    # Throttle login/signup before they reach the bcrypt pool; the backend is
+    # built here so a misconfigured one fails at startup
+    app.add_middleware(RateLimitMiddleware, backend=load_backend(settings.RATE_LIMIT_BACKEND))
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=origins,
+        allow_credentials=True,
+        allow_methods=["GET", "POST", "PUT", "DELETE"],
+        allow_headers=["*"],
+    )
+
+    # Outermost, so cached, throttled and preflight responses are measured too
+    if settings.METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware)
+
+    # Include API routers
+    app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
+    app.include_router(restaurants.router, prefix="/api/restaurants", tags=["Restaurants"])
+    app.include_router(charities.router, prefix="/api/charities", tags=["Charities"])
+    app.include_router(listings.router, prefix="/api/listings", tags=["Food Listings"])
+    app.include_router(admin.router, prefix="/api/admin", tags=["Administration"])
+
+    @app.get("/", tags=["Health Check"])
+    async def health_check():
+        """API health check endpoint"""
+        return {
+            "message": "Leftover Love API is running! 🍽️❤️",
+            "status": "healthy",
+            "version": "1.0.0"
+        }
+
+    @app.get("/api/health", tags=["Health Check"])
+    async def api_health():
+        """Detailed API health check"""
+        return {
+            "api": "Leftover Love",
+            "status": "operational",
+            "version": "1.0.0",
+            "docs": "/docs"
+        }
+
+    if settings.METRICS_ENABLED:
+        from fastapi.responses import PlainTextResponse
+        from app.core.metrics import metrics
+
+        @app.get("/metrics", include_in_schema=False)
+        async def prometheus_metrics():
+            """Per-route request, latency and SQL metrics for this worker (Prometheus format)"""
+            return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+    return app
+
+
+_app = None
+
+
+def __getattr__(name: str):
+    # Keep `main:app` working for servers started without --factory
+    global _app
+    if name == "app":
+        if _app is None:
+            _app = create_app()
+        return _app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 if __name__ == "__main__":
     port = int(os.getenv("PORT", 8000))
     host = os.getenv("HOST", "0.0.0.0")
     
     print(f"🚀 Starting Leftover Love API on {host}:{port}")
-    uvicorn.run("main:app", host=host, port=port, reload=True)
+    uvicorn.run("main:create_app", factory=True, host=host, port=port, reload=True)
 